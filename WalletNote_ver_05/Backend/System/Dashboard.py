@@ -37,11 +37,7 @@ class Dashboard:
         """
         records: List[InputInformation] = self._recall_db.fetch_all_records(user)
 
-        graphs = {
-            "monthly": self._graph_maker.monthly_graph(records),
-            "yearly": self._graph_maker.yearly_graph(records),
-            "daily": self._graph_maker.daily_graph(records),
-        }
+        graphs = self._graph_maker.graphs(records)
 
         return {
             "records": records,
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from datetime import date
 from decimal import Decimal
 from typing import Dict, List
 
@@ -18,6 +19,44 @@ class MakeGraph:
     - Return pure aggregated results for frontend rendering.
     """
 
+    def graphs(self, records: List[InputInformation]) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate records by day, month and year in a single pass.
+
+        Same results as daily_graph / monthly_graph / yearly_graph, but the
+        records are walked once with integer day keys (date ordinals);
+        months and years are folded from the distinct days afterwards, and
+        strings are only built for the final output.
+
+        Args:
+            records: List of InputInformation objects.
+
+        Returns:
+            Dictionary with "daily", "monthly" and "yearly" graphs.
+        """
+        days: Dict[int, Decimal] = defaultdict(Decimal)
+
+        for record in records:
+            days[record.date.toordinal()] += record.price
+
+        # year * 100 + month -> total, year -> total
+        months: Dict[int, Decimal] = defaultdict(Decimal)
+        years: Dict[int, Decimal] = defaultdict(Decimal)
+        daily: Dict[str, float] = {}
+
+        for ordinal in sorted(days):
+            total = days[ordinal]
+            day = date.fromordinal(ordinal)
+            months[day.year * 100 + day.month] += total
+            years[day.year] += total
+            daily[day.isoformat()] = float(total)
+
+        return {
+            "monthly": {f"{k // 100:04d}-{k % 100:02d}": float(v) for k, v in sorted(months.items())},
+            "yearly": {str(k): float(v) for k, v in sorted(years.items())},
+            "daily": daily,
+        }
+
     def monthly_graph(self, records: List[InputInformation]) -> Dict[str, float]:
         """
         Aggregate records by month (YYYY-MM).
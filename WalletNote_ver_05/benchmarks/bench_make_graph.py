@@ -0,0 +1,73 @@
+# WalletNote_ver_05/benchmarks/bench_make_graph.py
+"""
+Three-pass MakeGraph (monthly_graph + yearly_graph + daily_graph) vs.
+the single-pass MakeGraph.graphs(), as Dashboard.load_dashboard uses them.
+
+Records are synthetic (ten years of dates, prices with cents); no
+database is needed. Results are checked to be identical.
+
+    python -m WalletNote_ver_05.benchmarks.bench_make_graph [sizes...]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+
+from WalletNote_ver_05.Backend.Information.InputInformation import InputInformation
+from WalletNote_ver_05.Backend.System.MakeGraph import MakeGraph
+
+SIZES = (10_000, 100_000, 1_000_000)
+REPEAT = 3
+
+
+def _records(n: int) -> List[InputInformation]:
+    rng = random.Random(n)
+    first_day = date.today() - timedelta(days=3650)
+    return [
+        InputInformation(
+            price=Decimal(rng.randint(1, 500_00)) / 100,
+            date=first_day + timedelta(days=rng.randint(0, 3649)),
+            service_or_product=f"service {i % 40}",
+        )
+        for i in range(n)
+    ]
+
+
+def _three_pass(maker: MakeGraph, records: List[InputInformation]) -> dict:
+    return {
+        "monthly": maker.monthly_graph(records),
+        "yearly": maker.yearly_graph(records),
+        "daily": maker.daily_graph(records),
+    }
+
+
+def _best_of(call) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: List[str]) -> None:
+    sizes = [int(arg) for arg in argv] or SIZES
+    maker = MakeGraph()
+
+    print(f"{'records':>10}{'three-pass ms':>16}{'single-pass ms':>16}{'speedup':>10}")
+    for n in sizes:
+        records = _records(n)
+        if _three_pass(maker, records) != maker.graphs(records):
+            raise RuntimeError(f"single-pass result differs at {n} records")
+
+        old = _best_of(lambda: _three_pass(maker, records))
+        new = _best_of(lambda: maker.graphs(records))
+        print(f"{n:>10}{old:>16.1f}{new:>16.1f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,243 @@
+# Backend/Database/AggregateCache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Set, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+
+
+# Returned by CacheBackend.get() when the key is absent or expired
+MISSING = object()
+
+# (user_id, data version) a versioned response is being built for
+_version: ContextVar[Optional[Tuple[int, int]]] = ContextVar("walletnote_aggregate_version", default=None)
+
+
+class CacheBackend:
+    """
+    Storage interface for AggregateCache.
+
+    Keys are tuples whose first element is the user_id, so a backend can
+    drop everything of one user. A shared store (Redis, memcached) can
+    implement this later; LRUCacheBackend is the in-process default.
+    """
+
+    def get(self, key: Tuple) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: Tuple, value: Any) -> None:
+        raise NotImplementedError
+
+    def invalidate_user(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process LRU with a per-entry TTL.
+
+    IMPORTANT:
+    - Per worker process: other workers only see an invalidation through
+      the TTL, so keep it short or plug in a shared backend
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._by_user: Dict[Hashable, Set[Tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(key[0], set()).add(key)
+
+            while len(self._entries) > self._max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: Tuple) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+
+class AggregateCache:
+    """
+    AggregateCache is responsible for:
+    - Caching RecallDB aggregates per user and query shape
+    - Dropping a user's entries when their records change (RollupDB
+      calls invalidate() once the write's transaction has ended)
+
+    The backend is process-wide: LRUCacheBackend sized from the first
+    DBConfig that uses it, or whatever configure() installed.
+
+    Generations keep a slow reader from caching what a writer replaced:
+    every invalidate() takes the next generation number, and a value
+    loaded from a snapshot older than the user's last invalidation is
+    returned but not stored. Values read inside a UnitOfWork that has
+    written (uncommitted totals) are never stored.
+
+    An invalidation only reaches this process's backend, so a response
+    tagged with the user's data version (an ETag) reads inside
+    at_version(): its entries are keyed by that version and can never
+    hold totals from before it, whichever worker handled the write.
+    """
+
+    _backend: CacheBackend | None = None
+    _backend_lock = threading.Lock()
+
+    # Bumped by every invalidate(); user_id -> generation of their latest one.
+    # The lock also covers storing a loaded value, so a store and an
+    # invalidation of the same user never interleave
+    _generation = 0
+    _invalidated_at: Dict[int, int] = {}
+    _generation_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, backend: CacheBackend | None) -> None:
+        """
+        Install a backend (None -> default LRU on next use).
+        """
+        with cls._backend_lock:
+            cls._backend = backend
+
+    @classmethod
+    def backend(cls, config) -> CacheBackend:
+        with cls._backend_lock:
+            if cls._backend is None:
+                cls._backend = LRUCacheBackend(
+                    config.aggregate_cache_size,
+                    config.aggregate_cache_ttl,
+                )
+            return cls._backend
+
+    @classmethod
+    def get_or_load(cls, config, user_id: int, shape: Tuple, load: Callable[[], Any]) -> Any:
+        """
+        Cached value for (user_id, database, shape), computed by `load` on a miss.
+        """
+        if config.aggregate_cache_size <= 0:
+            return load()
+
+        pinned = _version.get()
+        version = pinned[1] if pinned is not None and pinned[0] == user_id else None
+
+        backend = cls.backend(config)
+        key = (user_id, version, config.engine, config.database, config.sqlite_path, *shape)
+
+        value = backend.get(key)
+        if value is not MISSING:
+            return value
+
+        uow = UnitOfWork.current()
+        if uow is not None and not uow.covers(config):
+            uow = None
+
+        seen = cls.generation()
+        value = load()
+
+        if uow is not None:
+            if uow.has_pending_writes:
+                return value
+            # load() read the unit's snapshot, which may predate `seen`
+            if uow.cache_generation is not None:
+                seen = min(seen, uow.cache_generation)
+
+        with cls._generation_lock:
+            if cls._invalidated_at.get(user_id, 0) <= seen:
+                backend.set(key, value)
+        return value
+
+    @classmethod
+    @contextmanager
+    def at_version(cls, user_id: int, version: int) -> Iterator[None]:
+        """
+        Key the user's lookups in this block by `version`.
+
+        :param user_id: user the response is built for
+        :param version: their data version, read before any aggregate
+        """
+        token = _version.set((user_id, version))
+        try:
+            yield
+        finally:
+            _version.reset(token)
+
+    @classmethod
+    def generation(cls) -> int:
+        """
+        Number of invalidations so far (a load that starts now sees them all).
+        """
+        with cls._generation_lock:
+            return cls._generation
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        with cls._backend_lock:
+            backend = cls._backend
+        with cls._generation_lock:
+            cls._generation += 1
+            cls._invalidated_at[user_id] = cls._generation
+            if backend is not None:
+                backend.invalidate_user(user_id)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._backend_lock:
+            backend = cls._backend
+        return backend.stats() if backend is not None else {}
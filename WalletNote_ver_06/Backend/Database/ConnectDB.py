@@ -1,57 +1,352 @@
-from __future__ import annotations
-
-import mysql.connector
-from dataclasses import dataclass
-from typing import Any, Iterable
-
-
-@dataclass
-class DBConfig:
-    host: str = "localhost"
-    user: str = "root"
-    password: str = "root1234"
-    database: str | None = "walletnote_db"
-
-
-class ConnectDB:
-    """
-    Base MySQL connection handler.
-    Ensures database is ALWAYS selected when required.
-    """
-
-    def __init__(self, config: DBConfig | None = None) -> None:
-        self._config = config or DBConfig()
-        self._conn = None
-
-    def _connect(self) -> None:
-        self._conn = mysql.connector.connect(
-            host=self._config.host,
-            user=self._config.user,
-            password=self._config.password,
-            database=self._config.database,
-            autocommit=True,
-        )
-
-    def _get_cursor(self):
-        if not self._conn or not self._conn.is_connected():
-            self._connect()
-        return self._conn.cursor()
-
-    def execute(self, sql: str, params: Iterable[Any] | None = None) -> None:
-        cur = self._get_cursor()
-        cur.execute(sql, tuple(params) if params else ())
-        cur.close()
-
-    def fetch_one(self, sql: str, params: Iterable[Any] | None = None):
-        cur = self._get_cursor()
-        cur.execute(sql, tuple(params) if params else ())
-        row = cur.fetchone()
-        cur.close()
-        return row
-
-    def fetch_all(self, sql: str, params: Iterable[Any] | None = None):
-        cur = self._get_cursor()
-        cur.execute(sql, tuple(params) if params else ())
-        rows = cur.fetchall()
-        cur.close()
-        return rows
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+
+import mysql.connector
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectionPool import ConnectionPool
+from CYBR_404.WalletNote_ver_06.Backend.Database.QueryLog import QueryLog
+from CYBR_404.WalletNote_ver_06.Backend.Database.ReplicaRouter import ReplicaRouter
+from CYBR_404.WalletNote_ver_06.Backend.Database.SQLiteEngine import SQLiteEngine
+from CYBR_404.WalletNote_ver_06.Backend.Database.StatementCache import StatementCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+
+
+@dataclass
+class DBConfig:
+    # Storage engine: "mysql" (server) or "sqlite" (embedded file, WAL mode)
+    engine: str = field(default_factory=lambda: os.getenv("WALLETNOTE_DB_ENGINE", "mysql"))
+    sqlite_path: str = field(default_factory=lambda: os.getenv("WALLETNOTE_SQLITE_PATH", "walletnote.db"))
+
+    host: str = "localhost"
+    port: int = 3306
+    user: str = "root"
+    password: str = "root1234"
+    database: str | None = "walletnote_db"
+
+    # Connection pool (pool_size = 0 -> one dedicated connection per object)
+    pool_size: int = 5
+    pool_timeout: float = 10.0
+    pool_max_idle: float = 300.0
+    pool_ping_after: float = 5.0
+
+    # Prepared statements kept per connection (0 -> text protocol only)
+    statement_cache_size: int = 32
+
+    # Statements at or above this many seconds go to the slow-query log (None -> off)
+    slow_query_seconds: float | None = 0.2
+
+    # Per-user aggregate cache (entries; 0 -> off) and entry lifetime in seconds
+    aggregate_cache_size: int = 1024
+    aggregate_cache_ttl: float = 60.0
+
+    # Read replicas for read-only repositories ("host" or "host:port")
+    replicas: Tuple[str, ...] = ()
+    replica_strategy: str = "round_robin"  # or "least_latency"
+    replica_retry_after: float = 30.0
+    # After a user writes, their reads stay on the primary this long
+    read_your_writes_seconds: float = 5.0
+
+
+class ConnectDB:
+    """
+    Base MySQL connection handler.
+    Ensures database is ALWAYS selected when required.
+
+    With engine="sqlite" the same execute / fetch_one / fetch_all contract
+    runs on an embedded SQLite file instead (see SQLiteEngine).
+
+    In pooled mode every statement borrows a connection from the
+    process-wide ConnectionPool for its config and returns it afterwards.
+    Inside an active UnitOfWork, statements run on its shared connection
+    and transaction instead.
+
+    Subclasses with read_only = True read from a replica when
+    DBConfig.replicas is set, unless the current user wrote recently.
+    """
+
+    read_only: bool = False
+
+    # Unique / foreign-key violation, whichever the engine
+    IntegrityError = (mysql.connector.errors.IntegrityError, sqlite3.IntegrityError)
+
+    def __init__(self, config: DBConfig | None = None) -> None:
+        self._config = config or DBConfig()
+        self._conn = None
+
+    @property
+    def config(self) -> DBConfig:
+        return self._config
+
+    @property
+    def dialect(self) -> str:
+        return self._config.engine
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Dict[str, Any]]:
+        """
+        Checkout-wait / exhaustion counters of every connection pool.
+        """
+        return ConnectionPool.all_stats()
+
+    @staticmethod
+    def statement_cache_stats() -> Dict[str, int]:
+        """
+        Prepared statement cache hit / miss / eviction totals.
+        """
+        return StatementCache.all_stats()
+
+    @staticmethod
+    def aggregate_cache_stats() -> Dict[str, int]:
+        """
+        Aggregate cache hit / miss / eviction / invalidation totals.
+        """
+        return AggregateCache.stats()
+
+    def _connect(self) -> None:
+        self._conn = self._open()
+
+    def _open(self):
+        return mysql.connector.connect(
+            host=self._config.host,
+            port=self._config.port,
+            user=self._config.user,
+            password=self._config.password,
+            database=self._config.database,
+            autocommit=True,
+        )
+
+    @contextmanager
+    def _connection(self, dedicated: bool = False):
+        """
+        Yield the connection statements run on.
+
+        :param dedicated: never the active UnitOfWork's shared connection
+            (fetch_iter: other statements must keep running while its
+            rows are still unread)
+        """
+        if self.read_only:
+            replica = ReplicaRouter.choose(self._config)
+            if replica is not None:
+                pool = ConnectionPool.for_config(replica)
+                try:
+                    conn = pool.acquire()
+                except (mysql.connector.Error, TimeoutError):
+                    ReplicaRouter.mark_down(replica)  # fall back to the primary
+                else:
+                    started = time.perf_counter()
+                    with self._checked_out(pool, conn):
+                        yield conn
+                    ReplicaRouter.observe(replica, time.perf_counter() - started)
+                    return
+
+        uow = UnitOfWork.current()
+        if not dedicated and uow is not None and uow.covers(self._config):
+            yield uow.connection()
+            return
+
+        if self.dialect == "sqlite":
+            # One connection per thread; SQLite cursors on it never block each other
+            yield SQLiteEngine.for_path(self._config.sqlite_path).connection()
+            return
+
+        if self._config.pool_size <= 0 and dedicated:
+            conn = self._open()
+            try:
+                yield conn
+            finally:
+                ConnectionPool.close_quietly(conn)
+            return
+
+        if self._config.pool_size <= 0:
+            if not self._conn or not self._conn.is_connected():
+                self._connect()
+            yield self._conn
+            return
+
+        pool = ConnectionPool.for_config(self._config)
+        with self._checked_out(pool, pool.acquire()) as conn:
+            yield conn
+
+    @staticmethod
+    @contextmanager
+    def _checked_out(pool: ConnectionPool, conn):
+        """
+        Hand `conn` back to `pool` afterwards (dropped if it broke, or if
+        a stream on it was closed early: fetch_iter cuts such connections).
+        """
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError, GeneratorExit):
+            pool.discard(conn)
+            raise
+        except BaseException:
+            pool.release(conn)
+            raise
+        else:
+            pool.release(conn)
+
+    @contextmanager
+    def _statement(self, sql: str, params: Iterable[Any] | None):
+        """
+        Run `sql` and yield the cursor holding its result.
+
+        Parameterised statements go through the connection's prepared
+        statement cache (binary protocol); the rest use a plain cursor.
+        """
+        params = tuple(params) if params else ()
+
+        with self._connection() as conn:
+            if self.dialect == "sqlite":
+                # sqlite3 keeps its own per-connection statement cache
+                cur = conn.cursor()
+                try:
+                    cur.execute(SQLiteEngine.translate(sql), params)
+                    yield cur
+                finally:
+                    cur.close()
+                return
+
+            if params and self._config.statement_cache_size > 0:
+                cache = StatementCache.for_connection(conn, self._config.statement_cache_size)
+                cur = cache.cursor(sql)
+                try:
+                    cur.execute(sql, params)
+                except mysql.connector.Error:
+                    cache.evict(sql)
+                    raise
+                yield cur
+                return
+
+            # buffered: a shared connection must never be handed back with unread rows
+            cur = conn.cursor(buffered=True)
+            try:
+                cur.execute(sql, params)
+                yield cur
+            finally:
+                cur.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed statements atomically.
+
+        Joins the active UnitOfWork when there is one (it commits at the
+        end of the request), otherwise opens a short-lived one.
+        """
+        uow = UnitOfWork.current()
+        if uow is not None and uow.covers(self._config):
+            yield
+            return
+
+        with UnitOfWork(self._config):
+            yield
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` when the current transaction ends (now if there is none).
+        """
+        uow = UnitOfWork.current()
+        if uow is not None and uow.covers(self._config):
+            uow.after_transaction(callback)
+        else:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once the current transaction commits (now if there is none).
+        """
+        uow = UnitOfWork.current()
+        if uow is not None and uow.covers(self._config):
+            uow.after_commit(callback)
+        else:
+            callback()
+
+    def execute(self, sql: str, params: Iterable[Any] | None = None) -> None:
+        params = tuple(params) if params else ()
+        ReplicaRouter.note_write()
+        uow = UnitOfWork.current()
+        if uow is not None and uow.covers(self._config):
+            uow.note_write()
+        started = time.perf_counter()
+        with self._statement(sql, params) as cur:
+            affected = cur.rowcount
+        QueryLog.record(sql, params, started, affected, self._config.slow_query_seconds)
+
+    def fetch_one(self, sql: str, params: Iterable[Any] | None = None):
+        params = tuple(params) if params else ()
+        started = time.perf_counter()
+        with self._statement(sql, params) as cur:
+            row = cur.fetchone()
+            if row is not None:
+                cur.fetchall()  # drain, so a cached statement can run again
+        QueryLog.record(sql, params, started, 0 if row is None else 1, self._config.slow_query_seconds)
+        return row
+
+    def fetch_all(self, sql: str, params: Iterable[Any] | None = None):
+        params = tuple(params) if params else ()
+        started = time.perf_counter()
+        with self._statement(sql, params) as cur:
+            rows = cur.fetchall()
+        QueryLog.record(sql, params, started, len(rows), self._config.slow_query_seconds)
+        return rows
+
+    def fetch_iter(
+        self,
+        sql: str,
+        params: Iterable[Any] | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[Tuple]:
+        """
+        Stream rows from an unbuffered (server-side) cursor.
+
+        Rows are read `chunk_size` at a time, so memory stays flat no
+        matter how many rows match. The stream runs on a connection of
+        its own, never the UnitOfWork's, and keeps it checked out until
+        the generator is exhausted or closed. Closing it early on MySQL
+        drops that connection rather than reading the rest of the rows.
+
+        IMPORTANT:
+        - On MySQL the stream does not see the active UnitOfWork's
+          uncommitted writes
+        """
+        params = tuple(params) if params else ()
+        started = time.perf_counter()
+        streamed = 0
+
+        try:
+            with self._connection(dedicated=True) as conn:
+                if self.dialect == "sqlite":
+                    cur = conn.cursor()
+                    sql = SQLiteEngine.translate(sql)
+                else:
+                    cur = conn.cursor(buffered=False)
+                abandoned = False
+                try:
+                    cur.execute(sql, params)
+                    while True:
+                        rows = cur.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        streamed += len(rows)
+                        yield from rows
+                except GeneratorExit:
+                    abandoned = True
+                    raise
+                finally:
+                    if abandoned and self.dialect == "mysql":
+                        # Closed early: reusing the connection would first pull
+                        # every unread row over the network. Cut it instead;
+                        # the pool discards it (_checked_out)
+                        conn.shutdown()
+                    else:
+                        cur.close()
+        finally:
+            # Also when closed early; wall time includes the consumer's work between chunks
+            QueryLog.record(sql, params, started, streamed, self._config.slow_query_seconds)
@@ -0,0 +1,230 @@
+# Backend/Database/ConnectionPool.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Tuple
+
+import mysql.connector
+
+
+@dataclass
+class PoolStats:
+    """
+    Counters exposed by a ConnectionPool.
+    """
+
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    exhausted: int = 0
+    timeouts: int = 0
+    created: int = 0
+    recycled: int = 0
+    discarded: int = 0
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+
+    One pool exists per connection target (host / user / database),
+    so every ConnectDB subclass pointing at the same database shares it.
+
+    IMPORTANT:
+    - Idle connections older than `pool_max_idle` are closed, not reused
+    - Connections idle longer than `pool_ping_after` are pinged on checkout
+    - Callers MUST hand connections back with release()
+    """
+
+    _registry: Dict[Tuple, "ConnectionPool"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, config) -> None:
+        self._config = config
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = PoolStats()
+
+    # =========================
+    # Registry
+    # =========================
+    @staticmethod
+    def key(config) -> Tuple:
+        """
+        Identity of a connection target; configs with equal keys share a pool.
+        """
+        return (config.engine, config.sqlite_path, config.host, config.port, config.user, config.password, config.database)
+
+    @classmethod
+    def for_config(cls, config) -> "ConnectionPool":
+        """
+        Return the process-wide pool for this config, creating it once.
+        """
+        key = cls.key(config)
+        with cls._registry_lock:
+            pool = cls._registry.get(key)
+            if pool is None:
+                pool = cls(config)
+                cls._registry[key] = pool
+            return pool
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Stats of every pool, keyed by "user@host/database".
+        """
+        with cls._registry_lock:
+            pools = list(cls._registry.values())
+        return {pool.name: pool.stats() for pool in pools}
+
+    @property
+    def name(self) -> str:
+        return f"{self._config.user}@{self._config.host}:{self._config.port}/{self._config.database or ''}"
+
+    # =========================
+    # Checkout / Checkin
+    # =========================
+    def acquire(self):
+        """
+        Check out a healthy connection, waiting up to `pool_timeout` seconds.
+
+        :raises TimeoutError: when the pool stays exhausted past the timeout
+        """
+        started = time.monotonic()
+        deadline = started + self._config.pool_timeout
+        counted_exhausted = False
+
+        while True:
+            conn = None
+            idle_since = 0.0
+
+            with self._cond:
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                elif self._size < self._config.pool_size:
+                    self._size += 1
+                else:
+                    if not counted_exhausted:
+                        self._stats.exhausted += 1
+                        counted_exhausted = True
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats.timeouts += 1
+                        raise TimeoutError(
+                            f"Connection pool exhausted ({self.name}, size={self._config.pool_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                self._record_checkout(started)
+                return conn
+
+            idle_for = time.monotonic() - idle_since
+            if idle_for > self._config.pool_max_idle:
+                self._discard(conn, recycled=True)
+                continue
+
+            if idle_for > self._config.pool_ping_after and not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            self._record_checkout(started)
+            return conn
+
+    def release(self, conn) -> None:
+        """
+        Return a connection to the pool.
+        """
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, conn) -> None:
+        """
+        Drop a broken connection instead of returning it.
+        """
+        self._discard(conn)
+
+    def close_all(self) -> None:
+        """
+        Close every idle connection. Checked-out connections are unaffected.
+        """
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn, _ in idle:
+            self.close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            data = asdict(self._stats)
+            data["size"] = self._size
+            data["idle"] = len(self._idle)
+            data["in_use"] = self._size - len(self._idle)
+            data["max_size"] = self._config.pool_size
+        return data
+
+    # =========================
+    # Internal
+    # =========================
+    def _open(self):
+        conn = mysql.connector.connect(
+            host=self._config.host,
+            port=self._config.port,
+            user=self._config.user,
+            password=self._config.password,
+            database=self._config.database,
+            autocommit=True,
+        )
+        with self._cond:
+            self._stats.created += 1
+        return conn
+
+    def _discard(self, conn, recycled: bool = False) -> None:
+        with self._cond:
+            self._size -= 1
+            if recycled:
+                self._stats.recycled += 1
+            else:
+                self._stats.discarded += 1
+            self._cond.notify()
+        self.close_quietly(conn)
+
+    def _record_checkout(self, started: float) -> None:
+        waited = time.monotonic() - started
+        with self._cond:
+            self._stats.checkouts += 1
+            self._stats.wait_seconds_total += waited
+            if waited > self._stats.wait_seconds_max:
+                self._stats.wait_seconds_max = waited
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    @staticmethod
+    def close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
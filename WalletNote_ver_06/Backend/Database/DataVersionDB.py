@@ -0,0 +1,53 @@
+# Backend/Database/DataVersionDB.py
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+
+
+class DataVersionDB(ConnectDB):
+    """
+    DataVersionDB is responsible for:
+    - A per-user, monotonically increasing data version
+    - Bumping it first in the transaction of every write (RecordDB / EditDB)
+
+    The version backs the chart / dashboard ETags (same version, same
+    data) and the delta-sync tokens (records.change_version). The bump
+    row-locks the user's version until commit, so one user's writes
+    commit in version order.
+
+    IMPORTANT:
+    - Reads stay on the primary; a lagging replica would hand out an old
+      version for new data
+    """
+
+    BUMP_SQL = {
+        "mysql": """
+        INSERT INTO data_versions (user_id, version)
+        VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1
+        """,
+        "sqlite": """
+        INSERT INTO data_versions (user_id, version)
+        VALUES (%s, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1
+        """,
+    }
+
+    def current(self, user_id: int) -> int:
+        """
+        Current version (0 until the user's first write).
+        """
+        row = self.fetch_one(
+            "SELECT version FROM data_versions WHERE user_id = %s",
+            (user_id,),
+        )
+        return int(row[0]) if row else 0
+
+    def bump(self, user_id: int) -> int:
+        """
+        Increment the version and return the new value.
+
+        Call inside the write's transaction, before its other statements.
+        """
+        self.execute(self.BUMP_SQL[self.dialect], (user_id,))
+        return self.current(user_id)  # our own uncommitted row
@@ -1,73 +1,162 @@
-# Backend/Database/EditDB.py
-from __future__ import annotations
-
-from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
-
-
-class EditDB(ConnectDB):
-    """
-    EditDB is responsible for:
-    - Updating existing income / expense records
-    - Deleting existing records
-
-    IMPORTANT:
-    - Ownership is always checked by user_id
-    """
-
-    # =========================
-    # Update
-    # =========================
-    def update_record(
-        self,
-        user: UserInformation,
-        record_id: int,
-        new_data: InputInformation,
-    ) -> None:
-        """
-        Update a record owned by the user.
-
-        :param user: logged-in user
-        :param record_id: target record ID
-        :param new_data: new input values
-        """
-
-        sql = """
-        UPDATE records
-        SET
-            price = %s,
-            service = %s,
-            record_date = %s
-        WHERE id = %s
-          AND user_id = %s
-        """
-
-        params = (
-            new_data.price,
-            new_data.service,
-            new_data.record_date,
-            record_id,
-            user.user_id,
-        )
-
-        self.execute(sql, params)
-
-    # =========================
-    # Delete
-    # =========================
-    def delete_record(self, user: UserInformation, record_id: int) -> None:
-        """
-        Delete a record owned by the user.
-
-        :param user: logged-in user
-        :param record_id: target record ID
-        """
-
-        sql = """
-        DELETE FROM records
-        WHERE id = %s
-          AND user_id = %s
-        """
-
-        self.execute(sql, (record_id, user.user_id))
+# Backend/Database/EditDB.py
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordEvents import RecordEvents
+from CYBR_404.WalletNote_ver_06.Backend.Database.RollupDB import RollupDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+class EditDB(ConnectDB):
+    """
+    EditDB is responsible for:
+    - Updating existing income / expense records
+    - Deleting existing records
+
+    IMPORTANT:
+    - Ownership is always checked by user_id
+    - daily_rollups, the data version and the change tracking
+      (change_version / record_tombstones) move in the same transaction
+    - The record is locked before the version is bumped: a missing id or
+      an update that changes nothing leaves the version (and every ETag) alone
+    - RecordEvents are published once the change has committed
+    """
+
+    def __init__(self, config: DBConfig | None = None) -> None:
+        super().__init__(config)
+        self.rollup_db = RollupDB(self._config)
+        self.version_db = DataVersionDB(self._config)
+
+    # =========================
+    # Update
+    # =========================
+    def update_record(
+        self,
+        user: UserInformation,
+        record_id: int,
+        new_data: InputInformation,
+    ) -> None:
+        """
+        Update a record owned by the user.
+
+        :param user: logged-in user
+        :param record_id: target record ID
+        :param new_data: new input values
+        """
+
+        sql = """
+        UPDATE records
+        SET
+            price = %s,
+            service = %s,
+            record_date = %s,
+            change_version = %s
+        WHERE id = %s
+          AND user_id = %s
+        """
+
+        with self.transaction():
+            old = self._locked_record(user, record_id)
+            if old is None:
+                return
+
+            old_type, old_price, old_service, old_date = old
+            if (
+                Decimal(str(old_price)) == new_data.price
+                and old_service == new_data.service
+                and str(old_date) == new_data.record_date.isoformat()
+            ):
+                return
+
+            version = self.version_db.bump(user.user_id)
+
+            params = (
+                new_data.price,
+                new_data.service,
+                new_data.record_date,
+                version,
+                record_id,
+                user.user_id,
+            )
+            self.execute(sql, params)
+
+            self.rollup_db.remove(user.user_id, old_date, old_type, old_service, old_price)
+            self.rollup_db.add(
+                user.user_id,
+                new_data.record_date,
+                old_type,
+                new_data.service,
+                new_data.price,
+            )
+
+            event = {
+                "type": "record_updated",
+                "id": record_id,
+                "record": {
+                    "record_type": old_type,
+                    "price": float(new_data.price),
+                    "service": new_data.service,
+                    "record_date": new_data.record_date.isoformat(),
+                },
+            }
+            self.after_commit(lambda: RecordEvents.publish(user.user_id, event))
+
+    # =========================
+    # Delete
+    # =========================
+    def delete_record(self, user: UserInformation, record_id: int) -> None:
+        """
+        Delete a record owned by the user.
+
+        :param user: logged-in user
+        :param record_id: target record ID
+        """
+
+        sql = """
+        DELETE FROM records
+        WHERE id = %s
+          AND user_id = %s
+        """
+
+        with self.transaction():
+            old = self._locked_record(user, record_id)
+            if old is None:
+                return
+
+            version = self.version_db.bump(user.user_id)
+
+            self.execute(sql, (record_id, user.user_id))
+            self.execute(
+                "INSERT INTO record_tombstones (user_id, version, record_id) VALUES (%s, %s, %s)",
+                (user.user_id, version, record_id),
+            )
+
+            old_type, old_price, old_service, old_date = old
+            self.rollup_db.remove(user.user_id, old_date, old_type, old_service, old_price)
+
+            event = {"type": "record_deleted", "id": record_id}
+            self.after_commit(lambda: RecordEvents.publish(user.user_id, event))
+
+    # =========================
+    # Internal
+    # =========================
+    def _locked_record(self, user: UserInformation, record_id: int) -> Tuple | None:
+        """
+        Current (record_type, price, service, record_date) of an owned
+        record, row-locked until the transaction ends (MySQL).
+        """
+        sql = """
+        SELECT record_type, price, service, record_date
+        FROM records
+        WHERE id = %s
+          AND user_id = %s
+        """
+        if self.dialect == "mysql":
+            sql += " FOR UPDATE"
+
+        return self.fetch_one(sql, (record_id, user.user_id))
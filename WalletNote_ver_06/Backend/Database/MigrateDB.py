@@ -0,0 +1,206 @@
+# Backend/Database/MigrateDB.py
+from __future__ import annotations
+
+import importlib
+import pkgutil
+import sqlite3
+import sys
+from types import ModuleType
+from typing import List
+
+import mysql.connector
+from mysql.connector import errorcode
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.CreateDB import CreateDB
+
+
+class MigrateDB(ConnectDB):
+    """
+    MigrateDB is responsible for:
+    - Tracking the applied schema version in `schema_version`
+    - Applying the ordered scripts in Backend/Database/Migrations
+    - A cheap "is the schema current?" check for worker startup
+
+    Each migration module defines:
+    - VERSION: int (unique, increasing)
+    - DESCRIPTION: str
+    - upgrade(db: MigrateDB) -> None
+
+    A migration and its schema_version row run in one transaction. MySQL
+    commits DDL implicitly, so upgrades create / drop schema objects
+    through add_column / create_index / drop_index, which skip work
+    already done: a rerun after a partial failure picks up where it stopped.
+
+    Run pending migrations with:
+        python -m CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB
+    """
+
+    # =========================
+    # Migrations
+    # =========================
+    @staticmethod
+    def migrations() -> List[ModuleType]:
+        package = importlib.import_module(f"{__package__}.Migrations")
+        modules = [
+            importlib.import_module(f"{package.__name__}.{info.name}")
+            for info in pkgutil.iter_modules(package.__path__)
+        ]
+        modules.sort(key=lambda m: m.VERSION)
+
+        versions = [m.VERSION for m in modules]
+        if len(set(versions)) != len(versions):
+            raise RuntimeError(f"Duplicate migration versions: {versions}")
+        return modules
+
+    @classmethod
+    def latest_version(cls) -> int:
+        modules = cls.migrations()
+        return modules[-1].VERSION if modules else 0
+
+    def current_version(self) -> int:
+        """
+        Applied schema version (0 if the database or table does not exist).
+
+        Any other error (unreachable server, bad credentials) propagates.
+        """
+        try:
+            row = self.fetch_one("SELECT MAX(version) FROM schema_version")
+        except mysql.connector.Error as exc:
+            if exc.errno in (errorcode.ER_BAD_DB_ERROR, errorcode.ER_NO_SUCH_TABLE):
+                return 0
+            raise
+        except sqlite3.OperationalError as exc:
+            if str(exc).startswith("no such table"):
+                return 0
+            raise
+        return int(row[0]) if row and row[0] is not None else 0
+
+    def pending(self) -> List[ModuleType]:
+        current = self.current_version()
+        return [m for m in self.migrations() if m.VERSION > current]
+
+    # =========================
+    # Startup Check
+    # =========================
+    def ensure_current(self) -> None:
+        """
+        One query: fail fast if the schema is behind the code.
+
+        :raises RuntimeError: when migrations are pending
+        """
+        current = self.current_version()
+        latest = self.latest_version()
+        if current < latest:
+            raise RuntimeError(
+                f"Database schema is at version {current}, code expects {latest}. "
+                "Run: python -m CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB"
+            )
+
+    # =========================
+    # Apply
+    # =========================
+    def migrate(self) -> List[int]:
+        """
+        Create the database if needed and apply every pending migration.
+
+        :return: versions applied, in order
+        """
+        CreateDB(self._config.database, config=self._config).create_database()
+        self._create_version_table()
+
+        applied = []
+        for migration in self.pending():
+            with self.transaction():
+                migration.upgrade(self)
+                self.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (migration.VERSION, migration.DESCRIPTION),
+                )
+            applied.append(migration.VERSION)
+        return applied
+
+    # =========================
+    # Idempotent DDL (for upgrades)
+    # =========================
+    def has_column(self, table: str, column: str) -> bool:
+        if self.dialect == "sqlite":
+            sql = "SELECT 1 FROM pragma_table_info(%s) WHERE name = %s"
+        else:
+            sql = """
+            SELECT 1
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+              AND TABLE_NAME = %s
+              AND COLUMN_NAME = %s
+            """
+        return self.fetch_one(sql, (table, column)) is not None
+
+    def has_index(self, table: str, name: str) -> bool:
+        if self.dialect == "sqlite":
+            sql = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+        else:
+            sql = """
+            SELECT 1
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+              AND TABLE_NAME = %s
+              AND INDEX_NAME = %s
+            """
+        return self.fetch_one(sql, (table, name)) is not None
+
+    def add_column(self, table: str, column: str, definition: str) -> None:
+        """
+        ALTER TABLE ... ADD COLUMN, unless the column exists.
+        """
+        if not self.has_column(table, column):
+            self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def create_index(self, table: str, name: str, columns: str, unique: bool = False) -> None:
+        """
+        CREATE [UNIQUE] INDEX, unless an index of that name exists.
+        """
+        if not self.has_index(table, name):
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            self.execute(f"CREATE {kind} {name} ON {table} ({columns})")
+
+    def drop_index(self, table: str, name: str) -> None:
+        """
+        DROP INDEX, if it exists.
+        """
+        if self.has_index(table, name):
+            if self.dialect == "sqlite":
+                self.execute(f"DROP INDEX {name}")
+            else:
+                self.execute(f"DROP INDEX {name} ON {table}")
+
+    def _create_version_table(self) -> None:
+        self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+
+def main(argv: List[str]) -> int:
+    db = MigrateDB()
+
+    if "--check" in argv:
+        current, latest = db.current_version(), db.latest_version()
+        print(f"schema version {current} / {latest}")
+        return 0 if current >= latest else 1
+
+    applied = db.migrate()
+    if applied:
+        print("applied migrations: " + ", ".join(str(v) for v in applied))
+    else:
+        print("schema is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,17 @@
+# Backend/Database/Migrations/V001_initial_schema.py
+"""
+Initial schema: users and records (same DDL as CreateDB).
+
+Uses IF NOT EXISTS, so databases created before migrations existed
+are adopted as version 1 without changes.
+"""
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.CreateDB import CreateDB
+
+VERSION = 1
+DESCRIPTION = "users and records tables"
+
+
+def upgrade(db) -> None:
+    CreateDB(db.config.database, config=db.config).create_tables()
@@ -0,0 +1,33 @@
+# Backend/Database/Migrations/V002_records_indexes.py
+"""
+Composite indexes for every records access path.
+
+- ix_records_user_date:         history list (ORDER BY record_date, created_at)
+- ix_records_user_type_date:    history list filtered by record_type
+- ix_records_user_date_type:    date-range totals by type (covering: price)
+- ix_records_user_type_service: totals by type / service (covering: price)
+
+The two totals indexes went unused once totals moved to daily_rollups
+(V003); V008 drops them.
+"""
+from __future__ import annotations
+
+VERSION = 2
+DESCRIPTION = "composite indexes on records"
+
+INDEXES = {
+    "ix_records_user_date": "user_id, record_date, created_at",
+    "ix_records_user_type_date": "user_id, record_type, record_date, created_at",
+    "ix_records_user_date_type": "user_id, record_date, record_type, price",
+    "ix_records_user_type_service": "user_id, record_type, service, price",
+}
+
+
+def upgrade(db) -> None:
+    for name, columns in INDEXES.items():
+        db.create_index("records", name, columns)
+
+    if db.dialect == "mysql":
+        db.execute("ANALYZE TABLE records")
+    else:
+        db.execute("ANALYZE records")
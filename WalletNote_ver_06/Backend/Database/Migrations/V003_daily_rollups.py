@@ -0,0 +1,52 @@
+# Backend/Database/Migrations/V003_daily_rollups.py
+"""
+Daily rollups of records per user / date / record type / service.
+
+Kept current by RecordDB / EditDB in the same transaction as the
+records change; backfilled here from the existing records.
+"""
+from __future__ import annotations
+
+VERSION = 3
+DESCRIPTION = "daily_rollups table"
+
+
+def upgrade(db) -> None:
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            user_id INT NOT NULL,
+            record_date DATE NOT NULL,
+            record_type VARCHAR(10) NOT NULL,
+            service VARCHAR(255) NOT NULL,
+            total DECIMAL(14,2) NOT NULL,
+            record_count INT NOT NULL,
+            PRIMARY KEY (user_id, record_date, record_type, service),
+            CONSTRAINT fk_rollups_user
+                FOREIGN KEY (user_id)
+                REFERENCES users(id)
+                ON DELETE CASCADE
+        )
+        """
+    )
+    db.create_index(
+        "daily_rollups",
+        "ix_rollups_user_type_service",
+        "user_id, record_type, service, total",
+    )
+    # Last, after the DDL: commits together with the schema_version row
+    db.execute(
+        """
+        INSERT INTO daily_rollups (
+            user_id,
+            record_date,
+            record_type,
+            service,
+            total,
+            record_count
+        )
+        SELECT user_id, record_date, record_type, service, SUM(price), COUNT(*)
+        FROM records
+        GROUP BY user_id, record_date, record_type, service
+        """
+    )
@@ -0,0 +1,17 @@
+# Backend/Database/Migrations/V004_records_import_hash.py
+"""
+Duplicate guard for imported statement lines.
+
+records.import_hash is the SHA-256 of (date, signed amount, service) set by
+ImportCSV; manually entered records leave it NULL. The unique index lets a
+re-import skip lines it already stored without double-counting.
+"""
+from __future__ import annotations
+
+VERSION = 4
+DESCRIPTION = "records.import_hash"
+
+
+def upgrade(db) -> None:
+    db.add_column("records", "import_hash", "CHAR(64) NULL")
+    db.create_index("records", "ux_records_user_import_hash", "user_id, import_hash", unique=True)
@@ -0,0 +1,27 @@
+# Backend/Database/Migrations/V005_data_versions.py
+"""
+Per-user data version, bumped by every write that changes a user's totals.
+
+Kept out of `users` on purpose: records hold a foreign-key (shared) lock
+on the users row while they are written, and bumping a column there in
+the same transaction would deadlock two concurrent writers.
+"""
+from __future__ import annotations
+
+VERSION = 5
+DESCRIPTION = "data_versions table"
+
+
+def upgrade(db) -> None:
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            user_id INT PRIMARY KEY,
+            version BIGINT NOT NULL,
+            CONSTRAINT fk_data_versions_user
+                FOREIGN KEY (user_id)
+                REFERENCES users(id)
+                ON DELETE CASCADE
+        )
+        """
+    )
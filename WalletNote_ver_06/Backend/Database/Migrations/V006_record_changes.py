@@ -0,0 +1,33 @@
+# Backend/Database/Migrations/V006_record_changes.py
+"""
+Change tracking for delta sync (/api/records/changes).
+
+- records.change_version: the user's data version of the last insert / update
+- record_tombstones: deleted record ids with the version of the delete
+
+Existing records keep version 0, which a first (full) sync includes.
+"""
+from __future__ import annotations
+
+VERSION = 6
+DESCRIPTION = "records.change_version and record_tombstones"
+
+
+def upgrade(db) -> None:
+    db.add_column("records", "change_version", "BIGINT NOT NULL DEFAULT 0")
+    db.create_index("records", "ix_records_user_change", "user_id, change_version, id")
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS record_tombstones (
+            user_id INT NOT NULL,
+            version BIGINT NOT NULL,
+            record_id INT NOT NULL,
+            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, version, record_id),
+            CONSTRAINT fk_tombstones_user
+                FOREIGN KEY (user_id)
+                REFERENCES users(id)
+                ON DELETE CASCADE
+        )
+        """
+    )
@@ -0,0 +1,33 @@
+# Backend/Database/Migrations/V007_ocr_results.py
+"""
+Persistent OCR result cache, keyed by the SHA-256 of the uploaded image.
+
+- ocr_results: fields OCRSystem extracted from an image, per user
+- records.import_hash (V004) holds the same hash for records saved from
+  an OCR upload, so its unique index also stops a second upload of the
+  same receipt from creating a second record
+"""
+from __future__ import annotations
+
+VERSION = 7
+DESCRIPTION = "ocr_results table"
+
+
+def upgrade(db) -> None:
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ocr_results (
+            user_id INT NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            price DECIMAL(10,2) NOT NULL,
+            service VARCHAR(255) NOT NULL,
+            record_date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, content_hash),
+            CONSTRAINT fk_ocr_results_user
+                FOREIGN KEY (user_id)
+                REFERENCES users(id)
+                ON DELETE CASCADE
+        )
+        """
+    )
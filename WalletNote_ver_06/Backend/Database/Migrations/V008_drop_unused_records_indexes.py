@@ -0,0 +1,19 @@
+# Backend/Database/Migrations/V008_drop_unused_records_indexes.py
+"""
+Drop the V002 covering indexes for totals.
+
+Totals come from daily_rollups since V003, so no query reads
+ix_records_user_date_type or ix_records_user_type_service any more;
+they only cost every records insert / update / delete.
+"""
+from __future__ import annotations
+
+VERSION = 8
+DESCRIPTION = "drop unused records total indexes"
+
+INDEXES = ("ix_records_user_date_type", "ix_records_user_type_service")
+
+
+def upgrade(db) -> None:
+    for name in INDEXES:
+        db.drop_index("records", name)
@@ -0,0 +1,83 @@
+# Backend/Database/OCRResultDB.py
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+class OCRResultDB(ConnectDB):
+    """
+    OCRResultDB is responsible for:
+    - The persistent OCR result cache (ocr_results): image SHA-256 -> fields
+    - Telling whether the user already has a record saved from that image
+      (records.import_hash)
+
+    IMPORTANT:
+    - Not replica-routed: a repeat upload right after the first must
+      see the first one's rows
+    """
+
+    # Hashes per lookup statement (SQLite allows 999 parameters per statement)
+    LOOKUP_CHUNK = 500
+
+    PUT_SQL = {
+        "mysql": """
+        INSERT INTO ocr_results (user_id, content_hash, price, service, record_date)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            price = VALUES(price),
+            service = VALUES(service),
+            record_date = VALUES(record_date)
+        """,
+        "sqlite": """
+        INSERT INTO ocr_results (user_id, content_hash, price, service, record_date)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (user_id, content_hash) DO UPDATE SET
+            price = excluded.price,
+            service = excluded.service,
+            record_date = excluded.record_date
+        """,
+    }
+
+    def lookup(self, user_id: int, content_hashes: List[str]) -> Dict[str, Tuple[InputInformation, bool]]:
+        """
+        Cached fields for the hashes seen before.
+
+        :param user_id: owner of the uploads
+        :param content_hashes: SHA-256 hex digests of uploaded images
+        :return: {hash: (fields, a record from this image still exists)}
+        """
+        found: Dict[str, Tuple[InputInformation, bool]] = {}
+        for start in range(0, len(content_hashes), self.LOOKUP_CHUNK):
+            chunk = content_hashes[start:start + self.LOOKUP_CHUNK]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            rows = self.fetch_all(
+                f"""
+                SELECT o.content_hash, o.price, o.service, o.record_date,
+                       EXISTS (
+                           SELECT 1
+                           FROM records r
+                           WHERE r.user_id = o.user_id
+                             AND r.import_hash = o.content_hash
+                       )
+                FROM ocr_results o
+                WHERE o.user_id = %s
+                  AND o.content_hash IN ({placeholders})
+                """,
+                (user_id, *chunk),
+            )
+            for content_hash, price, service, record_date, saved in rows:
+                record = InputInformation(price=price, service=service, record_date=record_date)
+                found[content_hash] = (record, bool(saved))
+        return found
+
+    def put(self, user_id: int, content_hash: str, record: InputInformation) -> None:
+        """
+        Remember the fields extracted from an image.
+        """
+        self.execute(
+            self.PUT_SQL[self.dialect],
+            (user_id, content_hash, record.price, record.service, record.record_date),
+        )
@@ -0,0 +1,136 @@
+# Backend/Database/QueryLog.py
+from __future__ import annotations
+
+import logging
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+
+slow_query_logger = logging.getLogger("walletnote.db.slow")
+
+_current: ContextVar[Optional["QueryLog"]] = ContextVar("walletnote_query_log", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalize SQL so the same statement always maps to the same text:
+    literals become `?`, whitespace is collapsed.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """
+    Raised when a strict QueryLog sees more statements than its budget.
+    """
+
+
+@dataclass
+class QueryRecord:
+    fingerprint: str
+    param_count: int
+    seconds: float
+    rows: int
+
+
+class QueryLog:
+    """
+    QueryLog is responsible for:
+    - Recording every statement ConnectDB runs in the current request / task
+    - Logging statements slower than the configured threshold
+    - Enforcing an optional per-request query budget
+
+    IMPORTANT:
+    - Bound per context like UnitOfWork (app.py begins / ends it)
+    - Slow queries are logged even when no QueryLog is active
+    """
+
+    def __init__(self, budget: int | None = None, strict: bool = False) -> None:
+        self.budget = budget
+        self.strict = strict
+        self.queries: List[QueryRecord] = []
+        self.db_seconds = 0.0
+        self._token: Token | None = None
+
+    # =========================
+    # Binding
+    # =========================
+    @staticmethod
+    def current() -> Optional["QueryLog"]:
+        return _current.get()
+
+    def begin(self) -> "QueryLog":
+        self._token = _current.set(self)
+        return self
+
+    def end(self) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+    def __enter__(self) -> "QueryLog":
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end()
+
+    # =========================
+    # Recording
+    # =========================
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    @staticmethod
+    def record(
+        sql: str,
+        params: Sequence[Any] | None,
+        started: float,
+        rows: int,
+        slow_seconds: float | None,
+    ) -> None:
+        """
+        Record one finished statement (`started` from time.perf_counter()).
+        """
+        seconds = time.perf_counter() - started
+        entry = QueryRecord(
+            fingerprint=fingerprint(sql),
+            param_count=len(params) if params else 0,
+            seconds=seconds,
+            rows=rows,
+        )
+
+        if slow_seconds is not None and seconds >= slow_seconds:
+            slow_query_logger.warning(
+                "slow query %.1f ms rows=%d params=%d: %s",
+                seconds * 1000,
+                entry.rows,
+                entry.param_count,
+                entry.fingerprint,
+            )
+
+        log = _current.get()
+        if log is None:
+            return
+
+        log.queries.append(entry)
+        log.db_seconds += seconds
+
+        if log.strict and log.over_budget:
+            raise QueryBudgetExceeded(
+                f"{log.count} queries issued, budget is {log.budget}: {entry.fingerprint}"
+            )
@@ -1,93 +1,299 @@
-# Backend/Database/RecallDB.py
-from __future__ import annotations
-
-from typing import List, Tuple
-
-from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
-
-
-class RecallDB(ConnectDB):
-    """
-    RecallDB is responsible for:
-    - Fetching income / expense records from the database
-    - Providing data to Dashboard / MakeGraph
-    """
-
-    # =========================
-    # Basic Fetch
-    # =========================
-    def get_records_by_user(
-        self,
-        user_id: int,
-        record_type: str | None = None,
-        limit: int | None = None,
-    ) -> List[Tuple]:
-        """
-        Fetch records for a user.
-
-        :param user_id: user ID
-        :param record_type: 'income', 'expense', or None (both)
-        :param limit: max number of rows
-        """
-
-        base_sql = """
-        SELECT
-            id,
-            record_type,
-            price,
-            service,
-            record_date,
-            created_at
-        FROM records
-        WHERE user_id = %s
-        """
-
-        params = [user_id]
-
-        if record_type:
-            base_sql += " AND record_type = %s"
-            params.append(record_type)
-
-        base_sql += " ORDER BY record_date DESC, created_at DESC"
-
-        if limit:
-            base_sql += " LIMIT %s"
-            params.append(limit)
-
-        return self.fetch_all(base_sql, params)
-
-    # =========================
-    # Aggregations (Graphs)
-    # =========================
-    def get_monthly_summary(self, user_id: int, year: int, month: int) -> List[Tuple]:
-        """
-        Get monthly aggregated totals by record type.
-        """
-        sql = """
-        SELECT
-            record_type,
-            SUM(price) AS total
-        FROM records
-        WHERE user_id = %s
-          AND YEAR(record_date) = %s
-          AND MONTH(record_date) = %s
-        GROUP BY record_type
-        """
-        return self.fetch_all(sql, (user_id, year, month))
-
-    def get_yearly_summary(self, user_id: int, year: int) -> List[Tuple]:
-        """
-        Get yearly aggregated totals by record type.
-        """
-        sql = """
-        SELECT
-            record_type,
-            MONTH(record_date) AS month,
-            SUM(price) AS total
-        FROM records
-        WHERE user_id = %s
-          AND YEAR(record_date) = %s
-        GROUP BY record_type, MONTH(record_date)
-        ORDER BY month
-        """
-        return self.fetch_all(sql, (user_id, year))
+# Backend/Database/RecallDB.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+
+
+class RecallDB(ConnectDB):
+    """
+    RecallDB is responsible for:
+    - Fetching income / expense records from the database
+    - Providing data to Dashboard / MakeGraph
+
+    NOTE:
+    - Read-only: served by a read replica when DBConfig.replicas is set
+    - Aggregates are cached per user and query shape (AggregateCache)
+    """
+
+    read_only = True
+
+    # =========================
+    # Basic Fetch
+    # =========================
+    def get_records_by_user(
+        self,
+        user_id: int,
+        record_type: str | None = None,
+        limit: int | None = None,
+    ) -> List[Tuple]:
+        """
+        Fetch records for a user.
+
+        :param user_id: user ID
+        :param record_type: 'income', 'expense', or None (both)
+        :param limit: max number of rows
+        """
+
+        base_sql, params = self._records_query(user_id, record_type)
+
+        if limit:
+            base_sql += " LIMIT %s"
+            params.append(limit)
+
+        return self.fetch_all(base_sql, params)
+
+    def get_records_page(
+        self,
+        user_id: int,
+        after: Tuple | None,
+        limit: int,
+        record_type: str | None = None,
+    ) -> List[Tuple]:
+        """
+        Fetch one page of records by keyset (seek) pagination.
+
+        Same columns and order as get_records_by_user. Rows strictly after
+        `after` in that order are returned, so every page costs one index
+        range scan no matter how deep it is (no OFFSET).
+
+        :param after: (record_date, created_at, id) of the last row seen, or None
+        :param limit: max number of rows
+        """
+        base_sql, params = self._records_query(user_id, record_type, after)
+        base_sql += " LIMIT %s"
+        params.append(limit)
+
+        return self.fetch_all(base_sql, params)
+
+    def get_changes(self, user_id: int, after: Tuple[int, int], limit: int) -> List[Tuple]:
+        """
+        Records inserted / updated and ids deleted after a sync position.
+
+        :param after: (change_version, id) of the last change the client applied
+        :param limit: max number of rows
+        :return: rows of (version, id, deleted, record_type, price, service,
+                 record_date, created_at); deleted rows carry only version / id
+        """
+        # Spelled out rather than (version, id) > (%s, %s): MySQL only
+        # range-scans the indexes for plain comparisons
+        sql = """
+        SELECT change_version, id, 0, record_type, price, service, record_date, created_at
+        FROM records
+        WHERE user_id = %s
+          AND (change_version > %s OR (change_version = %s AND id > %s))
+        UNION ALL
+        SELECT version, record_id, 1, NULL, NULL, NULL, NULL, NULL
+        FROM record_tombstones
+        WHERE user_id = %s
+          AND (version > %s OR (version = %s AND record_id > %s))
+        ORDER BY 1, 2
+        LIMIT %s
+        """
+        version, record_id = after
+        position = (version, version, record_id)
+        return self.fetch_all(sql, (user_id, *position, user_id, *position, limit))
+
+    def iter_records(
+        self,
+        user_id: int,
+        record_type: str | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[Tuple]:
+        """
+        Stream every record of a user (export / aggregation).
+
+        Same columns and order as get_records_by_user, but rows come from a
+        server-side cursor in chunks instead of one list in memory.
+
+        :param user_id: user ID
+        :param record_type: 'income', 'expense', or None (both)
+        :param chunk_size: rows read per round trip
+        """
+        base_sql, params = self._records_query(user_id, record_type)
+        return self.fetch_iter(base_sql, params, chunk_size=chunk_size)
+
+    @staticmethod
+    def _records_query(
+        user_id: int,
+        record_type: str | None,
+        after: Tuple | None = None,
+    ) -> Tuple[str, List[Any]]:
+        base_sql = """
+        SELECT
+            id,
+            record_type,
+            price,
+            service,
+            record_date,
+            created_at
+        FROM records
+        WHERE user_id = %s
+        """
+
+        params: List[Any] = [user_id]
+
+        if record_type:
+            base_sql += " AND record_type = %s"
+            params.append(record_type)
+
+        if after is not None:
+            # Spelled out: MySQL does not range-scan a row-value comparison,
+            # but does turn this into ranges on (user_id, record_date, created_at)
+            base_sql += (
+                " AND (record_date < %s"
+                " OR (record_date = %s AND (created_at < %s OR (created_at = %s AND id < %s))))"
+            )
+            record_date, created_at, record_id = after
+            params.extend((record_date, record_date, created_at, created_at, record_id))
+
+        # id breaks ties, so the order (and every keyset cursor) is total
+        base_sql += " ORDER BY record_date DESC, created_at DESC, id DESC"
+
+        return base_sql, params
+
+    # =========================
+    # Aggregations (Graphs)
+    # =========================
+    # group_by name -> SQL column (month / year are folded from record_date
+    # in Python, so GROUP BY never wraps the indexed column in a function)
+    GROUP_COLUMNS = {
+        "record_type": "record_type",
+        "service": "service",
+        "record_date": "record_date",
+        "month": "record_date",
+        "year": "record_date",
+    }
+
+    def query(
+        self,
+        user_id: int,
+        start: date | None,
+        end: date | None,
+        record_type: str | None = None,
+        service: str | None = None,
+        group_by: Sequence[str] = ("record_type",),
+    ) -> List[Tuple]:
+        """
+        Sum prices for a user over the half-open range [start, end).
+
+        Reads daily_rollups, so the cost follows the number of days (and
+        services) in the range, not the number of records. Predicates are
+        plain comparisons on record_date, so the primary key serves the range.
+
+        :param start: first day included (None = no lower bound)
+        :param end: first day excluded (None = no upper bound)
+        :param record_type: 'income', 'expense', or None (both)
+        :param service: exact service name, or None (all)
+        :param group_by: any of GROUP_COLUMNS, in output order ("month"
+            groups by the first day of the month, so years stay apart)
+        :return: rows of (*group values, total), sorted by group values
+        """
+        return AggregateCache.get_or_load(
+            self._config,
+            user_id,
+            ("query", start, end, record_type, service, tuple(group_by)),
+            lambda: self._query(user_id, start, end, record_type, service, group_by),
+        )
+
+    def _query(
+        self,
+        user_id: int,
+        start: date | None,
+        end: date | None,
+        record_type: str | None,
+        service: str | None,
+        group_by: Sequence[str],
+    ) -> List[Tuple]:
+        unknown = [g for g in group_by if g not in self.GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unsupported group_by: {unknown}")
+
+        sql_columns = list(dict.fromkeys(self.GROUP_COLUMNS[g] for g in group_by))
+
+        sql = "SELECT "
+        sql += "".join(f"{column}, " for column in sql_columns)
+        sql += "SUM(total) FROM daily_rollups WHERE user_id = %s"
+        params: List[Any] = [user_id]
+
+        if start is not None:
+            sql += " AND record_date >= %s"
+            params.append(start)
+        if end is not None:
+            sql += " AND record_date < %s"
+            params.append(end)
+        if record_type:
+            sql += " AND record_type = %s"
+            params.append(record_type)
+        if service:
+            sql += " AND service = %s"
+            params.append(service)
+        if sql_columns:
+            sql += " GROUP BY " + ", ".join(sql_columns)
+
+        rows = self.fetch_all(sql, params)
+
+        # Fold SQL groups into the requested keys (e.g. days -> months)
+        totals: Dict[Tuple, Any] = {}
+        for row in rows:
+            values = dict(zip(sql_columns, row))
+            key = tuple(self._group_value(g, values[self.GROUP_COLUMNS[g]]) for g in group_by)
+            total = row[-1] or 0
+            totals[key] = total if key not in totals else totals[key] + total
+
+        return [(*key, total) for key, total in sorted(totals.items())]
+
+    def get_dashboard_totals(self, user_id: int, today: date) -> List[Tuple]:
+        """
+        Everything the dashboard aggregates, in one scan of daily_rollups.
+
+        :return: rows of (record_type, service, all-time total, total on `today`)
+        """
+        sql = """
+        SELECT
+            record_type,
+            service,
+            SUM(total),
+            SUM(CASE WHEN record_date = %s THEN total ELSE 0 END)
+        FROM daily_rollups
+        WHERE user_id = %s
+        GROUP BY record_type, service
+        """
+        return AggregateCache.get_or_load(
+            self._config,
+            user_id,
+            ("dashboard_totals", today),
+            lambda: self.fetch_all(sql, (today, user_id)),
+        )
+
+    @staticmethod
+    def _group_value(name: str, value: Any) -> Any:
+        if name == "month":
+            return value.replace(day=1)
+        if name == "year":
+            return value.year
+        return value
+
+    def get_monthly_summary(self, user_id: int, year: int, month: int) -> List[Tuple]:
+        """
+        Get monthly aggregated totals by record type.
+        """
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return self.query(user_id, start, end, group_by=("record_type",))
+
+    def get_yearly_summary(self, user_id: int, year: int) -> List[Tuple]:
+        """
+        Get yearly aggregated totals by record type and month.
+        """
+        rows = self.query(
+            user_id,
+            date(year, 1, 1),
+            date(year + 1, 1, 1),
+            group_by=("record_type", "month"),
+        )
+        # One year: the month number alone is unambiguous
+        return [(record_type, month.month, total) for record_type, month, total in rows]
@@ -1,51 +1,226 @@
-# Backend/Database/RecordDB.py
-from __future__ import annotations
-
-from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
-
-
-class RecordDB(ConnectDB):
-    """
-    RecordDB is responsible for:
-    - Inserting income / expense records into the database
-    """
-
-    def add_record(
-        self,
-        user: UserInformation,
-        record: InputInformation,
-        record_type: str,
-    ) -> None:
-        """
-        Add a single income or expense record.
-
-        :param user: logged-in user
-        :param record: input data (price, service, date)
-        :param record_type: 'income' or 'expense'
-        """
-
-        if record_type not in ("income", "expense"):
-            raise ValueError("record_type must be 'income' or 'expense'")
-
-        sql = """
-        INSERT INTO records (
-            user_id,
-            record_type,
-            price,
-            service,
-            record_date
-        )
-        VALUES (%s, %s, %s, %s, %s)
-        """
-
-        params = (
-            user.user_id,
-            record_type,
-            record.price,
-            record.service,
-            record.record_date,
-        )
-
-        self.execute(sql, params)
+# Backend/Database/RecordDB.py
+from __future__ import annotations
+
+from decimal import Decimal
+from itertools import chain
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordEvents import RecordEvents
+from CYBR_404.WalletNote_ver_06.Backend.Database.RollupDB import RollupDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+class RecordDB(ConnectDB):
+    """
+    RecordDB is responsible for:
+    - Inserting income / expense records into the database
+    - Bulk inserts (chunked multi-row VALUES, one transaction)
+    - Import duplicate lookups (records.import_hash)
+    - Keeping daily_rollups and the user's data version in step (same transaction)
+    - Publishing RecordEvents once the insert has committed
+    """
+
+    # Rows per INSERT statement. SQLite allows 999 bound parameters per
+    # statement and each row binds 7 (see _insert_chunk): 999 // 7 = 142
+    BULK_CHUNK_ROWS = {
+        "mysql": 500,
+        "sqlite": 999 // 7,
+    }
+
+    # Hashes per lookup statement (same SQLite parameter limit)
+    HASH_LOOKUP_CHUNK = 500
+
+    def __init__(self, config: DBConfig | None = None) -> None:
+        super().__init__(config)
+        self.rollup_db = RollupDB(self._config)
+        self.version_db = DataVersionDB(self._config)
+
+    def add_record(
+        self,
+        user: UserInformation,
+        record: InputInformation,
+        record_type: str,
+        source: str = "manual",
+        import_hash: str | None = None,
+    ) -> None:
+        """
+        Add a single income or expense record.
+
+        :param user: logged-in user
+        :param record: input data (price, service, date)
+        :param record_type: 'income' or 'expense'
+        :param source: where the record came from ('manual', 'ocr', ...), for events
+        :param import_hash: records.import_hash (the image's SHA-256 for OCR uploads)
+        """
+
+        if record_type not in ("income", "expense"):
+            raise ValueError("record_type must be 'income' or 'expense'")
+
+        sql = """
+        INSERT INTO records (
+            user_id,
+            record_type,
+            price,
+            service,
+            record_date,
+            change_version,
+            import_hash
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+
+        with self.transaction():
+            version = self.version_db.bump(user.user_id)
+
+            params = (
+                user.user_id,
+                record_type,
+                record.price,
+                record.service,
+                record.record_date,
+                version,
+                import_hash,
+            )
+            self.execute(sql, params)
+            self.rollup_db.add(
+                user.user_id,
+                record.record_date,
+                record_type,
+                record.service,
+                record.price,
+            )
+
+            event = {
+                "type": "record_added",
+                "source": source,
+                "record": {
+                    "record_type": record_type,
+                    "price": float(record.price),
+                    "service": record.service,
+                    "record_date": record.record_date.isoformat(),
+                },
+            }
+            self.after_commit(lambda: RecordEvents.publish(user.user_id, event))
+
+    def add_records(
+        self,
+        user: UserInformation,
+        records: Iterable[InputInformation],
+        record_type: str,
+        import_hashes: Sequence[str] | None = None,
+    ) -> int:
+        """
+        Add many income or expense records in one transaction.
+
+        Rows go out as multi-row INSERTs of BULK_CHUNK_ROWS each, and the
+        daily rollups get one upsert per (date, service) bucket.
+
+        :param user: logged-in user
+        :param records: validated input data
+        :param record_type: 'income' or 'expense'
+        :param import_hashes: records.import_hash per record (imports only)
+        :return: number of records inserted
+        """
+
+        if record_type not in ("income", "expense"):
+            raise ValueError("record_type must be 'income' or 'expense'")
+
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            # Nothing to add: leave the data version (and every ETag) alone
+            return 0
+        records = chain((first,), records)
+
+        chunk_rows = self.BULK_CHUNK_ROWS[self.dialect]
+        hashes = iter(import_hashes) if import_hashes is not None else None
+        buckets: Dict[Tuple, Tuple[Decimal, int]] = {}
+        chunk = []
+        inserted = 0
+
+        with self.transaction():
+            version = self.version_db.bump(user.user_id)
+
+            for record in records:
+                chunk.append((record, next(hashes) if hashes is not None else None))
+                key = (record.record_date, record.service)
+                total, count = buckets.get(key, (Decimal("0"), 0))
+                buckets[key] = (total + record.price, count + 1)
+
+                if len(chunk) == chunk_rows:
+                    self._insert_chunk(user, chunk, record_type, version)
+                    inserted += len(chunk)
+                    chunk = []
+
+            if chunk:
+                self._insert_chunk(user, chunk, record_type, version)
+                inserted += len(chunk)
+
+            self.rollup_db.add_many(user.user_id, record_type, buckets)
+
+            if inserted:
+                event = {"type": "records_added", "record_type": record_type, "count": inserted}
+                self.after_commit(lambda: RecordEvents.publish(user.user_id, event))
+
+        return inserted
+
+    def _insert_chunk(
+        self,
+        user: UserInformation,
+        chunk: list,
+        record_type: str,
+        version: int,
+    ) -> None:
+        values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+        sql = f"""
+        INSERT INTO records (
+            user_id,
+            record_type,
+            price,
+            service,
+            record_date,
+            import_hash,
+            change_version
+        )
+        VALUES {values}
+        """
+
+        params = []
+        for record, import_hash in chunk:
+            params += [
+                user.user_id,
+                record_type,
+                record.price,
+                record.service,
+                record.record_date,
+                import_hash,
+                version,
+            ]
+
+        self.execute(sql, params)
+
+    def existing_import_hashes(self, user: UserInformation, hashes: List[str]) -> Set[str]:
+        """
+        Return which of `hashes` the user already has imported.
+
+        Runs on the primary (not a replica): it must see the batches this
+        same import wrote a moment ago.
+        """
+        found: Set[str] = set()
+        for start in range(0, len(hashes), self.HASH_LOOKUP_CHUNK):
+            chunk = hashes[start:start + self.HASH_LOOKUP_CHUNK]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            rows = self.fetch_all(
+                f"""
+                SELECT import_hash
+                FROM records
+                WHERE user_id = %s
+                  AND import_hash IN ({placeholders})
+                """,
+                (user.user_id, *chunk),
+            )
+            found.update(row[0] for row in rows)
+        return found
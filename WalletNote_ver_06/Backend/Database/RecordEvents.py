@@ -0,0 +1,85 @@
+# Backend/Database/RecordEvents.py
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Dict, List
+
+
+class Subscription:
+    """
+    One listener's queue of events for one user.
+    """
+
+    def __init__(self, user_id: int, max_pending: int) -> None:
+        self.user_id = user_id
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_pending)
+        # Set when events were dropped; the listener should refetch everything
+        self.overflowed = False
+
+    def put(self, event: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait up to `timeout` seconds, then return every pending event ([] on timeout).
+        """
+        try:
+            events = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class RecordEvents:
+    """
+    RecordEvents is responsible for:
+    - Per-user publish / subscribe of "record added / updated / deleted"
+    - Delivering only committed writes (RecordDB / EditDB publish after commit)
+
+    IMPORTANT:
+    - In-process: a listener only hears writes made by the same worker
+      process; a multi-process deployment needs a shared broker here
+    - No Flask dependency (app.py streams subscriptions as SSE)
+    """
+
+    MAX_PENDING = 100
+
+    _lock = threading.Lock()
+    _subscriptions: Dict[int, List[Subscription]] = {}
+
+    @classmethod
+    def subscribe(cls, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, cls.MAX_PENDING)
+        with cls._lock:
+            cls._subscriptions.setdefault(user_id, []).append(subscription)
+        return subscription
+
+    @classmethod
+    def unsubscribe(cls, subscription: Subscription) -> None:
+        with cls._lock:
+            listeners = cls._subscriptions.get(subscription.user_id, [])
+            if subscription in listeners:
+                listeners.remove(subscription)
+            if not listeners:
+                cls._subscriptions.pop(subscription.user_id, None)
+
+    @classmethod
+    def publish(cls, user_id: int, event: Dict[str, Any]) -> None:
+        with cls._lock:
+            listeners = list(cls._subscriptions.get(user_id, ()))
+        for subscription in listeners:
+            subscription.put(event)
+
+    @classmethod
+    def listener_count(cls) -> int:
+        with cls._lock:
+            return sum(len(listeners) for listeners in cls._subscriptions.values())
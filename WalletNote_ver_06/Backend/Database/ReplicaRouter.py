@@ -0,0 +1,149 @@
+# Backend/Database/ReplicaRouter.py
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextvars import ContextVar, Token
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+
+_current: ContextVar[Optional["ReadRouting"]] = ContextVar("walletnote_read_routing", default=None)
+
+
+class ReadRouting:
+    """
+    Per-request routing state for read-your-writes.
+
+    - pinned: reads must go to the primary (the user wrote recently)
+    - wrote: a write happened in this request
+
+    IMPORTANT:
+    - No Flask dependency; app.py carries the "recently wrote" window
+      across requests in the session
+    """
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+        self._token: Token | None = None
+
+    @staticmethod
+    def current() -> Optional["ReadRouting"]:
+        return _current.get()
+
+    def begin(self) -> "ReadRouting":
+        self._token = _current.set(self)
+        return self
+
+    def end(self) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+
+class ReplicaRouter:
+    """
+    ReplicaRouter is responsible for:
+    - Choosing a read replica for read-only repositories (RecallDB)
+    - Round-robin or least-latency selection
+    - Skipping replicas that failed recently
+
+    Replicas share user / password / database with the primary and are
+    listed in DBConfig.replicas as "host" or "host:port".
+    """
+
+    _lock = threading.Lock()
+    _round_robin = itertools.count()
+    _latency: Dict[Tuple, float] = {}
+    _down_until: Dict[Tuple, float] = {}
+
+    # Weight of the newest sample in the latency moving average
+    LATENCY_ALPHA = 0.2
+
+    @staticmethod
+    def note_write() -> None:
+        """
+        Called on every write: later reads in this request use the primary.
+        """
+        routing = _current.get()
+        if routing is not None:
+            routing.wrote = True
+            routing.pinned = True
+
+    @staticmethod
+    def replica_configs(config) -> List:
+        configs = []
+        for entry in config.replicas:
+            host, _, port = entry.partition(":")
+            configs.append(
+                replace(config, host=host, port=int(port) if port else config.port, replicas=())
+            )
+        return configs
+
+    @classmethod
+    def choose(cls, config):
+        """
+        Return the DBConfig of the replica to read from, or None for the primary.
+        """
+        if not config.replicas or config.engine != "mysql" or config.pool_size <= 0:
+            return None
+
+        routing = _current.get()
+        if routing is not None and routing.pinned:
+            return None
+
+        now = time.monotonic()
+        with cls._lock:
+            candidates = [
+                replica
+                for replica in cls.replica_configs(config)
+                if cls._down_until.get(cls._key(replica), 0.0) <= now
+            ]
+            if not candidates:
+                return None
+
+            if config.replica_strategy == "least_latency":
+                # Unmeasured replicas score 0 so each gets tried once
+                return min(candidates, key=lambda r: cls._latency.get(cls._key(r), 0.0))
+
+            return candidates[next(cls._round_robin) % len(candidates)]
+
+    @classmethod
+    def observe(cls, replica, seconds: float) -> None:
+        """
+        Feed one measured checkout + statement time into the moving average.
+        """
+        key = cls._key(replica)
+        with cls._lock:
+            previous = cls._latency.get(key)
+            if previous is None:
+                cls._latency[key] = seconds
+            else:
+                cls._latency[key] = previous + cls.LATENCY_ALPHA * (seconds - previous)
+
+    @classmethod
+    def mark_down(cls, replica) -> None:
+        """
+        Stop routing to a replica for `replica_retry_after` seconds.
+        """
+        with cls._lock:
+            cls._down_until[cls._key(replica)] = time.monotonic() + replica.replica_retry_after
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, float]]:
+        now = time.monotonic()
+        with cls._lock:
+            keys = set(cls._latency) | set(cls._down_until)
+            return {
+                f"{host}:{port}": {
+                    "latency_ms": cls._latency.get((host, port), 0.0) * 1000,
+                    "down": cls._down_until.get((host, port), 0.0) > now,
+                }
+                for host, port in keys
+            }
+
+    @staticmethod
+    def _key(replica) -> Tuple:
+        return (replica.host, replica.port)
@@ -0,0 +1,132 @@
+# Backend/Database/RollupDB.py
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+
+
+class RollupDB(ConnectDB):
+    """
+    RollupDB is responsible for:
+    - Maintaining `daily_rollups` (user, date, record type, service)
+    - Applying the delta of every record insert / update / delete
+    - Folding a bulk insert into one upsert per daily bucket
+    - Invalidating the user's cached aggregates (every write path
+      that changes totals passes through here)
+
+    IMPORTANT:
+    - Callers run these inside the same transaction as the records change
+    - Read side lives in RecallDB.query()
+    """
+
+    INSERT_SQL = """
+    INSERT INTO daily_rollups (
+        user_id,
+        record_date,
+        record_type,
+        service,
+        total,
+        record_count
+    )
+    VALUES {rows}
+    """
+
+    ON_CONFLICT_SQL = {
+        "mysql": """
+        ON DUPLICATE KEY UPDATE
+            total = total + VALUES(total),
+            record_count = record_count + VALUES(record_count)
+        """,
+        "sqlite": """
+        ON CONFLICT (user_id, record_date, record_type, service) DO UPDATE SET
+            total = total + excluded.total,
+            record_count = record_count + excluded.record_count
+        """,
+    }
+
+    # Rows per upsert statement (SQLite allows 999 parameters per statement)
+    CHUNK_ROWS = 150
+
+    def add(
+        self,
+        user_id: int,
+        record_date: date,
+        record_type: str,
+        service: str,
+        price: Decimal,
+    ) -> None:
+        """
+        Count one new record into its daily bucket.
+        """
+        self._apply(user_id, record_date, record_type, service, price, 1)
+
+    def add_many(
+        self,
+        user_id: int,
+        record_type: str,
+        buckets: Dict[Tuple[date, str], Tuple[Decimal, int]],
+    ) -> None:
+        """
+        Count many new records at once.
+
+        :param buckets: (record_date, service) -> (sum of prices, record count)
+        """
+        rows = [
+            (user_id, record_date, record_type, service, total, count)
+            for (record_date, service), (total, count) in buckets.items()
+        ]
+        for start in range(0, len(rows), self.CHUNK_ROWS):
+            self._upsert(rows[start:start + self.CHUNK_ROWS])
+        self._changed(user_id)
+
+    def remove(
+        self,
+        user_id: int,
+        record_date: date,
+        record_type: str,
+        service: str,
+        price: Decimal,
+    ) -> None:
+        """
+        Take one record out of its daily bucket (dropped when empty).
+        """
+        self._apply(user_id, record_date, record_type, service, -price, -1)
+
+        self.execute(
+            """
+            DELETE FROM daily_rollups
+            WHERE user_id = %s
+              AND record_date = %s
+              AND record_type = %s
+              AND service = %s
+              AND record_count <= 0
+            """,
+            (user_id, record_date, record_type, service),
+        )
+
+    def _apply(
+        self,
+        user_id: int,
+        record_date: date,
+        record_type: str,
+        service: str,
+        amount: Decimal,
+        count: int,
+    ) -> None:
+        self._upsert([(user_id, record_date, record_type, service, amount, count)])
+        self._changed(user_id)
+
+    def _changed(self, user_id: int) -> None:
+        # Now, so later reads in this transaction see the write; and again
+        # at commit / rollback, for anything cached from the old state meanwhile
+        AggregateCache.invalidate(user_id)
+        self.after_transaction(lambda: AggregateCache.invalidate(user_id))
+
+    def _upsert(self, rows) -> None:
+        sql = self.INSERT_SQL.format(rows=", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows)))
+        sql += self.ON_CONFLICT_SQL[self.dialect]
+        self.execute(sql, [value for row in rows for value in row])
@@ -0,0 +1,72 @@
+# Backend/Database/SQLiteEngine.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict
+
+
+# Python -> SQLite
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+
+# SQLite -> Python (by declared column type, same types mysql.connector returns)
+sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+
+
+class SQLiteEngine:
+    """
+    Embedded SQLite backend for ConnectDB (engine="sqlite").
+
+    Responsibilities:
+    - One connection per thread to a database file, opened in WAL mode
+    - Translating the MySQL-style `%s` placeholders used across the repo
+
+    IMPORTANT:
+    - Use a file path; ":memory:" would give every thread its own database
+    - Connections run in autocommit; UnitOfWork issues BEGIN explicitly
+    """
+
+    _engines: Dict[str, "SQLiteEngine"] = {}
+    _engines_lock = threading.Lock()
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    @classmethod
+    def for_path(cls, path: str) -> "SQLiteEngine":
+        with cls._engines_lock:
+            engine = cls._engines.get(path)
+            if engine is None:
+                engine = cls(path)
+                cls._engines[path] = engine
+            return engine
+
+    @staticmethod
+    def translate(sql: str) -> str:
+        """
+        Convert `%s` placeholders to SQLite's `?`.
+        """
+        return sql.replace("%s", "?")
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                isolation_level=None,
+                check_same_thread=True,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
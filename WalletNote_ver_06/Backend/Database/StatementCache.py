@@ -0,0 +1,98 @@
+# Backend/Database/StatementCache.py
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict
+
+import mysql.connector
+
+
+class StatementCache:
+    """
+    Per-connection cache of server-side prepared statements.
+
+    Each entry is a prepared cursor (binary protocol) keyed by SQL text.
+    Re-executing the same SQL on a cached cursor skips the PREPARE round
+    trip; the least recently used statement is closed when the cache is full.
+
+    IMPORTANT:
+    - One cache per connection (a prepared statement lives on its connection)
+    - A connection is used by one thread at a time, so no per-cache lock
+    """
+
+    _caches: "weakref.WeakKeyDictionary[Any, StatementCache]" = weakref.WeakKeyDictionary()
+    _caches_lock = threading.Lock()
+
+    def __init__(self, conn, max_size: int) -> None:
+        self._conn = weakref.ref(conn)
+        self._max_size = max_size
+        self._cursors: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def for_connection(cls, conn, max_size: int) -> "StatementCache":
+        """
+        Return the cache attached to `conn`, creating it on first use.
+        """
+        with cls._caches_lock:
+            cache = cls._caches.get(conn)
+            if cache is None:
+                cache = cls(conn, max_size)
+                cls._caches[conn] = cache
+            return cache
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, int]:
+        """
+        Hit / miss / eviction totals over every live connection.
+        """
+        with cls._caches_lock:
+            caches = list(cls._caches.values())
+
+        totals = {"statements": 0, "hits": 0, "misses": 0, "evictions": 0}
+        for cache in caches:
+            totals["statements"] += len(cache._cursors)
+            totals["hits"] += cache.hits
+            totals["misses"] += cache.misses
+            totals["evictions"] += cache.evictions
+        return totals
+
+    def cursor(self, sql: str):
+        """
+        Return the prepared cursor for `sql`, preparing it lazily on execute.
+        """
+        cur = self._cursors.get(sql)
+        if cur is not None:
+            self._cursors.move_to_end(sql)
+            self.hits += 1
+            return cur
+
+        self.misses += 1
+        cur = self._conn().cursor(prepared=True)
+        self._cursors[sql] = cur
+
+        if len(self._cursors) > self._max_size:
+            _, oldest = self._cursors.popitem(last=False)
+            self.evictions += 1
+            self._close(oldest)
+
+        return cur
+
+    def evict(self, sql: str) -> None:
+        """
+        Drop a statement, e.g. after it failed on the server.
+        """
+        cur = self._cursors.pop(sql, None)
+        if cur is not None:
+            self._close(cur)
+
+    @staticmethod
+    def _close(cur) -> None:
+        try:
+            cur.close()  # deallocates the server-side statement
+        except mysql.connector.Error:
+            pass
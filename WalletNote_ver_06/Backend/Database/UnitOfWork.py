@@ -0,0 +1,223 @@
+# Backend/Database/UnitOfWork.py
+from __future__ import annotations
+
+import mysql.connector
+from contextvars import ContextVar, Token
+from typing import Callable, List, Optional
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectionPool import ConnectionPool
+from CYBR_404.WalletNote_ver_06.Backend.Database.SQLiteEngine import SQLiteEngine
+
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("walletnote_unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    UnitOfWork is responsible for:
+    - Holding ONE connection and ONE transaction for a request / task
+    - Letting every ConnectDB subclass created meanwhile share it
+    - Committing once at the end (or rolling back on error)
+
+    IMPORTANT:
+    - The connection is only borrowed on the first statement
+    - No Flask dependency here (app.py binds it to flask.g)
+    """
+
+    def __init__(self, config=None) -> None:
+        # Imported here: ConnectDB itself looks up the current UnitOfWork
+        from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import DBConfig
+
+        self._config = config or DBConfig()
+        self._conn = None
+        self._pool: ConnectionPool | None = None
+        self._token: Token | None = None
+        self._after_transaction: List[Callable[[], None]] = []
+        self._after_commit: List[Callable[[], None]] = []
+        # Statements that changed data since the transaction began
+        self.has_pending_writes = False
+        # AggregateCache generation when the transaction began: its reads
+        # see no commit made after that (see AggregateCache.get_or_load)
+        self.cache_generation: int | None = None
+
+    # =========================
+    # Binding
+    # =========================
+    @staticmethod
+    def current() -> Optional["UnitOfWork"]:
+        """
+        Return the unit of work active in this context, if any.
+        """
+        return _current.get()
+
+    def begin(self) -> "UnitOfWork":
+        """
+        Make this the active unit of work for the current context.
+        """
+        self._token = _current.set(self)
+        return self
+
+    def end(self, exc: BaseException | None = None) -> None:
+        """
+        Commit (or roll back when `exc` is given), release the connection
+        and unbind from the current context.
+        """
+        try:
+            if exc is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self._release()
+            if self._token is not None:
+                _current.reset(self._token)
+                self._token = None
+
+    def __enter__(self) -> "UnitOfWork":
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end(exc)
+
+    # =========================
+    # Connection / Transaction
+    # =========================
+    def covers(self, config) -> bool:
+        """
+        True if statements for `config` can run on this unit's connection.
+        """
+        return ConnectionPool.key(config) == ConnectionPool.key(self._config)
+
+    def connection(self):
+        """
+        Return the shared connection, opening the transaction on first use.
+        """
+        if self._conn is None:
+            self._began()
+
+        if self._conn is None and self._config.engine == "sqlite":
+            self._conn = SQLiteEngine.for_path(self._config.sqlite_path).connection()
+            self._conn.execute("BEGIN")
+        elif self._conn is None:
+            if self._config.pool_size > 0:
+                self._pool = ConnectionPool.for_config(self._config)
+                self._conn = self._pool.acquire()
+            else:
+                self._conn = mysql.connector.connect(
+                    host=self._config.host,
+                    port=self._config.port,
+                    user=self._config.user,
+                    password=self._config.password,
+                    database=self._config.database,
+                )
+            self._conn.autocommit = False
+            self._conn.start_transaction()
+        return self._conn
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once the current transaction commits or rolls back
+        (e.g. cache invalidation: readers must not re-cache before commit).
+        """
+        self._after_transaction.append(callback)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` only if the current transaction commits
+        (e.g. notifying clients: a rolled-back write never happened).
+        """
+        self._after_commit.append(callback)
+
+    def commit(self) -> None:
+        try:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.commit()
+            self.has_pending_writes = False
+        except BaseException:
+            self._after_commit = []
+            raise
+        finally:
+            self._run_after_transaction()
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def checkpoint(self) -> None:
+        """
+        Commit the work so far and carry on in a fresh transaction
+        (long-running imports keep their transactions bounded).
+        """
+        if self._conn is None:
+            return
+
+        self.commit()
+        self._restart()
+
+    def rollback_to_checkpoint(self) -> None:
+        """
+        Roll back the work since the last commit / checkpoint and carry
+        on in a fresh transaction (a failed import batch is retried).
+        """
+        if self._conn is None:
+            return
+
+        self.rollback()
+        self._restart()
+
+    def note_write(self) -> None:
+        """
+        Called by ConnectDB for every write run on this unit's connection.
+        """
+        self.has_pending_writes = True
+
+    def _began(self) -> None:
+        # Imported here: AggregateCache itself looks up the current UnitOfWork
+        from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+
+        self.cache_generation = AggregateCache.generation()
+
+    def _restart(self) -> None:
+        self._began()
+        if self._config.engine == "sqlite":
+            self._conn.execute("BEGIN")
+        else:
+            self._conn.start_transaction()
+
+    def rollback(self) -> None:
+        self._after_commit = []
+        try:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.rollback()
+        finally:
+            self.has_pending_writes = False
+            self._run_after_transaction()
+
+    def _run_after_transaction(self) -> None:
+        callbacks, self._after_transaction = self._after_transaction, []
+        for callback in callbacks:
+            callback()
+
+    def _release(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+
+        if self._config.engine == "sqlite":
+            # Thread-local connection stays open; just end any transaction
+            if conn.in_transaction:
+                conn.rollback()
+            return
+
+        if self._pool is None:
+            ConnectionPool.close_quietly(conn)
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.autocommit = True
+        except mysql.connector.Error:
+            self._pool.discard(conn)
+        else:
+            self._pool.release(conn)
@@ -1,48 +1,123 @@
-from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
-
-
-class Dashboard:
-    def __init__(self):
-        self.recall_db = RecallDB()
-
-    def get_recent_records(self, user_id: int):
-        rows = self.recall_db.get_records_by_user(user_id)
-
-        results = []
-        for r in rows:
-            results.append({
-                "record_date": r[0],
-                "record_type": r[1],
-                "service": r[2],
-                "price": float(r[3]),
-            })
-        return results
-
-    def get_summary_by_type(self, user_id: int):
-        rows = self.recall_db.fetch_all(
-            """
-            SELECT record_type, SUM(price)
-            FROM records
-            WHERE user_id = %s
-            GROUP BY record_type
-            """,
-            (user_id,),
-        )
-
-        summary = {"income": 0, "expense": 0}
-        for r in rows:
-            summary[r[0]] = float(r[1])
-        return summary
-
-    def get_expense_by_service(self, user_id: int):
-        rows = self.recall_db.fetch_all(
-            """
-            SELECT service, SUM(price)
-            FROM records
-            WHERE user_id = %s AND record_type = 'expense'
-            GROUP BY service
-            """,
-            (user_id,),
-        )
-
-        return [{"service": r[0], "total": float(r[1])} for r in rows]
+import base64
+import json
+from datetime import date, datetime
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+
+
+class Dashboard:
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    def __init__(self):
+        self.recall_db = RecallDB()
+
+    def get_recent_records(self, user_id: int):
+        return self.get_records_page(user_id)["records"]
+
+    def get_records_page(self, user_id: int, cursor: str | None = None, limit: int = PAGE_SIZE):
+        """
+        One page of the history list, newest first.
+
+        :param cursor: `next_cursor` of the previous page (None = first page)
+        :raises ValueError: on a malformed cursor
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        after = self.decode_cursor(cursor) if cursor else None
+
+        # One extra row tells whether another page exists
+        rows = self.recall_db.get_records_page(user_id, after, limit + 1)
+
+        results = []
+        for r in rows[:limit]:
+            # id, record_type, price, service, record_date, created_at
+            results.append({
+                "id": r[0],
+                "record_date": r[4].isoformat(),
+                "record_type": r[1],
+                "service": r[3],
+                "price": float(r[2]),
+            })
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = self.encode_cursor(last[4], last[5], last[0])
+
+        return {"records": results, "next_cursor": next_cursor}
+
+    @staticmethod
+    def encode_cursor(record_date: date, created_at: datetime, record_id: int) -> str:
+        raw = json.dumps([record_date.isoformat(), created_at.isoformat(" "), record_id])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            record_date, created_at, record_id = json.loads(raw)
+            return (
+                date.fromisoformat(record_date),
+                datetime.fromisoformat(created_at),
+                int(record_id),
+            )
+        except (ValueError, TypeError):
+            raise ValueError("invalid cursor")
+
+    def get_dashboard(self, user_id: int):
+        """
+        Every dashboard figure in two queries: one over daily_rollups for
+        the totals, one for the first page of history.
+        """
+        payload = self.get_totals(user_id)
+        page = self.get_records_page(user_id)
+        payload["recent"] = page["records"]
+        payload["next_cursor"] = page["next_cursor"]
+        return payload
+
+    def calculate_balance(self, user_id: int) -> float:
+        return self.get_totals(user_id)["balance"]
+
+    def today_summary(self, user_id: int):
+        return self.get_totals(user_id)["today"]
+
+    def get_totals(self, user_id: int):
+        """
+        Balance, today's totals, type summary and expense per service (one query).
+        """
+        rows = self.recall_db.get_dashboard_totals(user_id, date.today())
+
+        summary = {"income": 0.0, "expense": 0.0}
+        today = {"income": 0.0, "expense": 0.0}
+        expense_by_service = []
+        for record_type, service, total, today_total in rows:
+            summary[record_type] += float(total or 0)
+            today[record_type] += float(today_total or 0)
+            if record_type == "expense":
+                expense_by_service.append({"service": service, "total": float(total or 0)})
+
+        return {
+            "balance": summary["income"] - summary["expense"],
+            "today": today,
+            "summary": summary,
+            "expense_by_service": expense_by_service,
+        }
+
+    def get_summary_by_type(self, user_id: int):
+        rows = self.recall_db.query(user_id, None, None, group_by=("record_type",))
+
+        summary = {"income": 0, "expense": 0}
+        for r in rows:
+            summary[r[0]] = float(r[1])
+        return summary
+
+    def get_expense_by_service(self, user_id: int):
+        rows = self.recall_db.query(
+            user_id,
+            None,
+            None,
+            record_type="expense",
+            group_by=("service",),
+        )
+
+        return [{"service": r[0], "total": float(r[1])} for r in rows]
@@ -0,0 +1,172 @@
+# Backend/System/ImagePreprocess.py
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+
+@dataclass
+class PreprocessConfig:
+    """
+    Which preprocessing stages run before OCR, and how.
+
+    Downscaling assumes the receipt spans the photo's width
+    (phone photos carry no usable DPI): an image wider than
+    receipt_width_inches * target_dpi pixels is shrunk to it.
+    """
+
+    exif_rotate: bool = True
+    downscale: bool = True
+    target_dpi: int = 300
+    receipt_width_inches: float = 4.0
+    greyscale: bool = True
+    deskew: bool = True
+    max_skew_degrees: float = 10.0
+    binarize: bool = True
+    # Window (pixels) the local mean is taken over, and how much darker
+    # than that mean a pixel must be to count as ink
+    binarize_window: int = 31
+    binarize_offset: int = 10
+
+    def __post_init__(self) -> None:
+        if self.target_dpi <= 0 or self.receipt_width_inches <= 0:
+            raise ValueError("target_dpi and receipt_width_inches must be positive")
+        if self.binarize_window < 3:
+            raise ValueError("binarize_window must be at least 3")
+
+    @classmethod
+    def disabled(cls) -> "PreprocessConfig":
+        """
+        Every stage off: the image goes to tesseract as uploaded.
+        """
+        return cls(exif_rotate=False, downscale=False, greyscale=False, deskew=False, binarize=False)
+
+
+class ImagePreprocess:
+    """
+    ImagePreprocess is responsible for:
+    - Turning a phone photo into a small, upright, black-on-white image
+      before OCR: EXIF rotation -> downscale -> greyscale -> deskew -> binarize
+
+    IMPORTANT:
+    - Pillow only (no numpy / OpenCV)
+    - Deskew and binarize work on greyscale, so they imply it
+    """
+
+    # Deskew search: width of the scoring thumbnail, coarse / fine steps (degrees)
+    DESKEW_THUMBNAIL_WIDTH = 600
+    DESKEW_COARSE_STEP = 1.0
+    DESKEW_FINE_STEP = 0.2
+
+    def __init__(self, config: PreprocessConfig | None = None) -> None:
+        self.config = config or PreprocessConfig()
+
+    # =========================
+    # Public API
+    # =========================
+    def run(self, image: Image.Image, timings: Dict[str, float] | None = None) -> Image.Image:
+        """
+        Apply the configured stages in order.
+
+        :param image: freshly opened image (JPEGs are decoded at reduced size)
+        :param timings: filled with seconds spent per stage that ran
+        :return: the processed image
+        """
+        timings = timings if timings is not None else {}
+        config = self.config
+
+        if config.downscale and image.format == "JPEG":
+            # Let the JPEG decoder skip pixels (1/2, 1/4, 1/8 scale) while
+            # both sides stay above the target width, whatever the rotation
+            max_width = round(config.target_dpi * config.receipt_width_inches)
+            image.draft(image.mode, (max_width, max_width))
+
+        stages = [
+            ("exif_rotate", config.exif_rotate, self._exif_rotate),
+            ("downscale", config.downscale, self._downscale),
+            ("greyscale", config.greyscale or config.deskew or config.binarize, self._greyscale),
+            ("deskew", config.deskew, self._deskew),
+            ("binarize", config.binarize, self._binarize),
+        ]
+        for name, enabled, stage in stages:
+            if enabled:
+                started = time.perf_counter()
+                image = stage(image)
+                timings[name] = time.perf_counter() - started
+
+        return image
+
+    # =========================
+    # Stages
+    # =========================
+    @staticmethod
+    def _exif_rotate(image: Image.Image) -> Image.Image:
+        return ImageOps.exif_transpose(image)
+
+    def _downscale(self, image: Image.Image) -> Image.Image:
+        max_width = round(self.config.target_dpi * self.config.receipt_width_inches)
+        if image.width <= max_width:
+            return image
+
+        height = round(image.height * max_width / image.width)
+        return image.resize((max_width, height), Image.LANCZOS)
+
+    @staticmethod
+    def _greyscale(image: Image.Image) -> Image.Image:
+        return image if image.mode == "L" else image.convert("L")
+
+    def _deskew(self, image: Image.Image) -> Image.Image:
+        angle = self._skew_angle(image)
+        if abs(angle) < self.DESKEW_FINE_STEP / 2:
+            return image
+        return image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+
+    def _binarize(self, image: Image.Image) -> Image.Image:
+        """
+        Adaptive threshold: ink is whatever is darker than its
+        neighbourhood, so shadows and uneven light drop out.
+        """
+        local_mean = image.filter(ImageFilter.BoxBlur(self.config.binarize_window // 2))
+        darker_by = ImageChops.subtract(local_mean, image)
+        offset = self.config.binarize_offset
+        return darker_by.point(lambda v: 0 if v > offset else 255)
+
+    # =========================
+    # Deskew helpers
+    # =========================
+    def _skew_angle(self, image: Image.Image) -> float:
+        """
+        Rotation (degrees, counter-clockwise) that makes text lines
+        horizontal: the one whose row profile has the sharpest peaks.
+        """
+        scale = min(1.0, self.DESKEW_THUMBNAIL_WIDTH / image.width)
+        thumbnail = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))))
+        # Ink -> white, so rotation fill (black) and paper add nothing to the profile
+        ink = ImageOps.invert(self._binarize(thumbnail))
+
+        limit = self.config.max_skew_degrees
+        best = self._best_angle(ink, -limit, limit, self.DESKEW_COARSE_STEP)
+        return self._best_angle(
+            ink,
+            best - self.DESKEW_COARSE_STEP,
+            best + self.DESKEW_COARSE_STEP,
+            self.DESKEW_FINE_STEP,
+        )
+
+    @staticmethod
+    def _best_angle(ink: Image.Image, low: float, high: float, step: float) -> float:
+        best_angle, best_score = 0.0, -1.0
+        steps = int(round((high - low) / step))
+        for i in range(steps + 1):
+            angle = low + i * step
+            rotated = ink.rotate(angle, resample=Image.NEAREST, fillcolor=0)
+            # Mean of every row in one C call
+            rows = list(rotated.resize((1, rotated.height), Image.BOX).getdata())
+            mean = sum(rows) / len(rows)
+            score = sum((value - mean) ** 2 for value in rows)
+            if score > best_score:
+                best_angle, best_score = angle, score
+        return best_angle
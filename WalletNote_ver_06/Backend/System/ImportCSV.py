@@ -0,0 +1,298 @@
+# Backend/System/ImportCSV.py
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Callable, Dict, Iterator, List, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+
+
+@dataclass
+class CSVMapping:
+    """
+    Where each field lives in a bank export.
+
+    Columns are header names, or 0-based indexes when has_header is False.
+
+    sign:
+    - "negative_expense": money out is negative (most bank accounts)
+    - "positive_expense": money out is positive (most credit card exports)
+    """
+
+    date: str | int = "date"
+    amount: str | int = "amount"
+    description: str | int = "description"
+    date_format: str = "%Y-%m-%d"
+    sign: str = "negative_expense"
+    decimal_separator: str = "."
+    delimiter: str = ","
+    encoding: str = "utf-8-sig"
+    has_header: bool = True
+
+    def __post_init__(self) -> None:
+        if self.sign not in ("negative_expense", "positive_expense"):
+            raise ValueError("sign must be 'negative_expense' or 'positive_expense'")
+        if self.decimal_separator not in (".", ","):
+            raise ValueError("decimal_separator must be '.' or ','")
+
+
+@dataclass
+class ImportProgress:
+    rows_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    # (line number, message) of the first MAX_ERRORS invalid lines
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+class ImportCSV:
+    """
+    ImportCSV is responsible for:
+    - Streaming a bank CSV export line by line (never fully in memory)
+    - Normalising lines through InputInformation
+    - Dropping lines already imported (hash of date, amount, service and
+      which occurrence of that line it is in the file, so two identical
+      purchases on one day are both kept)
+    - Writing through RecordDB in bounded batches, reporting progress
+
+    IMPORTANT:
+    - No Flask / HTML dependency
+    - Each batch is committed on its own; a failed import keeps
+      the batches before it, and re-running it skips them
+    - A batch that races a concurrent import of the same file is rolled
+      back and retried; the lines the other import stored count as duplicates
+    """
+
+    MAX_ERRORS = 100
+    MAX_SERVICE_LENGTH = 255
+    MAX_WRITE_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        user: UserInformation,
+        mapping: CSVMapping | None = None,
+        batch_size: int = 500,
+        on_progress: Callable[[ImportProgress], None] | None = None,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.user = user
+        self.mapping = mapping or CSVMapping()
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.record_db = RecordDB()
+
+    # =========================
+    # Public API
+    # =========================
+    def run(self, stream: IO[bytes]) -> ImportProgress:
+        """
+        Import a binary stream (e.g. an uploaded file) of CSV data.
+
+        :param stream: readable binary file object
+        :return: final counters
+        """
+        progress = ImportProgress()
+        text = io.TextIOWrapper(stream, encoding=self.mapping.encoding, newline="")
+
+        try:
+            batch = []
+            for line in self._parse(text, progress):
+                batch.append(line)
+                if len(batch) == self.batch_size:
+                    self._write(batch, progress)
+                    batch = []
+            if batch:
+                self._write(batch, progress)
+        finally:
+            text.detach()  # leave the caller's stream open
+
+        return progress
+
+    # =========================
+    # Parse / Validate
+    # =========================
+    def _parse(
+        self,
+        text: IO[str],
+        progress: ImportProgress,
+    ) -> Iterator[Tuple[str, InputInformation, str]]:
+        """
+        Yield (record_type, record, import_hash) for every valid line.
+        """
+        reader = csv.reader(text, delimiter=self.mapping.delimiter)
+        columns = self._columns(next(reader, [])) if self.mapping.has_header else None
+        if columns is None:
+            columns = (self.mapping.date, self.mapping.amount, self.mapping.description)
+
+        # (date, signed amount, service) -> valid lines seen so far
+        occurrences: Dict[Tuple[date, Decimal, str], int] = {}
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+
+            progress.rows_read += 1
+            try:
+                yield self._line(row, columns, occurrences)
+            except ValueError as exc:
+                progress.invalid += 1
+                if len(progress.errors) < self.MAX_ERRORS:
+                    progress.errors.append((reader.line_num, str(exc)))
+
+    def _columns(self, header: List[str]) -> Tuple[int, int, int]:
+        names = [name.strip() for name in header]
+        indexes = []
+        for column in (self.mapping.date, self.mapping.amount, self.mapping.description):
+            if isinstance(column, int):
+                indexes.append(column)
+            elif column in names:
+                indexes.append(names.index(column))
+            else:
+                raise ValueError(f"column '{column}' not found in header {names}")
+        return tuple(indexes)
+
+    def _line(
+        self,
+        row: List[str],
+        columns: Tuple[int, int, int],
+        occurrences: Dict[Tuple[date, Decimal, str], int],
+    ) -> Tuple[str, InputInformation, str]:
+        date_col, amount_col, description_col = columns
+        if max(columns) >= len(row):
+            raise ValueError(f"expected at least {max(columns) + 1} columns")
+
+        try:
+            record_date = datetime.strptime(row[date_col].strip(), self.mapping.date_format).date()
+        except ValueError:
+            raise ValueError(f"date '{row[date_col]}' does not match {self.mapping.date_format}")
+
+        amount = self._amount(row[amount_col])
+        if amount == 0:
+            raise ValueError("amount is zero")
+
+        money_out = amount < 0 if self.mapping.sign == "negative_expense" else amount > 0
+        record_type = "expense" if money_out else "income"
+
+        service = " ".join(row[description_col].split())[: self.MAX_SERVICE_LENGTH]
+        if not service:
+            raise ValueError("description is empty")
+
+        record = InputInformation(price=abs(amount), service=service, record_date=record_date)
+
+        key = (record_date, amount, service)
+        occurrences[key] = occurrences.get(key, 0) + 1
+        return record_type, record, self._hash(record, amount, occurrences[key])
+
+    def _amount(self, raw: str) -> Decimal:
+        value = raw.strip().replace(" ", "").replace("\u00a0", "")
+        if self.mapping.decimal_separator == ",":
+            value = value.replace(".", "").replace(",", ".")
+        else:
+            value = value.replace(",", "")
+
+        # "(12.50)" is accounting notation for -12.50
+        if value.startswith("(") and value.endswith(")"):
+            value = "-" + value[1:-1]
+
+        try:
+            amount = Decimal(value)
+        except InvalidOperation:
+            raise ValueError(f"amount '{raw}' is not a number")
+        if not amount.is_finite():
+            raise ValueError(f"amount '{raw}' is not a number")
+        if abs(amount) >= Decimal("100000000"):  # records.price is DECIMAL(10,2)
+            raise ValueError(f"amount '{raw}' is too large")
+        return amount.quantize(Decimal("0.01"))
+
+    @staticmethod
+    def _hash(record: InputInformation, signed_amount: Decimal, occurrence: int = 1) -> str:
+        key = f"{record.record_date.isoformat()}|{signed_amount}|{record.service}"
+        if occurrence > 1:
+            # First occurrences keep the key of earlier imports, so they still dedup
+            key += f"|{occurrence}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # =========================
+    # Write
+    # =========================
+    def _write(self, batch: List[Tuple[str, InputInformation, str]], progress: ImportProgress) -> None:
+        """
+        Drop duplicates, insert the rest, commit, report.
+
+        :raises ConnectDB.IntegrityError: still racing another import
+            after MAX_WRITE_ATTEMPTS (the batch is rolled back)
+        """
+        uow = UnitOfWork.current()
+        if uow is not None and not uow.covers(self.record_db.config):
+            uow = None
+
+        for attempt in range(1, self.MAX_WRITE_ATTEMPTS + 1):
+            try:
+                inserted, duplicates = self._insert(batch)
+            except self.record_db.IntegrityError:
+                # Another import stored some of these lines since the lookup.
+                # Outside a request-wide UnitOfWork the batch's own transaction
+                # has rolled back already
+                if uow is not None:
+                    uow.rollback_to_checkpoint()
+                if attempt == self.MAX_WRITE_ATTEMPTS:
+                    raise
+            else:
+                break
+
+        progress.inserted += inserted
+        progress.duplicates += duplicates
+
+        # Inside a request-wide UnitOfWork, commit per batch as well
+        if uow is not None:
+            uow.checkpoint()
+
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def _insert(self, batch: List[Tuple[str, InputInformation, str]]) -> Tuple[int, int]:
+        """
+        :return: (lines inserted, lines already imported)
+        """
+        existing = self.record_db.existing_import_hashes(
+            self.user,
+            list({import_hash for _, _, import_hash in batch}),
+        )
+
+        by_type: Dict[str, Tuple[List[InputInformation], List[str]]] = {
+            "income": ([], []),
+            "expense": ([], []),
+        }
+        duplicates = 0
+        for record_type, record, import_hash in batch:
+            if import_hash in existing:
+                duplicates += 1
+                continue
+            existing.add(import_hash)  # repeated within this batch
+
+            records, hashes = by_type[record_type]
+            records.append(record)
+            hashes.append(import_hash)
+
+        inserted = 0
+        with self.record_db.transaction():
+            for record_type, (records, hashes) in by_type.items():
+                if records:
+                    inserted += self.record_db.add_records(
+                        self.user,
+                        records,
+                        record_type,
+                        import_hashes=hashes,
+                    )
+        return inserted, duplicates
@@ -0,0 +1,224 @@
+# Backend/System/OCRBatch.py
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.OCRResultDB import OCRResultDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.ImagePreprocess import PreprocessConfig
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRSystem
+
+
+def _extract(
+    image_path: Path,
+    preprocess: PreprocessConfig | None,
+) -> Tuple[InputInformation, Dict[str, float]]:
+    # Runs in a pool worker; module level so it can be pickled
+    timings: Dict[str, float] = {}
+    record = OCRSystem.extract(image_path, timings, preprocess)
+    return record, timings
+
+
+@dataclass
+class OCRBatchItem:
+    image_path: Path
+    content_hash: str | None = None
+    record: InputInformation | None = None
+    error: str | None = None
+    # Fields reused from ocr_results or an identical image earlier in the batch
+    cached: bool = False
+    # Already saved from the same image (before, or earlier in the batch)
+    duplicate: bool = False
+    # Seconds in "preprocess" / "ocr" / "parse", measured inside the worker
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class OCRBatchResult:
+    # Same order as the images passed to run()
+    items: List[OCRBatchItem] = field(default_factory=list)
+    inserted: int = 0
+
+
+class OCRBatch:
+    """
+    OCRBatch is responsible for:
+    - OCR and parsing of many receipt images across a process pool
+    - Saving every extracted record with one RecordDB.add_records call
+    - Reusing cached results and skipping duplicates, as OCRSystem does
+
+    IMPORTANT:
+    - The pool is process-wide, one worker per core unless configure()
+      says otherwise, and lives until shutdown()
+    - Workers are spawned, not forked: the web server is multi-threaded
+    - A failed image is reported and skipped; the others are still saved
+    """
+
+    _pool: ProcessPoolExecutor | None = None
+    _processes: int | None = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, user: UserInformation, preprocess: PreprocessConfig | None = None) -> None:
+        self.user = user
+        self.preprocess = preprocess
+        self.record_db = RecordDB()
+        self.result_db = OCRResultDB()
+
+    # =========================
+    # Pool
+    # =========================
+    @classmethod
+    def configure(cls, processes: int | None) -> None:
+        """
+        Set the pool size (None -> os.cpu_count()); applies to the next pool.
+        """
+        if processes is not None and processes <= 0:
+            raise ValueError("processes must be positive")
+        cls.shutdown()
+        with cls._pool_lock:
+            cls._processes = processes
+
+    @classmethod
+    def pool(cls) -> ProcessPoolExecutor:
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = ProcessPoolExecutor(
+                    max_workers=cls._processes or os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return cls._pool
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    # =========================
+    # Public API
+    # =========================
+    def run(
+        self,
+        image_paths: Sequence[Path],
+        timings: Dict[str, float] | None = None,
+        content_hashes: Sequence[str] | None = None,
+    ) -> OCRBatchResult:
+        """
+        Extract every image in parallel, then save the successful ones as expenses.
+
+        :param image_paths: images already saved on disk
+        :param timings: filled with wall seconds for "lookup", "ocr" (all images) and "save"
+        :param content_hashes: SHA-256 hex per image (None -> no cache, no duplicate check)
+        :return: per-image outcome and number of records inserted
+        """
+        timings = timings if timings is not None else {}
+        hashes = list(content_hashes) if content_hashes is not None else [None] * len(image_paths)
+        result = OCRBatchResult(
+            items=[OCRBatchItem(image_path=path, content_hash=h) for path, h in zip(image_paths, hashes)]
+        )
+
+        started = time.perf_counter()
+        cached = {}
+        if content_hashes is not None:
+            cached = self.result_db.lookup(self.user.user_id, list(set(content_hashes)))
+
+        # One OCR per distinct image; repeats copy the first one's outcome
+        first: Dict[str, OCRBatchItem] = {}
+        pending: List[OCRBatchItem] = []
+        repeats: List[OCRBatchItem] = []
+        for item in result.items:
+            if item.content_hash in cached:
+                item.record, item.duplicate = cached[item.content_hash]
+                item.cached = True
+            elif item.content_hash in first:
+                repeats.append(item)
+            else:
+                pending.append(item)
+            if item.content_hash is not None:
+                first.setdefault(item.content_hash, item)
+        timings["lookup"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self._extract_all(pending)
+        for item in repeats:
+            original = first[item.content_hash]
+            item.record, item.error, item.cached = original.record, original.error, True
+        timings["ocr"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fresh = [item for item in pending if item.record is not None and item.content_hash is not None]
+        if fresh:
+            with self.result_db.transaction():
+                for item in fresh:
+                    self.result_db.put(self.user.user_id, item.content_hash, item.record)
+
+        result.inserted = self._save(result.items, content_hashes is not None)
+        timings["save"] = time.perf_counter() - started
+
+        return result
+
+    # =========================
+    # Internal
+    # =========================
+    def _extract_all(self, items: List[OCRBatchItem]) -> None:
+        pool = self.pool()
+        try:
+            futures = [pool.submit(_extract, item.image_path, self.preprocess) for item in items]
+            for item, future in zip(items, futures):
+                try:
+                    item.record, item.timings = future.result()
+                except ValueError as exc:
+                    item.error = str(exc)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); start a fresh pool next time
+            with self._pool_lock:
+                if self._pool is pool:
+                    OCRBatch._pool = None
+            raise
+
+    def _save(self, items: List[OCRBatchItem], deduplicate: bool) -> int:
+        to_save = []
+        saving = set()
+        for item in items:
+            if item.record is None or item.duplicate:
+                continue
+            if item.content_hash is not None and item.content_hash in saving:
+                item.duplicate = True
+                continue
+            saving.add(item.content_hash)
+            to_save.append(item)
+
+        if not to_save:
+            return 0
+
+        try:
+            return self._insert(to_save)
+        except self.record_db.IntegrityError:
+            if not deduplicate:
+                raise
+
+        # Some of these images were saved concurrently; skip those, retry once
+        saved = self.record_db.existing_import_hashes(self.user, [item.content_hash for item in to_save])
+        for item in to_save:
+            item.duplicate = item.content_hash in saved
+        to_save = [item for item in to_save if not item.duplicate]
+        return self._insert(to_save) if to_save else 0
+
+    def _insert(self, items: List[OCRBatchItem]) -> int:
+        return self.record_db.add_records(
+            self.user,
+            [item.record for item in items],
+            "expense",
+            import_hashes=[item.content_hash for item in items],
+        )
@@ -0,0 +1,93 @@
+# Backend/System/OCREngine.py
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict
+
+import pytesseract
+from PIL import Image
+
+
+class OCREngine:
+    """
+    Text recognition behind OCRSystem._run_ocr.
+
+    Engines (WALLETNOTE_OCR_ENGINE, or the name passed to get()):
+    - "subprocess": pytesseract; starts a tesseract process and loads the
+      language model for every image
+    - "tesserocr": the tesseract C++ API in-process; the model stays
+      loaded for the life of the thread
+    - "auto" (default): tesserocr if installed, else subprocess
+
+    One instance per engine name per process (OCRBatch's pool workers
+    each keep their own), created on first use.
+    """
+
+    NAMES = ("subprocess", "tesserocr")
+
+    _engines: Dict[str, "OCREngine"] = {}
+    _engines_lock = threading.Lock()
+
+    def image_to_string(self, image: Image.Image) -> str:
+        raise NotImplementedError
+
+    @classmethod
+    def get(cls, name: str | None = None) -> "OCREngine":
+        """
+        The process-wide engine for `name` (None -> WALLETNOTE_OCR_ENGINE).
+
+        :raises ValueError: unknown name
+        :raises RuntimeError: "tesserocr" asked for but not installed
+        """
+        name = name or os.getenv("WALLETNOTE_OCR_ENGINE", "auto")
+        if name == "auto":
+            name = "tesserocr" if TesserocrEngine.available() else "subprocess"
+        if name not in cls.NAMES:
+            raise ValueError(f"OCR engine must be one of {cls.NAMES} or 'auto'")
+
+        with cls._engines_lock:
+            engine = cls._engines.get(name)
+            if engine is None:
+                engine = TesserocrEngine() if name == "tesserocr" else SubprocessEngine()
+                cls._engines[name] = engine
+            return engine
+
+
+class SubprocessEngine(OCREngine):
+    def image_to_string(self, image: Image.Image) -> str:
+        return pytesseract.image_to_string(image)
+
+
+class TesserocrEngine(OCREngine):
+    """
+    IMPORTANT:
+    - A tesseract API handle is not thread-safe; each thread (OCRJobQueue
+      worker) gets its own, kept until the thread ends
+    """
+
+    LANG = "eng"
+
+    def __init__(self) -> None:
+        if not self.available():
+            raise RuntimeError("tesserocr is not installed")
+        self._local = threading.local()
+
+    @staticmethod
+    def available() -> bool:
+        try:
+            import tesserocr  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def image_to_string(self, image: Image.Image) -> str:
+        api = getattr(self._local, "api", None)
+        if api is None:
+            import tesserocr
+
+            api = tesserocr.PyTessBaseAPI(lang=self.LANG)
+            self._local.api = api
+
+        api.SetImage(image)
+        return api.GetUTF8Text()
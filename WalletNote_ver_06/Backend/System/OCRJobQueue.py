@@ -0,0 +1,271 @@
+# Backend/System/OCRJobQueue.py
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.ImagePreprocess import PreprocessConfig
+from CYBR_404.WalletNote_ver_06.Backend.System.OCRBatch import OCRBatch
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRSystem
+
+ocr_logger = logging.getLogger("walletnote.ocr")
+
+STAGES = ("queued", "lookup", "preprocess", "ocr", "parse", "save")
+
+
+@dataclass
+class OCRJob:
+    job_id: str
+    user_id: int
+    # One image, or several for a batch job
+    image_paths: List[Path]
+    # SHA-256 hex per image, taken while the upload was saved
+    content_hashes: List[str] | None = None
+    # "queued" -> "running" -> "done" | "failed"
+    status: str = "queued"
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    # Seconds per stage; "queued" is the wait for a free worker
+    timings: Dict[str, float] = field(default_factory=dict)
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "timings_ms": {stage: seconds * 1000 for stage, seconds in self.timings.items()},
+        }
+
+
+class OCRJobQueue:
+    """
+    OCRJobQueue is responsible for:
+    - Running OCRSystem.process_image (one image) or OCRBatch.run
+      (many images) off the request thread
+    - Bounding the work: `workers` jobs at once, at most `max_pending` waiting
+    - Keeping job status / result for `keep_seconds` after it finishes
+    - Per-stage timings per job and as running averages (stats())
+
+    IMPORTANT:
+    - No Flask dependency
+    - In-process: a job is only visible to the worker process that took it,
+      and queued jobs are lost on restart (the uploaded image stays on disk)
+    - Threads are enough here: tesseract runs as a subprocess or, in
+      process, without the GIL (OCREngine), and a batch job hands the
+      images to OCRBatch's process pool
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 100,
+        keep_seconds: float = 3600.0,
+        preprocess: PreprocessConfig | None = None,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_seconds = keep_seconds
+        self.preprocess = preprocess
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, OCRJob] = {}
+        self._queued = 0
+        self._running = 0
+        self._done = 0
+        self._failed = 0
+        self._stage_seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self._stage_counts: Dict[str, int] = {stage: 0 for stage in STAGES}
+
+    # =========================
+    # Public API
+    # =========================
+    def submit(self, user: UserInformation, image_path: Path, content_hash: str | None = None) -> OCRJob:
+        """
+        Queue an uploaded image for OCR.
+
+        :param user: owner of the resulting record
+        :param image_path: image already saved on disk
+        :param content_hash: SHA-256 hex of the image (enables the result cache and duplicate check)
+        :return: the queued job
+        :raises RuntimeError: if max_pending jobs are already waiting
+        """
+        hashes = [content_hash] if content_hash is not None else None
+        return self._submit(user, [image_path], hashes, self._process_one)
+
+    def submit_batch(
+        self,
+        user: UserInformation,
+        image_paths: Sequence[Path],
+        content_hashes: Sequence[str] | None = None,
+    ) -> OCRJob:
+        """
+        Queue many uploaded images; their records are saved in one bulk insert.
+
+        :param user: owner of the resulting records
+        :param image_paths: images already saved on disk
+        :param content_hashes: SHA-256 hex per image
+        :return: the queued job (counts as one against max_pending)
+        :raises RuntimeError: if max_pending jobs are already waiting
+        """
+        return self._submit(user, image_paths, content_hashes, self._process_batch)
+
+    def _submit(
+        self,
+        user: UserInformation,
+        image_paths: Sequence[Path],
+        content_hashes: Sequence[str] | None,
+        work: Callable[[OCRJob, UserInformation, Dict[str, float]], Dict[str, Any]],
+    ) -> OCRJob:
+        with self._lock:
+            self._prune()
+            if self._queued >= self.max_pending:
+                raise RuntimeError("OCR queue is full")
+
+            job = OCRJob(
+                job_id=uuid.uuid4().hex,
+                user_id=user.user_id,
+                image_paths=list(image_paths),
+                content_hashes=list(content_hashes) if content_hashes is not None else None,
+            )
+            self._jobs[job.job_id] = job
+            self._queued += 1
+
+        self._executor.submit(self._run, job, user, work)
+        return job
+
+    def get(self, job_id: str) -> OCRJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def depth(self) -> int:
+        """
+        Jobs waiting for a worker.
+        """
+        with self._lock:
+            return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "done": self._done,
+                "failed": self._failed,
+                "avg_ms": {
+                    stage: self._stage_seconds[stage] / count * 1000
+                    for stage, count in self._stage_counts.items()
+                    if count
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # =========================
+    # Worker
+    # =========================
+    def _run(
+        self,
+        job: OCRJob,
+        user: UserInformation,
+        work: Callable[[OCRJob, UserInformation, Dict[str, float]], Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            job.started_at = time.monotonic()
+            job.timings["queued"] = job.started_at - job.submitted_at
+            job.status = "running"
+            self._queued -= 1
+            self._running += 1
+
+        stage_timings: Dict[str, float] = {}
+        try:
+            result = work(job, user, stage_timings)
+        except ValueError as exc:
+            self._finish(job, stage_timings, error=str(exc))
+        except Exception:
+            ocr_logger.exception("OCR job %s failed", job.job_id)
+            self._finish(job, stage_timings, error="internal error")
+        else:
+            self._finish(job, stage_timings, result=result)
+
+    def _process_one(self, job: OCRJob, user: UserInformation, timings: Dict[str, float]) -> Dict[str, Any]:
+        content_hash = job.content_hashes[0] if job.content_hashes else None
+        return OCRSystem(self.preprocess).process_image(user, job.image_paths[0], timings, content_hash).to_dict()
+
+    def _process_batch(self, job: OCRJob, user: UserInformation, timings: Dict[str, float]) -> Dict[str, Any]:
+        batch = OCRBatch(user, self.preprocess).run(job.image_paths, timings, job.content_hashes)
+        images = []
+        for item in batch.items:
+            entry: Dict[str, Any] = {
+                "error": item.error,
+                "cached": item.cached,
+                "duplicate": item.duplicate,
+                "timings_ms": {stage: seconds * 1000 for stage, seconds in item.timings.items()},
+            }
+            if item.record is not None:
+                entry.update(
+                    price=str(item.record.price),
+                    service=item.record.service,
+                    date=item.record.record_date.isoformat(),
+                )
+            images.append(entry)
+        return {"inserted": batch.inserted, "images": images}
+
+    def _finish(
+        self,
+        job: OCRJob,
+        stage_timings: Dict[str, float],
+        result: Dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        with self._lock:
+            job.timings.update(stage_timings)
+            job.result = result
+            job.error = error
+            job.status = "failed" if error is not None else "done"
+            job.finished_at = time.monotonic()
+
+            self._running -= 1
+            if error is not None:
+                self._failed += 1
+            else:
+                self._done += 1
+            for stage, seconds in job.timings.items():
+                self._stage_seconds[stage] += seconds
+                self._stage_counts[stage] += 1
+
+        ocr_logger.info(
+            "OCR job %s %s %s",
+            job.job_id,
+            job.status,
+            " ".join(f"{stage}_ms={seconds * 1000:.1f}" for stage, seconds in job.timings.items()),
+        )
+
+    def _prune(self) -> None:
+        """
+        Forget finished jobs older than keep_seconds (caller holds the lock).
+        """
+        cutoff = time.monotonic() - self.keep_seconds
+        expired: List[str] = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
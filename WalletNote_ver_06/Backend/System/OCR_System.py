@@ -1,73 +1,282 @@
-# Backend/System/OCR_System.py
-from __future__ import annotations
-
-from pathlib import Path
-from typing import Dict, Any
-
-from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
-from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
-
-
-class OCRSystem:
-    """
-    OCRSystem is responsible for:
-    - Receiving an image file
-    - Extracting structured data (price, service, date)
-    - Saving the result to database via RecordDB
-
-    NOTE:
-    - This is a SAFE placeholder implementation
-    - Real OCR engines can replace `_run_ocr()` later
-    """
-
-    def __init__(self) -> None:
-        self.record_db = RecordDB()
-
-    # =========================
-    # Public API
-    # =========================
-    def process_image(self, user: UserInformation, image_path: Path) -> None:
-        """
-        Process a receipt image and save extracted data.
-
-        :param user: logged-in user
-        :param image_path: path to uploaded image
-        """
-
-        extracted = self._run_ocr(image_path)
-
-        record = InputInformation(
-            price=extracted["price"],
-            service=extracted["service"],
-            record_date=extracted["date"],
-        )
-
-        # Default OCR records are treated as expenses
-        self.record_db.add_record(
-            user=user,
-            record=record,
-            record_type="expense",
-        )
-
-    # =========================
-    # Internal (Stub OCR)
-    # =========================
-    def _run_ocr(self, image_path: Path) -> Dict[str, Any]:
-        """
-        Dummy OCR logic.
-
-        This method MUST return:
-        - price
-        - service
-        - date (YYYY-MM-DD)
-
-        Replace this logic with real OCR later.
-        """
-
-        # Placeholder values (safe defaults)
-        return {
-            "price": 0,
-            "service": f"OCR Import ({image_path.name})",
-            "date": "2025-01-01",
-        }
+# Backend/System/OCR_System.py
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict
+
+from PIL import Image
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.OCRResultDB import OCRResultDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.ImagePreprocess import ImagePreprocess, PreprocessConfig
+from CYBR_404.WalletNote_ver_06.Backend.System.OCREngine import OCREngine
+
+
+@dataclass
+class OCRResult:
+    record: InputInformation
+    # Fields came from ocr_results; tesseract did not run
+    cached: bool = False
+    # The user already has a record from the same image; nothing was saved
+    duplicate: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "price": str(self.record.price),
+            "service": self.record.service,
+            "date": self.record.record_date.isoformat(),
+            "cached": self.cached,
+            "duplicate": self.duplicate,
+        }
+
+
+class OCRSystem:
+    """
+    OCRSystem is responsible for:
+    - Receiving an image file
+    - Extracting structured data (price, service, date)
+    - Saving the result to database via RecordDB
+    - Skipping OCR for images seen before, and not saving them twice
+      (keyed by the SHA-256 of the upload, see OCRResultDB)
+
+    Stages (timed separately, see process_image):
+    - lookup: content hash -> cached fields / already saved?
+    - preprocess: image -> upright black-on-white image (ImagePreprocess)
+    - ocr:   image -> text (OCREngine)
+    - parse: text -> InputInformation
+    - save:  InputInformation -> records
+    """
+
+    def __init__(self, preprocess: PreprocessConfig | None = None) -> None:
+        self.record_db = RecordDB()
+        self.result_db = OCRResultDB()
+        self.preprocess = preprocess
+
+    # =========================
+    # Public API
+    # =========================
+    def process_image(
+        self,
+        user: UserInformation,
+        image_path: Path,
+        timings: Dict[str, float] | None = None,
+        content_hash: str | None = None,
+    ) -> OCRResult:
+        """
+        Process a receipt image and save extracted data.
+
+        :param user: logged-in user
+        :param image_path: path to uploaded image
+        :param timings: filled with seconds spent per stage ("lookup", "preprocess", "ocr", "parse", "save")
+        :param content_hash: SHA-256 hex of the image bytes (None -> no cache, no duplicate check)
+        :return: the record, and whether it was cached / a duplicate
+        :raises ValueError: if OCR or parsing fails
+        """
+        timings = timings if timings is not None else {}
+
+        if content_hash is not None:
+            result = self.process_cached(user, content_hash, timings)
+            if result is not None:
+                return result
+
+        result = OCRResult(self.extract(image_path, timings, self.preprocess))
+        if content_hash is not None:
+            self.result_db.put(user.user_id, content_hash, result.record)
+
+        self._save(user, result, content_hash, timings)
+        return result
+
+    def process_cached(
+        self,
+        user: UserInformation,
+        content_hash: str,
+        timings: Dict[str, float] | None = None,
+    ) -> OCRResult | None:
+        """
+        Answer an upload from ocr_results alone, without reading the image.
+
+        Saves the cached fields unless a record from the same image exists.
+
+        :param user: logged-in user
+        :param content_hash: SHA-256 hex of the image bytes
+        :param timings: filled with seconds spent in "lookup" (and "save")
+        :return: the result, or None if this image was never processed
+        """
+        timings = timings if timings is not None else {}
+
+        started = time.perf_counter()
+        cached = self.result_db.lookup(user.user_id, [content_hash]).get(content_hash)
+        timings["lookup"] = time.perf_counter() - started
+
+        if cached is None:
+            return None
+
+        record, saved = cached
+        result = OCRResult(record, cached=True, duplicate=saved)
+        if not saved:
+            self._save(user, result, content_hash, timings)
+        return result
+
+    def _save(
+        self,
+        user: UserInformation,
+        result: OCRResult,
+        content_hash: str | None,
+        timings: Dict[str, float],
+    ) -> None:
+        uow = UnitOfWork.current()
+        if uow is not None and not uow.covers(self.record_db.config):
+            uow = None
+        if uow is not None and content_hash is not None:
+            # Keep what the request wrote so far (the ocr_results row) if
+            # the insert below turns out to be a duplicate
+            uow.checkpoint()
+
+        started = time.perf_counter()
+        try:
+            # Default OCR records are treated as expenses
+            self.record_db.add_record(
+                user=user,
+                record=result.record,
+                record_type="expense",
+                source="ocr",
+                import_hash=content_hash,
+            )
+        except self.record_db.IntegrityError:
+            if content_hash is None:
+                raise
+            # The same image, uploaded concurrently, was saved first. Undo the
+            # data version bump with it: nothing changed, so no new ETag and
+            # no event. Outside a request-wide UnitOfWork add_record's own
+            # transaction has rolled back already
+            if uow is not None:
+                uow.rollback_to_checkpoint()
+            result.duplicate = True
+        timings["save"] = time.perf_counter() - started
+
+    @classmethod
+    def extract(
+        cls,
+        image_path: Path,
+        timings: Dict[str, float] | None = None,
+        preprocess: PreprocessConfig | None = None,
+    ) -> InputInformation:
+        """
+        OCR and parse an image without saving it.
+
+        No database access, so OCRBatch can run it in worker processes.
+
+        :param image_path: path to uploaded image
+        :param timings: filled with seconds spent in "preprocess", "ocr" and "parse"
+        :param preprocess: preprocessing stages (None -> all, with defaults)
+        :raises ValueError: if OCR or parsing fails
+        """
+        timings = timings if timings is not None else {}
+
+        started = time.perf_counter()
+        text = cls._run_ocr(image_path, preprocess, timings)
+        timings["ocr"] = time.perf_counter() - started - timings.get("preprocess", 0.0)
+
+        started = time.perf_counter()
+        record = cls._parse(text)
+        timings["parse"] = time.perf_counter() - started
+
+        return record
+
+    # =========================
+    # OCR
+    # =========================
+    @staticmethod
+    def _run_ocr(
+        image_path: Path,
+        preprocess: PreprocessConfig | None = None,
+        timings: Dict[str, float] | None = None,
+        engine: str | None = None,
+    ) -> str:
+        """
+        Preprocess an image file and run OCR on it.
+
+        :param engine: OCREngine name (None -> WALLETNOTE_OCR_ENGINE / auto)
+        :raises ValueError: if the image cannot be read or has no text
+        """
+        timings = timings if timings is not None else {}
+        ocr_engine = OCREngine.get(engine)
+        try:
+            with Image.open(image_path) as image:
+                started = time.perf_counter()
+                prepared = ImagePreprocess(preprocess).run(image)
+                timings["preprocess"] = time.perf_counter() - started
+
+                text = ocr_engine.image_to_string(prepared)
+        except Exception:
+            raise ValueError("OCR failed or image could not be processed")
+
+        if not text.strip():
+            raise ValueError("OCR found no text in the image")
+        return text
+
+    # =========================
+    # Parse
+    # =========================
+    @classmethod
+    def _parse(cls, text: str) -> InputInformation:
+        return InputInformation(
+            price=cls._extract_price(text),
+            service=cls._extract_service(text),
+            record_date=cls._extract_date(text),
+        )
+
+    @staticmethod
+    def _extract_price(text: str) -> Decimal:
+        """
+        Largest amount with two decimals (typically the total).
+        """
+        matches = re.findall(r"\d+\.\d{2}", text)
+        if not matches:
+            raise ValueError("price not found in OCR text")
+        return max(Decimal(m) for m in matches)
+
+    @staticmethod
+    def _extract_date(text: str) -> date:
+        """
+        First YYYY-MM-DD, YYYY/MM/DD or MM/DD/YYYY date; today if none.
+        """
+        patterns = [
+            r"\d{4}[-/]\d{2}[-/]\d{2}",
+            r"\d{2}/\d{2}/\d{4}",
+        ]
+
+        for pattern in patterns:
+            match = re.search(pattern, text)
+            if match:
+                raw = match.group()
+                try:
+                    if raw.count("/") == 2 and raw.startswith(("19", "20")):
+                        return datetime.strptime(raw, "%Y/%m/%d").date()
+                    if raw.count("-") == 2:
+                        return datetime.strptime(raw, "%Y-%m-%d").date()
+                    return datetime.strptime(raw, "%m/%d/%Y").date()
+                except ValueError:
+                    continue
+
+        return date.today()
+
+    @staticmethod
+    def _extract_service(text: str) -> str:
+        """
+        First non-empty line, stripped of symbols.
+        """
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("service or product name not found")
+
+        service = re.sub(r"[^A-Za-z0-9\s\-]", "", lines[0])
+        return service[:255]
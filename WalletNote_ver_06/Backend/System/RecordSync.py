@@ -0,0 +1,83 @@
+# Backend/System/RecordSync.py
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+
+
+class RecordSync:
+    """
+    RecordSync is responsible for:
+    - Delta sync of a user's records for offline-capable clients
+    - Opaque sync tokens (position in the user's change order)
+
+    A client starts without a token (full copy, paged), then sends the
+    last token it got and receives only inserts, updates and deletes
+    since then.
+
+    IMPORTANT:
+    - No Flask / HTML dependency
+    - No SQL here except via RecallDB
+    """
+
+    PAGE_SIZE = 500
+    MAX_PAGE_SIZE = 2000
+
+    # Before every change (existing records start at version 0)
+    START = (-1, 0)
+
+    def __init__(self) -> None:
+        self.recall_db = RecallDB()
+
+    def get_changes(self, user_id: int, token: str | None = None, limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Changes after `token`, oldest first.
+
+        :param token: `token` of the previous response (None = full sync)
+        :raises ValueError: on a malformed token
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        after = self.decode_token(token) if token else self.START
+
+        # One extra row tells whether the client should ask again right away
+        rows = self.recall_db.get_changes(user_id, after, limit + 1)
+
+        changes = []
+        for version, record_id, deleted, record_type, price, service, record_date, created_at in rows[:limit]:
+            if deleted:
+                changes.append({"id": record_id, "deleted": True})
+                continue
+
+            changes.append({
+                "id": record_id,
+                "deleted": False,
+                "record_type": record_type,
+                "price": float(price),
+                "service": service,
+                "record_date": record_date.isoformat(),
+                "created_at": created_at.isoformat(" "),
+            })
+
+        last = rows[min(len(rows), limit) - 1] if rows else None
+        position = (last[0], last[1]) if last else after
+
+        return {
+            "user_id": user_id,
+            "changes": changes,
+            "token": self.encode_token(position),
+            "has_more": len(rows) > limit,
+        }
+
+    @staticmethod
+    def encode_token(position: Tuple[int, int]) -> str:
+        version, record_id = position
+        return f"{version}.{record_id}"
+
+    @staticmethod
+    def decode_token(token: str) -> Tuple[int, int]:
+        try:
+            version, record_id = token.split(".")
+            return int(version), int(record_id)
+        except ValueError:
+            raise ValueError("invalid sync token")
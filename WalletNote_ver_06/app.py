@@ -1,228 +1,747 @@
-from __future__ import annotations
-
-from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-
-from Backend.Database.CreateDB import CreateDB
-from Backend.Database.RecordDB import RecordDB
-from Backend.Database.ConnectDB import ConnectDB
-from Backend.System.Dashboard import Dashboard
-from Backend.System.OCR_System import OCRSystem
-from Backend.System.Setting import Setting
-from Backend.Information.InputUserInformation import UserInformation
-from Backend.Information.InputInformation import InputInformation
-
-BASE_DIR = Path(__file__).resolve().parent
-UPLOAD_DIR = BASE_DIR / "uploads"
-UPLOAD_DIR.mkdir(exist_ok=True)
-
-app = Flask(
-    __name__,
-    template_folder=str(BASE_DIR / "frontend/templates"),
-    static_folder=str(BASE_DIR / "frontend/static"),
-)
-app.secret_key = "walletnote_secret"
-
-# =========================
-# DB Initialize (SAFE)
-# =========================
-CreateDB().initialize()
-
-
-# =========================
-# Utils
-# =========================
-def get_current_user() -> UserInformation | None:
-    if "user_id" not in session:
-        return None
-
-    return UserInformation(
-        user_id=session["user_id"],
-        username=session["username"],
-        email=session["email"],
-    )
-
-
-# =========================
-# Routes
-# =========================
-@app.route("/")
-def index():
-    return render_template("index.html")
-
-
-# ---------- LOGIN ----------
-@app.route("/login", methods=["GET", "POST"])
-def login():
-    if request.method == "GET":
-        return render_template("login.html")
-
-    data = request.get_json(force=True)
-
-    db = ConnectDB()
-    row = db.fetch_one(
-        "SELECT id, username, email FROM users WHERE email=%s AND password=%s",
-        (data["email"], data["password"]),
-    )
-
-    if not row:
-        return jsonify(success=False), 401
-
-    session["user_id"], session["username"], session["email"] = row
-    return jsonify(success=True)
-
-
-# ---------- SIGNUP ----------
-@app.route("/signup", methods=["GET", "POST"])
-def signup():
-    if request.method == "GET":
-        return render_template("signup.html")
-
-    data = request.get_json(force=True)
-    db = ConnectDB()
-
-    # email duplicate check
-    exists = db.fetch_one(
-        "SELECT id FROM users WHERE email=%s",
-        (data["email"],),
-    )
-    if exists:
-        return jsonify(success=False), 409
-
-    db.execute(
-        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
-        (data["username"], data["email"], data["password"]),
-    )
-
-    user_id = db.fetch_one(
-        "SELECT id FROM users WHERE email=%s",
-        (data["email"],),
-    )[0]
-
-    session["user_id"] = user_id
-    session["username"] = data["username"]
-    session["email"] = data["email"]
-
-    return jsonify(success=True)
-
-
-# ---------- DASHBOARD ----------
-@app.route("/dashboard")
-def dashboard():
-    user = get_current_user()
-    if not user:
-        return redirect(url_for("login"))
-
-    dash = Dashboard()
-    return render_template(
-        "dashboard.html",
-        data={
-            "recent": dash.get_recent_records(user.user_id),
-            "balance": dash.calculate_balance(user.user_id),
-            "today": dash.today_summary(user.user_id),
-        },
-    )
-
-
-# ---------- EXPENSE ----------
-@app.route("/record/expense", methods=["POST"])
-def record_expense():
-    user = get_current_user()
-    if not user:
-        return jsonify(error="unauthorized"), 401
-
-    data = request.get_json(force=True)
-    record = InputInformation(
-        price=data["price"],
-        service=data["service"],
-        record_date=data["date"],
-    )
-
-    RecordDB().add_record(user, record, "expense")
-    return jsonify(success=True)
-
-
-# ---------- INCOME ----------
-@app.route("/record/income", methods=["POST"])
-def record_income():
-    user = get_current_user()
-    if not user:
-        return jsonify(error="unauthorized"), 401
-
-    data = request.get_json(force=True)
-    record = InputInformation(
-        price=data["price"],
-        service=data["service"],
-        record_date=data["date"],
-    )
-
-    RecordDB().add_record(user, record, "income")
-    return jsonify(success=True)
-
-
-# ---------- OCR ----------
-@app.route("/record/ocr", methods=["POST"])
-def record_ocr():
-    user = get_current_user()
-    if not user:
-        return jsonify(error="unauthorized"), 401
-
-    image = request.files["image"]
-    path = UPLOAD_DIR / image.filename
-    image.save(path)
-
-    OCRSystem().process_image(user, path)
-    return jsonify(success=True)
-
-
-# ---------- SETTINGS ----------
-@app.route("/setting")
-def setting():
-    if not get_current_user():
-        return redirect(url_for("login"))
-    return render_template("setting.html")
-
-
-@app.route("/setting/save", methods=["POST"])
-def save_setting():
-    user = get_current_user()
-    if not user:
-        return jsonify(error="unauthorized"), 401
-
-    data = request.get_json(force=True)
-    Setting(user).set_currency(data["currency"])
-    return jsonify(success=True)
-
-
-# ---------- LOGOUT ----------
-@app.route("/logout")
-def logout():
-    session.clear()
-    return redirect(url_for("index"))
-
-
-@app.route("/api/chart/summary")
-def chart_summary():
-    user = get_current_user()
-    if not user:
-        return jsonify({}), 401
-
-    dash = Dashboard()
-    return jsonify(dash.get_summary_by_type(user.user_id))
-
-
-@app.route("/api/chart/expense")
-def chart_expense():
-    user = get_current_user()
-    if not user:
-        return jsonify([]), 401
-
-    dash = Dashboard()
-    return jsonify(dash.get_expense_by_service(user.user_id))
-
-
-# =========================
-# Run
-# =========================
-if __name__ == "__main__":
-    app.run(debug=True)
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, g
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB import MigrateDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Database.QueryLog import QueryLog
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordEvents import RecordEvents
+from CYBR_404.WalletNote_ver_06.Backend.Database.ReplicaRouter import ReadRouting
+from CYBR_404.WalletNote_ver_06.Backend.System.Dashboard import Dashboard
+from CYBR_404.WalletNote_ver_06.Backend.System.ImagePreprocess import PreprocessConfig
+from CYBR_404.WalletNote_ver_06.Backend.System.ImportCSV import CSVMapping, ImportCSV
+from CYBR_404.WalletNote_ver_06.Backend.System.OCRBatch import OCRBatch
+from CYBR_404.WalletNote_ver_06.Backend.System.OCRJobQueue import OCRJobQueue
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRSystem
+from CYBR_404.WalletNote_ver_06.Backend.System.RecordSync import RecordSync
+from CYBR_404.WalletNote_ver_06.Backend.System.Setting import Setting
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+BASE_DIR = Path(__file__).resolve().parent
+UPLOAD_DIR = BASE_DIR / "uploads"
+UPLOAD_DIR.mkdir(exist_ok=True)
+
+app = Flask(
+    __name__,
+    template_folder=str(BASE_DIR / "frontend/templates"),
+    static_folder=str(BASE_DIR / "frontend/static"),
+)
+app.secret_key = "walletnote_secret"
+
+# Max queries per endpoint; over budget -> warning (raises when testing)
+app.config["QUERY_BUDGETS"] = {
+    "dashboard": 2,
+    "dashboard_data": 3,
+    "records_page": 1,
+    "records_changes": 1,
+    "chart_summary": 2,
+    "chart_expense": 2,
+}
+app.config["QUERY_BUDGET_STRICT"] = False
+
+# Max rows accepted by one /record/bulk call
+app.config["BULK_MAX_ROWS"] = 10_000
+
+# Idle /api/stream connections get a comment this often (detects closed clients)
+app.config["SSE_KEEPALIVE_SECONDS"] = 15
+
+# Background OCR: concurrent jobs, jobs allowed to wait, how long results are kept
+app.config["OCR_WORKERS"] = 2
+app.config["OCR_MAX_PENDING"] = 100
+app.config["OCR_KEEP_SECONDS"] = 3600
+
+# Batch OCR: images per upload, worker processes (None -> one per core)
+app.config["OCR_BATCH_MAX_IMAGES"] = 100
+app.config["OCR_BATCH_PROCESSES"] = None
+
+# Set by the dashboard once this browser's IndexedDB copy holds the user's records
+app.config["LOCAL_HISTORY_COOKIE"] = "walletnote_local"
+
+# Image cleanup before tesseract (PreprocessConfig.disabled() -> raw uploads)
+app.config["OCR_PREPROCESS"] = PreprocessConfig()
+
+# =========================
+# Schema Check (one query; migrations are applied separately:
+#   python -m CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB)
+# =========================
+MigrateDB().ensure_current()
+
+OCRBatch.configure(app.config["OCR_BATCH_PROCESSES"])
+ocr_queue = OCRJobQueue(
+    workers=app.config["OCR_WORKERS"],
+    max_pending=app.config["OCR_MAX_PENDING"],
+    keep_seconds=app.config["OCR_KEEP_SECONDS"],
+    preprocess=app.config["OCR_PREPROCESS"],
+)
+
+
+# =========================
+# Request-scoped Unit of Work
+# =========================
+@app.before_request
+def open_unit_of_work():
+    g.uow = UnitOfWork().begin()
+
+
+@app.teardown_request
+def close_unit_of_work(exc):
+    uow = g.pop("uow", None)
+    if uow is not None:
+        uow.end(exc)
+
+
+# =========================
+# Read-your-writes (replica routing)
+# =========================
+@app.before_request
+def open_read_routing():
+    # Kept in the session so every worker honours the window
+    g.read_routing = ReadRouting(
+        pinned=time.time() < session.get("primary_until", 0),
+    ).begin()
+
+
+@app.after_request
+def remember_write(response):
+    routing = g.get("read_routing")
+    if routing is not None and routing.wrote:
+        session["primary_until"] = time.time() + DBConfig().read_your_writes_seconds
+    return response
+
+
+@app.teardown_request
+def close_read_routing(exc):
+    routing = g.pop("read_routing", None)
+    if routing is not None:
+        routing.end()
+
+
+# =========================
+# Per-request Query Stats
+# =========================
+@app.before_request
+def open_query_log():
+    g.query_log = QueryLog(
+        budget=app.config["QUERY_BUDGETS"].get(request.endpoint),
+        strict=app.testing or app.config["QUERY_BUDGET_STRICT"],
+    ).begin()
+
+
+@app.after_request
+def report_query_log(response):
+    log = g.get("query_log")
+    if log is None:
+        return response
+
+    db_ms = log.db_seconds * 1000
+    response.headers["X-DB-Query-Count"] = str(log.count)
+    response.headers["X-DB-Time-ms"] = f"{db_ms:.1f}"
+
+    app.logger.info(
+        "%s %s -> %s queries=%d db_ms=%.1f",
+        request.method,
+        request.path,
+        response.status_code,
+        log.count,
+        db_ms,
+    )
+    if log.over_budget:
+        app.logger.warning(
+            "query budget exceeded on %s: %d > %d",
+            request.endpoint,
+            log.count,
+            log.budget,
+        )
+    return response
+
+
+@app.teardown_request
+def close_query_log(exc):
+    log = g.pop("query_log", None)
+    if log is not None:
+        log.end()
+
+
+# =========================
+# Utils
+# =========================
+def get_current_user() -> UserInformation | None:
+    if "user_id" not in session:
+        return None
+
+    return UserInformation(
+        user_id=session["user_id"],
+        username=session["username"],
+        email=session["email"],
+    )
+
+
+def conditional_json(user: UserInformation, build, *etag_parts):
+    """
+    JSON response with an ETag from the user's data version.
+
+    A matching If-None-Match gets 304 after one primary-key lookup; `build`
+    (the aggregate queries) only runs when the data changed.
+
+    The version is read on the primary, so `build` reads there too: a
+    lagging replica's older data must never carry the newer version's ETag.
+    Cached aggregates are keyed by the same version, so a worker that never
+    saw the write cannot answer from totals that predate it.
+    """
+    version = DataVersionDB().current(user.user_id)
+    etag = "-".join(str(part) for part in (user.user_id, version, *etag_parts))
+
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        routing = ReadRouting(pinned=True).begin()
+        try:
+            with AggregateCache.at_version(user.user_id, version):
+                response = jsonify(build())
+        finally:
+            routing.end()
+
+    response.set_etag(etag)
+    # Per-user data: shared caches must not serve it, browsers must revalidate
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def save_upload(upload) -> tuple[Path, str]:
+    """
+    Save an uploaded image under a unique name (phones upload many receipts
+    as "image.jpg"), hashing it on the way; returns (path, SHA-256 hex).
+    """
+    path = UPLOAD_DIR / f"{uuid.uuid4().hex}{Path(upload.filename).suffix.lower()}"
+    digest = hashlib.sha256()
+    with open(path, "wb") as out:
+        while chunk := upload.stream.read(UPLOAD_CHUNK_BYTES):
+            digest.update(chunk)
+            out.write(chunk)
+    return path, digest.hexdigest()
+
+
+def parse_record_row(row) -> tuple[str, InputInformation]:
+    """
+    Validate one JSON record: {"type", "price", "service", "date"}.
+
+    :raises ValueError: with a message fit for the client
+    """
+    if not isinstance(row, dict):
+        raise ValueError("record must be an object")
+
+    missing = [key for key in ("type", "price", "service", "date") if key not in row]
+    if missing:
+        raise ValueError("missing " + ", ".join(missing))
+
+    if row["type"] not in ("income", "expense"):
+        raise ValueError("type must be 'income' or 'expense'")
+    if not isinstance(row["service"], str) or not row["service"].strip():
+        raise ValueError("service must be a non-empty string")
+    if len(row["service"].strip()) > 255:
+        raise ValueError("service is longer than 255 characters")
+
+    try:
+        record = InputInformation(
+            price=row["price"],
+            service=row["service"],
+            record_date=row["date"],
+        )
+    except InvalidOperation:
+        raise ValueError("price is not a number")
+    except (TypeError, ValueError):
+        raise ValueError("date must be YYYY-MM-DD")
+
+    if not record.price.is_finite() or record.price < 0:
+        raise ValueError("price must be a non-negative number")
+    if record.price >= Decimal("100000000"):  # DECIMAL(10,2)
+        raise ValueError("price is too large")
+
+    return row["type"], record
+
+
+# =========================
+# Routes
+# =========================
+@app.route("/")
+def index():
+    return render_template("index.html")
+
+
+# ---------- LOGIN ----------
+@app.route("/login", methods=["GET", "POST"])
+def login():
+    if request.method == "GET":
+        return render_template("login.html")
+
+    data = request.get_json(force=True)
+
+    db = ConnectDB()
+    row = db.fetch_one(
+        "SELECT id, username, email FROM users WHERE email=%s AND password=%s",
+        (data["email"], data["password"]),
+    )
+
+    if not row:
+        return jsonify(success=False), 401
+
+    session["user_id"], session["username"], session["email"] = row
+    return jsonify(success=True)
+
+
+# ---------- SIGNUP ----------
+@app.route("/signup", methods=["GET", "POST"])
+def signup():
+    if request.method == "GET":
+        return render_template("signup.html")
+
+    data = request.get_json(force=True)
+    db = ConnectDB()
+
+    # email duplicate check
+    exists = db.fetch_one(
+        "SELECT id FROM users WHERE email=%s",
+        (data["email"],),
+    )
+    if exists:
+        return jsonify(success=False), 409
+
+    db.execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        (data["username"], data["email"], data["password"]),
+    )
+
+    user_id = db.fetch_one(
+        "SELECT id FROM users WHERE email=%s",
+        (data["email"],),
+    )[0]
+
+    session["user_id"] = user_id
+    session["username"] = data["username"]
+    session["email"] = data["email"]
+
+    return jsonify(success=True)
+
+
+# ---------- DASHBOARD ----------
+@app.route("/dashboard")
+def dashboard():
+    user = get_current_user()
+    if not user:
+        return redirect(url_for("login"))
+
+    # The browser already keeps this user's history: send the totals only,
+    # the page renders the list from its local copy
+    local_history = request.cookies.get(app.config["LOCAL_HISTORY_COOKIE"]) == str(user.user_id)
+
+    # Charts read the same payload from the page, no extra round trip
+    dashboard = Dashboard()
+    return render_template(
+        "dashboard.html",
+        data=dashboard.get_totals(user.user_id) if local_history else dashboard.get_dashboard(user.user_id),
+        local_history=local_history,
+    )
+
+
+# ---------- EXPENSE ----------
+@app.route("/record/expense", methods=["POST"])
+def record_expense():
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    data = request.get_json(force=True)
+    record = InputInformation(
+        price=data["price"],
+        service=data["service"],
+        record_date=data["date"],
+    )
+
+    RecordDB().add_record(user, record, "expense")
+    return jsonify(success=True)
+
+
+# ---------- INCOME ----------
+@app.route("/record/income", methods=["POST"])
+def record_income():
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    data = request.get_json(force=True)
+    record = InputInformation(
+        price=data["price"],
+        service=data["service"],
+        record_date=data["date"],
+    )
+
+    RecordDB().add_record(user, record, "income")
+    return jsonify(success=True)
+
+
+# ---------- BULK ----------
+@app.route("/record/bulk", methods=["POST"])
+def record_bulk():
+    """
+    Insert a JSON array of records; nothing is stored if any row is invalid.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    rows = request.get_json(force=True)
+    if not isinstance(rows, list):
+        return jsonify(success=False, error="expected a JSON array"), 400
+    if len(rows) > app.config["BULK_MAX_ROWS"]:
+        return jsonify(success=False, error=f"at most {app.config['BULK_MAX_ROWS']} rows per call"), 413
+
+    by_type = {"income": [], "expense": []}
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            record_type, record = parse_record_row(row)
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+        else:
+            by_type[record_type].append(record)
+
+    if errors:
+        return jsonify(success=False, errors=errors), 400
+
+    db = RecordDB()
+    inserted = sum(
+        db.add_records(user, records, record_type)
+        for record_type, records in by_type.items()
+        if records
+    )
+    return jsonify(success=True, inserted=inserted)
+
+
+# ---------- CSV IMPORT ----------
+@app.route("/record/import", methods=["POST"])
+def record_import():
+    """
+    Import a bank CSV export (multipart "file"); mapping fields come from the form.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    upload = request.files.get("file")
+    if upload is None:
+        return jsonify(success=False, error="missing file"), 400
+
+    form = request.form
+    try:
+        mapping = CSVMapping(
+            date=form.get("date_column", "date"),
+            amount=form.get("amount_column", "amount"),
+            description=form.get("description_column", "description"),
+            date_format=form.get("date_format", "%Y-%m-%d"),
+            sign=form.get("sign", "negative_expense"),
+            decimal_separator=form.get("decimal_separator", "."),
+            delimiter=form.get("delimiter", ","),
+        )
+    except ValueError as exc:
+        return jsonify(success=False, error=str(exc)), 400
+
+    def log_progress(progress):
+        app.logger.info(
+            "import user=%s read=%d inserted=%d duplicates=%d invalid=%d",
+            user.user_id,
+            progress.rows_read,
+            progress.inserted,
+            progress.duplicates,
+            progress.invalid,
+        )
+
+    try:
+        # The upload is parsed from Werkzeug's spooled temp file, line by line
+        result = ImportCSV(user, mapping, on_progress=log_progress).run(upload.stream)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return jsonify(success=False, error=str(exc)), 400
+    except ConnectDB.IntegrityError:
+        # Kept colliding with a concurrent import of the same lines; the
+        # batches before it are committed, so a retry reports the rest as duplicates
+        return jsonify(success=False, error="the same lines are being imported right now, try again"), 409
+
+    return jsonify(
+        success=True,
+        rows_read=result.rows_read,
+        inserted=result.inserted,
+        duplicates=result.duplicates,
+        invalid=result.invalid,
+        errors=[{"line": line, "error": message} for line, message in result.errors],
+    )
+
+
+# ---------- OCR ----------
+@app.route("/record/ocr", methods=["POST"])
+def record_ocr():
+    """
+    Save the image and queue it for OCR; poll /record/ocr/<job_id> for the result.
+
+    An image uploaded before is answered from the OCR result cache at once
+    (200, no job), flagged "duplicate" if its record already exists.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    image = request.files.get("image")
+    if image is None or not image.filename:
+        return jsonify(success=False, error="missing image"), 400
+
+    path, content_hash = save_upload(image)
+
+    cached = OCRSystem(app.config["OCR_PREPROCESS"]).process_cached(user, content_hash)
+    if cached is not None:
+        path.unlink(missing_ok=True)
+        return jsonify(success=True, status="done", result=cached.to_dict())
+
+    try:
+        job = ocr_queue.submit(user, path, content_hash)
+    except RuntimeError as exc:
+        path.unlink(missing_ok=True)
+        return jsonify(success=False, error=str(exc)), 503
+
+    return (
+        jsonify(success=True, job_id=job.job_id, status=job.status, queue_depth=ocr_queue.depth()),
+        202,
+        {"Location": url_for("record_ocr_status", job_id=job.job_id)},
+    )
+
+
+@app.route("/record/ocr/batch", methods=["POST"])
+def record_ocr_batch():
+    """
+    Queue many receipt images (multipart "images") as one OCR job.
+
+    The job result lists every image in upload order; the records that
+    were read are saved together in one bulk insert.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    images = [image for image in request.files.getlist("images") if image.filename]
+    if not images:
+        return jsonify(success=False, error="missing images"), 400
+
+    max_images = app.config["OCR_BATCH_MAX_IMAGES"]
+    if len(images) > max_images:
+        return jsonify(success=False, error=f"at most {max_images} images per batch"), 413
+
+    paths, content_hashes = zip(*(save_upload(image) for image in images))
+
+    try:
+        job = ocr_queue.submit_batch(user, paths, content_hashes)
+    except RuntimeError as exc:
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return jsonify(success=False, error=str(exc)), 503
+
+    return (
+        jsonify(success=True, job_id=job.job_id, status=job.status, queue_depth=ocr_queue.depth()),
+        202,
+        {"Location": url_for("record_ocr_status", job_id=job.job_id)},
+    )
+
+
+@app.route("/record/ocr/<job_id>")
+def record_ocr_status(job_id):
+    """
+    Status of one OCR job: queued / running / done (with result) / failed (with error).
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    job = ocr_queue.get(job_id)
+    if job is None or job.user_id != user.user_id:
+        return jsonify(success=False, error="not found"), 404
+
+    return jsonify(success=True, queue_depth=ocr_queue.depth(), **job.to_dict())
+
+
+@app.route("/api/ocr/stats")
+def ocr_stats():
+    """
+    Queue depth, job counts and average milliseconds per stage.
+    """
+    if not get_current_user():
+        return jsonify(error="unauthorized"), 401
+
+    return jsonify(ocr_queue.stats())
+
+
+# ---------- SETTINGS ----------
+@app.route("/setting")
+def setting():
+    if not get_current_user():
+        return redirect(url_for("login"))
+    return render_template("setting.html")
+
+
+@app.route("/setting/save", methods=["POST"])
+def save_setting():
+    user = get_current_user()
+    if not user:
+        return jsonify(error="unauthorized"), 401
+
+    data = request.get_json(force=True)
+    Setting(user).set_currency(data["currency"])
+    return jsonify(success=True)
+
+
+# ---------- LOGOUT ----------
+@app.route("/logout")
+def logout():
+    session.clear()
+
+    # The page clears its IndexedDB copy itself (logout() in style.js)
+    response = redirect(url_for("index"))
+    response.delete_cookie(app.config["LOCAL_HISTORY_COOKIE"])
+    return response
+
+
+@app.route("/api/dashboard")
+def dashboard_data():
+    user = get_current_user()
+    if not user:
+        return jsonify({}), 401
+
+    # "today" totals change at midnight without a write
+    return conditional_json(
+        user,
+        lambda: Dashboard().get_dashboard(user.user_id),
+        date.today().isoformat(),
+    )
+
+
+@app.route("/api/records")
+def records_page():
+    user = get_current_user()
+    if not user:
+        return jsonify({}), 401
+
+    try:
+        page = Dashboard().get_records_page(
+            user.user_id,
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", Dashboard.PAGE_SIZE, type=int),
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+    return jsonify(page)
+
+
+@app.route("/api/records/changes")
+def records_changes():
+    user = get_current_user()
+    if not user:
+        return jsonify({}), 401
+
+    try:
+        changes = RecordSync().get_changes(
+            user.user_id,
+            token=request.args.get("since"),
+            limit=request.args.get("limit", RecordSync.PAGE_SIZE, type=int),
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+    return jsonify(changes)
+
+
+@app.route("/api/stream")
+def record_stream():
+    """
+    Server-Sent Events: the user's committed record changes, with new totals.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify({}), 401
+
+    user_id = user.user_id
+    keepalive = app.config["SSE_KEEPALIVE_SECONDS"]
+
+    # Runs after the request hooks have ended (no request-wide UnitOfWork),
+    # so every read below sees the latest committed data
+    def events():
+        subscription = RecordEvents.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                pending = subscription.get(timeout=keepalive)
+                if not pending:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if subscription.overflowed:
+                    # Fell behind: one event telling the page to refresh everything
+                    subscription.overflowed = False
+                    pending = [{"type": "resync"}]
+
+                # The write just committed on the primary; a replica may lag
+                routing = ReadRouting(pinned=True).begin()
+                try:
+                    totals = Dashboard().get_totals(user_id)
+                finally:
+                    routing.end()
+
+                pending[-1] = {**pending[-1], "totals": totals}
+                for event in pending:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            RecordEvents.unsubscribe(subscription)
+
+    return app.response_class(
+        events(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # reverse proxy: do not buffer the stream
+        },
+    )
+
+
+@app.route("/api/chart/summary")
+def chart_summary():
+    user = get_current_user()
+    if not user:
+        return jsonify({}), 401
+
+    return conditional_json(user, lambda: Dashboard().get_summary_by_type(user.user_id))
+
+
+@app.route("/api/chart/expense")
+def chart_expense():
+    user = get_current_user()
+    if not user:
+        return jsonify([]), 401
+
+    return conditional_json(user, lambda: Dashboard().get_expense_by_service(user.user_id))
+
+
+# =========================
+# Run
+# =========================
+if __name__ == "__main__":
+    app.run(debug=True)
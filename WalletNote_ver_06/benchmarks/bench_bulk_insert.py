@@ -0,0 +1,73 @@
+# benchmarks/bench_bulk_insert.py
+"""
+Row-at-a-time add_record vs. RecordDB.add_records throughput.
+
+Inserts batches of 1, 100 and 10,000 records for a throw-away user
+(deleted afterwards; its records and rollups cascade) and prints rows
+per second for both paths. Works on either engine.
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_bulk_insert
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+
+BATCH_SIZES = (1, 100, 10_000)
+EMAIL = "bench-bulk-insert@example.invalid"
+
+
+def _records(n: int) -> list:
+    return [
+        InputInformation(
+            price=Decimal(i % 300) + Decimal("0.25"),
+            service=f"service {i % 40}",
+            record_date=date.today() - timedelta(days=i % 365),
+        )
+        for i in range(n)
+    ]
+
+
+def _one_by_one(db: RecordDB, user: UserInformation, records: list) -> None:
+    # Same transaction scope as add_records, so only the statement count differs
+    with UnitOfWork(db.config):
+        for record in records:
+            db.add_record(user, record, "expense")
+
+
+def _time(call) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    admin = ConnectDB()
+    admin.execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        ("bench", EMAIL, "-"),
+    )
+    user_id = admin.fetch_one("SELECT id FROM users WHERE email=%s", (EMAIL,))[0]
+    user = UserInformation(user_id=user_id, username="bench", email=EMAIL)
+    db = RecordDB()
+
+    try:
+        print(f"{'rows':>8}{'add_record/s':>16}{'add_records/s':>16}{'speedup':>10}")
+        for n in BATCH_SIZES:
+            records = _records(n)
+            single = _time(lambda: _one_by_one(db, user, records))
+            bulk = _time(lambda: db.add_records(user, records, "expense"))
+            print(f"{n:>8}{n / single:>16.0f}{n / bulk:>16.0f}{single / bulk:>9.1f}x")
+    finally:
+        admin.execute("DELETE FROM users WHERE id=%s", (user_id,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_date_range.py
+"""
+YEAR()/MONTH() predicates vs. RecallDB.query() over daily_rollups.
+
+Seeds ROWS records spread over USERS throw-away users and ten years
+(plus their rollups), then times the old monthly / yearly summary SQL
+against the rebuilt RecallDB methods for one user. MySQL only (the old SQL uses YEAR()).
+Seeding millions of rows takes a few minutes.
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_date_range [rows]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from decimal import Decimal
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+
+ROWS = 2_000_000
+USERS = 50
+INSERT_CHUNK = 1000
+REPEAT = 50
+EMAIL_DOMAIN = "bench-date-range.example.invalid"
+
+OLD_MONTHLY_SQL = """
+SELECT record_type, SUM(price)
+FROM records
+WHERE user_id = %s
+  AND YEAR(record_date) = %s
+  AND MONTH(record_date) = %s
+GROUP BY record_type
+"""
+
+OLD_YEARLY_SQL = """
+SELECT record_type, MONTH(record_date) AS month, SUM(price)
+FROM records
+WHERE user_id = %s
+  AND YEAR(record_date) = %s
+GROUP BY record_type, MONTH(record_date)
+ORDER BY month
+"""
+
+
+def _seed(db: ConnectDB, rows: int) -> list:
+    user_ids = []
+    for n in range(USERS):
+        email = f"user{n}@{EMAIL_DOMAIN}"
+        db.execute(
+            "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+            (f"bench{n}", email, "-"),
+        )
+        user_ids.append(db.fetch_one("SELECT id FROM users WHERE email=%s", (email,))[0])
+
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * INSERT_CHUNK)
+    sql = f"INSERT INTO records (user_id, record_type, price, service, record_date) VALUES {placeholders}"
+    first_day = date.today() - timedelta(days=3650)
+
+    for offset in range(0, rows - rows % INSERT_CHUNK, INSERT_CHUNK):
+        params = []
+        for i in range(offset, offset + INSERT_CHUNK):
+            params += [
+                user_ids[i % USERS],
+                "income" if i % 7 == 0 else "expense",
+                Decimal(i % 300) + Decimal("0.50"),
+                f"service {i % 40}",
+                first_day + timedelta(days=(i // USERS) % 3650),
+            ]
+        db.execute(sql, params)
+
+    db.execute(
+        f"""
+        INSERT INTO daily_rollups (user_id, record_date, record_type, service, total, record_count)
+        SELECT user_id, record_date, record_type, service, SUM(price), COUNT(*)
+        FROM records
+        WHERE user_id IN ({", ".join(["%s"] * USERS)})
+        GROUP BY user_id, record_date, record_type, service
+        """,
+        user_ids,
+    )
+    db.execute("ANALYZE TABLE records, daily_rollups")
+    return user_ids
+
+
+def _time(label: str, call) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        call()
+    per_call_ms = (time.perf_counter() - started) / REPEAT * 1000
+    print(f"{label:<28}{per_call_ms:>10.2f} ms")
+    return per_call_ms
+
+
+def main(argv: list) -> None:
+    rows = int(argv[0]) if argv else ROWS
+    db = ConnectDB()
+    user_ids = _seed(db, rows)
+    user_id = user_ids[0]
+    year = date.today().year - 1
+    # Aggregate cache off: every timed call must reach the database
+    recall = RecallDB(replace(DBConfig(), aggregate_cache_size=0))
+
+    try:
+        print(f"{rows} rows, {USERS} users, {REPEAT} calls each")
+        old = _time("monthly YEAR()/MONTH()", lambda: db.fetch_all(OLD_MONTHLY_SQL, (user_id, year, 6)))
+        new = _time("monthly range", lambda: recall.get_monthly_summary(user_id, year, 6))
+        print(f"{'':<28}{old / new:>9.1f}x")
+
+        old = _time("yearly YEAR()/MONTH()", lambda: db.fetch_all(OLD_YEARLY_SQL, (user_id, year)))
+        new = _time("yearly range", lambda: recall.get_yearly_summary(user_id, year))
+        print(f"{'':<28}{old / new:>9.1f}x")
+    finally:
+        db.execute("DELETE FROM users WHERE email LIKE %s", (f"%@{EMAIL_DOMAIN}",))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
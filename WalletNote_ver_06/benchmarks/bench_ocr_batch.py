@@ -0,0 +1,75 @@
+# benchmarks/bench_ocr_batch.py
+"""
+One-by-one OCRSystem.process_image vs. OCRBatch.run on the same receipts.
+
+Renders RECEIPTS synthetic receipt photos (benchmarks/ocr_corpus.py)
+into a temp directory, then saves them for a throw-away user (deleted afterwards; its records and
+rollups cascade) once image by image, as repeated /record/ocr uploads
+would, and once as a batch over the process pool. Needs tesseract;
+works on either database engine.
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_ocr_batch [receipts] [processes]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.OCRBatch import OCRBatch
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRSystem
+from CYBR_404.WalletNote_ver_06.benchmarks.ocr_corpus import render
+
+RECEIPTS = 50
+EMAIL = "bench-ocr-batch@example.invalid"
+
+
+def main(argv: list) -> None:
+    receipts = int(argv[0]) if argv else RECEIPTS
+    processes = int(argv[1]) if len(argv) > 1 else None
+    OCRBatch.configure(processes)
+
+    admin = ConnectDB()
+    admin.execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        ("bench", EMAIL, "-"),
+    )
+    user_id = admin.fetch_one("SELECT id FROM users WHERE email=%s", (EMAIL,))[0]
+    user = UserInformation(user_id=user_id, username="bench", email=EMAIL)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [receipt.path for receipt in render(Path(directory), receipts)]
+
+            # Start the workers before timing (spawn + imports)
+            OCRBatch.pool().submit(os.getpid).result()
+
+            started = time.perf_counter()
+            ocr = OCRSystem()
+            for path in paths:
+                try:
+                    ocr.process_image(user, path)
+                except ValueError:
+                    pass
+            single = time.perf_counter() - started
+
+            started = time.perf_counter()
+            result = OCRBatch(user).run(paths)
+            batch = time.perf_counter() - started
+
+        workers = processes or os.cpu_count()
+        print(f"{receipts} receipts, {workers} processes, {result.inserted} read in the batch")
+        print(f"{'one by one':<14}{single:>10.2f} s")
+        print(f"{'batch':<14}{batch:>10.2f} s")
+        print(f"{'':<14}{single / batch:>9.1f}x")
+    finally:
+        OCRBatch.shutdown()
+        admin.execute("DELETE FROM users WHERE id=%s", (user_id,))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
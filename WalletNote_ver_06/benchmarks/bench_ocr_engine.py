@@ -0,0 +1,69 @@
+# benchmarks/bench_ocr_engine.py
+"""
+Per-image OCR latency: tesseract subprocess per call vs. in-process tesserocr.
+
+Runs every available OCREngine over the same clean receipt crops
+(benchmarks/ocr_corpus.py) after one warm-up call, and prints the first
+call and the mean / p50 / p95 of the rest, plus how often both engines
+returned the same text. Needs tesseract (and tesserocr for the
+persistent engine); no database.
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_ocr_engine [images]
+"""
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from CYBR_404.WalletNote_ver_06.Backend.System.OCREngine import OCREngine, TesserocrEngine
+from CYBR_404.WalletNote_ver_06.benchmarks.ocr_corpus import crops
+
+IMAGES = 50
+
+
+def _run(engine: OCREngine, images: list) -> tuple:
+    started = time.perf_counter()
+    engine.image_to_string(images[0])
+    first = time.perf_counter() - started
+
+    latencies, texts = [], []
+    for image in images:
+        started = time.perf_counter()
+        texts.append(engine.image_to_string(image))
+        latencies.append(time.perf_counter() - started)
+    return first, latencies, texts
+
+
+def main(argv: list) -> None:
+    count = int(argv[0]) if argv else IMAGES
+    images = crops(count)
+
+    names = ["subprocess"]
+    if TesserocrEngine.available():
+        names.append("tesserocr")
+    else:
+        print("tesserocr not installed; timing the subprocess engine only")
+
+    results: Dict[str, List[float]] = {}
+    texts: Dict[str, List[str]] = {}
+    print(f"{count} receipt crops")
+    print(f"{'engine':<12}{'first ms':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name in names:
+        first, latencies, texts[name] = _run(OCREngine.get(name), images)
+        results[name] = latencies
+        ms = sorted(latency * 1000 for latency in latencies)
+        print(
+            f"{name:<12}{first * 1000:>10.1f}{statistics.mean(ms):>10.1f}"
+            f"{ms[len(ms) // 2]:>10.1f}{ms[int(len(ms) * 0.95) - 1]:>10.1f}"
+        )
+
+    if len(results) == 2:
+        speedup = statistics.mean(results["subprocess"]) / statistics.mean(results["tesserocr"])
+        same = sum(a.strip() == b.strip() for a, b in zip(texts["subprocess"], texts["tesserocr"]))
+        print(f"tesserocr is {speedup:.1f}x faster per image; same text for {same}/{count} images")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
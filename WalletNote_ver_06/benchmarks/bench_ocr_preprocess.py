@@ -0,0 +1,83 @@
+# benchmarks/bench_ocr_preprocess.py
+"""
+OCR wall time and field accuracy with and without each preprocessing stage.
+
+Renders the synthetic receipt corpus (benchmarks/ocr_corpus.py), then
+runs OCRSystem._run_ocr and the _extract_* parsers over it once raw,
+once with every stage and once with every stage but one. A field counts
+as correct when it equals the value printed on the receipt. Needs
+tesseract; no database.
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_ocr_preprocess [receipts]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from CYBR_404.WalletNote_ver_06.Backend.System.ImagePreprocess import PreprocessConfig
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRSystem
+from CYBR_404.WalletNote_ver_06.benchmarks.ocr_corpus import Receipt, render
+
+RECEIPTS = 20
+STAGES = ("exif_rotate", "downscale", "greyscale", "deskew", "binarize")
+
+
+def _configs() -> List[Tuple[str, PreprocessConfig]]:
+    configs = [("raw", PreprocessConfig.disabled()), ("all stages", PreprocessConfig())]
+    for stage in STAGES:
+        configs.append((f"without {stage}", replace(PreprocessConfig(), **{stage: False})))
+    return configs
+
+
+def _field(extract, text: str, expected) -> bool:
+    try:
+        return extract(text) == expected
+    except ValueError:
+        return False
+
+
+def _measure(receipts: List[Receipt], config: PreprocessConfig) -> Dict[str, float]:
+    totals = {"wall": 0.0, "preprocess": 0.0, "price": 0, "date": 0, "service": 0}
+    for receipt in receipts:
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            text = OCRSystem._run_ocr(receipt.path, config, timings)
+        except ValueError:
+            text = ""
+        totals["wall"] += time.perf_counter() - started
+        totals["preprocess"] += timings.get("preprocess", 0.0)
+
+        totals["price"] += _field(OCRSystem._extract_price, text, receipt.price)
+        totals["date"] += _field(OCRSystem._extract_date, text, receipt.record_date)
+        totals["service"] += _field(OCRSystem._extract_service, text, receipt.service)
+    return totals
+
+
+def main(argv: list) -> None:
+    count = int(argv[0]) if argv else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as directory:
+        receipts = render(Path(directory), count)
+
+        print(f"{count} receipts")
+        print(f"{'':<22}{'ms/image':>10}{'prep ms':>10}{'price':>8}{'date':>8}{'service':>9}")
+        for label, config in _configs():
+            totals = _measure(receipts, config)
+            print(
+                f"{label:<22}"
+                f"{totals['wall'] / count * 1000:>10.0f}"
+                f"{totals['preprocess'] / count * 1000:>10.0f}"
+                f"{totals['price'] / count:>8.0%}"
+                f"{totals['date'] / count:>8.0%}"
+                f"{totals['service'] / count:>9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+# benchmarks/bench_statement_cache.py
+"""
+Text protocol vs. prepared statement throughput for the hot queries.
+
+Needs the MySQL server from DBConfig with the WalletNote schema.
+A throw-away user is created and deleted (its records cascade).
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.bench_statement_cache
+"""
+from __future__ import annotations
+
+import time
+from datetime import date
+from decimal import Decimal
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+
+ROUNDS = 2000
+
+INSERT_SQL = """
+INSERT INTO records (
+    user_id,
+    record_type,
+    price,
+    service,
+    record_date
+)
+VALUES (%s, %s, %s, %s, %s)
+"""
+
+SUMMARY_SQL = """
+SELECT record_type, SUM(price)
+FROM records
+WHERE user_id = %s
+GROUP BY record_type
+"""
+
+
+def _run(db: ConnectDB, user_id: int) -> dict:
+    started = time.perf_counter()
+    for i in range(ROUNDS):
+        db.execute(INSERT_SQL, (user_id, "expense", Decimal("1.25"), f"bench {i % 10}", date.today()))
+    insert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.fetch_all(SUMMARY_SQL, (user_id,))
+    summary_seconds = time.perf_counter() - started
+
+    return {
+        "insert/s": ROUNDS / insert_seconds,
+        "summary/s": ROUNDS / summary_seconds,
+    }
+
+
+def main() -> None:
+    admin = ConnectDB()
+    admin.execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        ("bench", "bench-statement-cache@example.invalid", "-"),
+    )
+    user_id = admin.fetch_one(
+        "SELECT id FROM users WHERE email=%s",
+        ("bench-statement-cache@example.invalid",),
+    )[0]
+
+    try:
+        text = _run(ConnectDB(DBConfig(statement_cache_size=0)), user_id)
+        prepared = _run(ConnectDB(DBConfig()), user_id)
+    finally:
+        admin.execute("DELETE FROM users WHERE id=%s", (user_id,))
+
+    print(f"{'path':<10}{'text':>12}{'prepared':>12}{'speedup':>10}")
+    for key in ("insert/s", "summary/s"):
+        print(f"{key:<10}{text[key]:>12.0f}{prepared[key]:>12.0f}{prepared[key] / text[key]:>9.2f}x")
+    print(ConnectDB.statement_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/ocr_corpus.py
+"""
+Synthetic receipt photos with known fields, for the OCR benchmarks.
+
+Each receipt is rendered black on white, then made to look like a phone
+photo: placed on a coloured table at 12MP, tilted a few degrees, lit
+unevenly, noised, saved as JPEG and, every other image, stored sideways
+with an EXIF orientation tag (as phones do).
+
+    python -m CYBR_404.WalletNote_ver_06.benchmarks.ocr_corpus <directory> [count]
+
+writes the images plus truth.csv (file, service, date, price).
+"""
+from __future__ import annotations
+
+import csv
+import random
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+PHOTO_SIZE = (3024, 4032)  # 12MP portrait
+RECEIPT_WIDTH = 900
+FONT_SIZE = 38
+MAX_SKEW_DEGREES = 6.0
+EXIF_ORIENTATION = 0x0112
+
+STORES = (
+    "Corner Market",
+    "Blue Cafe",
+    "City Pharmacy",
+    "Green Grocer",
+    "Metro Books",
+    "Harbor Diner",
+    "Sunrise Bakery",
+    "Northside Hardware",
+)
+ITEMS = ("Milk", "Bread", "Coffee", "Apples", "Soap", "Notebook", "Rice", "Tea", "Eggs", "Batteries")
+
+
+@dataclass
+class Receipt:
+    path: Path
+    service: str
+    record_date: date
+    price: Decimal
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+
+
+def _lines(rng: random.Random, service: str, record_date: date) -> tuple:
+    items = [(name, Decimal(rng.randint(99, 2999)) / 100) for name in rng.sample(ITEMS, rng.randint(2, 5))]
+    total = sum((price for _, price in items), Decimal("0"))
+    tax = (total * Decimal("0.08")).quantize(Decimal("0.01"))
+    total += tax
+
+    shown_date = record_date.isoformat() if rng.random() < 0.5 else record_date.strftime("%m/%d/%Y")
+    lines = [service, shown_date, ""]
+    lines += [f"{name:<14}{price:>8}" for name, price in items]
+    lines += ["", f"{'Tax':<14}{tax:>8}", f"{'TOTAL':<14}{total:>8}", "", "Thank you"]
+    return lines, total
+
+
+def _render_receipt(lines: List[str]) -> Image.Image:
+    font = _font(FONT_SIZE)
+    line_height = int(FONT_SIZE * 1.5)
+    receipt = Image.new("L", (RECEIPT_WIDTH, line_height * (len(lines) + 2)), 250)
+    draw = ImageDraw.Draw(receipt)
+    for row, line in enumerate(lines, start=1):
+        draw.text((60, row * line_height), line, fill=20, font=font)
+    return receipt
+
+
+def _photograph(receipt: Image.Image, rng: random.Random) -> Image.Image:
+    width, height = PHOTO_SIZE
+    table = Image.new("RGB", PHOTO_SIZE, (rng.randint(90, 160), rng.randint(70, 120), rng.randint(40, 90)))
+
+    scale = width * 0.7 / receipt.width
+    size = (int(receipt.width * scale), int(receipt.height * scale))
+    skew = rng.uniform(-MAX_SKEW_DEGREES, MAX_SKEW_DEGREES)
+    paper = receipt.resize(size, Image.BICUBIC).rotate(skew, Image.BICUBIC, expand=True)
+    mask = Image.new("L", size, 255).rotate(skew, Image.BICUBIC, expand=True)
+    table.paste(paper.convert("RGB"), ((width - paper.width) // 2, (height - paper.height) // 4), mask)
+
+    # Light falls off towards one side, plus sensor noise
+    light = Image.linear_gradient("L").resize(PHOTO_SIZE).rotate(rng.choice((0, 90, 180, 270)))
+    light = light.point(lambda v: 255 - v // 3)
+    photo = ImageChops.multiply(table, Image.merge("RGB", (light, light, light)))
+    noise = Image.effect_noise(PHOTO_SIZE, 20).convert("RGB")
+    return Image.blend(photo, noise, 0.06)
+
+
+def render(directory: Path, count: int, seed: int = 404) -> List[Receipt]:
+    """
+    Write `count` receipt photos into `directory`.
+    """
+    rng = random.Random(seed)
+    receipts = []
+    for i in range(count):
+        service = STORES[i % len(STORES)]
+        record_date = date(2024, 1, 1) + timedelta(days=rng.randint(0, 364))
+        lines, total = _lines(rng, service, record_date)
+        photo = _photograph(_render_receipt(lines), rng)
+
+        path = directory / f"receipt{i:03d}.jpg"
+        exif = Image.Exif()
+        if i % 2:
+            # Sideways sensor data; the tag tells viewers to turn it upright
+            photo = photo.transpose(Image.ROTATE_90)
+            exif[EXIF_ORIENTATION] = 6
+        photo.save(path, quality=90, exif=exif)
+
+        receipts.append(Receipt(path=path, service=service, record_date=record_date, price=total))
+    return receipts
+
+
+def crops(count: int, seed: int = 404) -> List[Image.Image]:
+    """
+    Clean receipt crops in memory: rendered text only, no photo effects.
+    """
+    rng = random.Random(seed)
+    images = []
+    for i in range(count):
+        record_date = date(2024, 1, 1) + timedelta(days=rng.randint(0, 364))
+        lines, _ = _lines(rng, STORES[i % len(STORES)], record_date)
+        images.append(_render_receipt(lines))
+    return images
+
+
+def main(argv: list) -> None:
+    directory = Path(argv[0])
+    directory.mkdir(parents=True, exist_ok=True)
+    receipts = render(directory, int(argv[1]) if len(argv) > 1 else 20)
+
+    with open(directory / "truth.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("file", "service", "date", "price"))
+        for receipt in receipts:
+            writer.writerow((receipt.path.name, receipt.service, receipt.record_date.isoformat(), receipt.price))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
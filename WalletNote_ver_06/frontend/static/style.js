@@ -1,253 +1,619 @@
-/* =========================
-   Auth
-========================= */
-document.addEventListener("DOMContentLoaded", () => {
-
-    const loginForm = document.getElementById("loginForm");
-    if (loginForm) {
-        loginForm.addEventListener("submit", async (e) => {
-            e.preventDefault();
-
-            const data = {
-                email: loginForm.email.value,
-                password: loginForm.password.value
-            };
-
-            const res = await fetch("/login", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify(data)
-            });
-
-            if (res.ok) {
-                location.href = "/dashboard";
-            } else {
-                alert("Login failed");
-            }
-        });
-    }
-
-    const signupForm = document.getElementById("signupForm");
-    if (signupForm) {
-        signupForm.addEventListener("submit", async (e) => {
-            e.preventDefault();
-
-            const data = {
-                username: signupForm.username.value,
-                email: signupForm.email.value,
-                password: signupForm.password.value
-            };
-
-            const res = await fetch("/signup", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify(data)
-            });
-
-            if (res.ok) {
-                location.href = "/dashboard";
-            } else {
-                alert("Signup failed");
-            }
-        });
-    }
-});
-
-
-/* =========================
-   Dashboard View Switch
-========================= */
-function switchView(type, button) {
-    document.querySelectorAll(".nav-btn").forEach(btn => {
-        btn.classList.remove("active");
-    });
-    button.classList.add("active");
-
-    document.getElementById("expenseView").classList.add("hidden");
-    document.getElementById("incomeView").classList.add("hidden");
-
-    if (type === "expense") {
-        document.getElementById("expenseView").classList.remove("hidden");
-    } else {
-        document.getElementById("incomeView").classList.remove("hidden");
-    }
-}
-
-
-/* =========================
-   Expense Input
-========================= */
-async function submitExpense() {
-    const date = document.getElementById("expenseDate").value;
-    const service = document.getElementById("expenseService").value;
-    const price = document.getElementById("expensePrice").value;
-
-    if (!date || !service || !price) {
-        alert("All fields are required");
-        return;
-    }
-
-    const res = await fetch("/record/expense", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-            date: date,
-            service: service,
-            price: price
-        })
-    });
-
-    if (res.ok) {
-        location.reload();
-    } else {
-        alert("Failed to save expense");
-    }
-}
-
-
-/* =========================
-   Income Input
-========================= */
-async function submitIncome() {
-    const date = document.getElementById("incomeDate").value;
-    const service = document.getElementById("incomeService").value;
-    const price = document.getElementById("incomePrice").value;
-
-    if (!date || !service || !price) {
-        alert("All fields are required");
-        return;
-    }
-
-    const res = await fetch("/record/income", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-            date: date,
-            service: service,
-            price: price
-        })
-    });
-
-    if (res.ok) {
-        location.reload();
-    } else {
-        alert("Failed to save income");
-    }
-}
-
-
-/* =========================
-   OCR Upload
-========================= */
-async function submitOCR() {
-    const input = document.getElementById("receiptImage");
-    if (!input || !input.files.length) {
-        alert("Select an image first");
-        return;
-    }
-
-    const formData = new FormData();
-    formData.append("image", input.files[0]);
-
-    const res = await fetch("/record/ocr", {
-        method: "POST",
-        body: formData
-    });
-
-    if (res.ok) {
-        location.reload();
-    } else {
-        alert("OCR failed");
-    }
-}
-
-
-/* =========================
-   Settings
-========================= */
-async function saveSettings() {
-    const currency = document.getElementById("currencySelect").value;
-
-    const res = await fetch("/setting/save", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ currency })
-    });
-
-    if (res.ok) {
-        alert("Saved");
-        location.href = "/dashboard";
-    } else {
-        alert("Failed to save settings");
-    }
-}
-
-
-document.addEventListener("DOMContentLoaded", () => {
-    loadCharts();
-});
-
-async function loadCharts() {
-    await loadPieChart();
-    await loadBarChart();
-}
-
-/* =========================
-   Pie Chart (Income vs Expense)
-========================= */
-async function loadPieChart() {
-    const res = await fetch("/api/chart/summary");
-    if (!res.ok) return;
-
-    const data = await res.json();
-
-    const ctx = document.getElementById("pieChart");
-    if (!ctx) return;
-
-    new Chart(ctx, {
-        type: "pie",
-        data: {
-            labels: ["Income", "Expense"],
-            datasets: [{
-                data: [data.income, data.expense],
-                backgroundColor: ["#4CAF50", "#d4af37"]
-            }]
-        }
-    });
-}
-
-/* =========================
-   Bar Chart (Expense by Service)
-========================= */
-async function loadBarChart() {
-    const res = await fetch("/api/chart/expense");
-    if (!res.ok) return;
-
-    const rows = await res.json();
-
-    const labels = rows.map(r => r.service);
-    const values = rows.map(r => r.total);
-
-    const ctx = document.getElementById("barChart");
-    if (!ctx) return;
-
-    new Chart(ctx, {
-        type: "bar",
-        data: {
-            labels: labels,
-            datasets: [{
-                label: "Expense",
-                data: values,
-                backgroundColor: "#d4af37"
-            }]
-        },
-        options: {
-            scales: {
-                y: {
-                    beginAtZero: true
-                }
-            }
-        }
-    });
-}
-
+/* =========================
+   Auth
+========================= */
+document.addEventListener("DOMContentLoaded", () => {
+
+    const loginForm = document.getElementById("loginForm");
+    if (loginForm) {
+        loginForm.addEventListener("submit", async (e) => {
+            e.preventDefault();
+
+            const data = {
+                email: loginForm.email.value,
+                password: loginForm.password.value
+            };
+
+            const res = await fetch("/login", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify(data)
+            });
+
+            if (res.ok) {
+                location.href = "/dashboard";
+            } else {
+                alert("Login failed");
+            }
+        });
+    }
+
+    const signupForm = document.getElementById("signupForm");
+    if (signupForm) {
+        signupForm.addEventListener("submit", async (e) => {
+            e.preventDefault();
+
+            const data = {
+                username: signupForm.username.value,
+                email: signupForm.email.value,
+                password: signupForm.password.value
+            };
+
+            const res = await fetch("/signup", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify(data)
+            });
+
+            if (res.ok) {
+                location.href = "/dashboard";
+            } else {
+                alert("Signup failed");
+            }
+        });
+    }
+});
+
+
+/* =========================
+   Dashboard View Switch
+========================= */
+function switchView(type, button) {
+    document.querySelectorAll(".nav-btn").forEach(btn => {
+        btn.classList.remove("active");
+    });
+    button.classList.add("active");
+
+    document.getElementById("expenseView").classList.add("hidden");
+    document.getElementById("incomeView").classList.add("hidden");
+
+    if (type === "expense") {
+        document.getElementById("expenseView").classList.remove("hidden");
+    } else {
+        document.getElementById("incomeView").classList.remove("hidden");
+    }
+}
+
+
+/* =========================
+   Expense Input
+========================= */
+async function submitExpense() {
+    const date = document.getElementById("expenseDate").value;
+    const service = document.getElementById("expenseService").value;
+    const price = document.getElementById("expensePrice").value;
+
+    if (!date || !service || !price) {
+        alert("All fields are required");
+        return;
+    }
+
+    const res = await fetch("/record/expense", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+            date: date,
+            service: service,
+            price: price
+        })
+    });
+
+    if (res.ok) {
+        afterSave(["expenseDate", "expenseService", "expensePrice"]);
+    } else {
+        alert("Failed to save expense");
+    }
+}
+
+
+/* =========================
+   Income Input
+========================= */
+async function submitIncome() {
+    const date = document.getElementById("incomeDate").value;
+    const service = document.getElementById("incomeService").value;
+    const price = document.getElementById("incomePrice").value;
+
+    if (!date || !service || !price) {
+        alert("All fields are required");
+        return;
+    }
+
+    const res = await fetch("/record/income", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+            date: date,
+            service: service,
+            price: price
+        })
+    });
+
+    if (res.ok) {
+        afterSave(["incomeDate", "incomeService", "incomePrice"]);
+    } else {
+        alert("Failed to save income");
+    }
+}
+
+
+/* =========================
+   OCR Upload
+========================= */
+async function submitOCR() {
+    const input = document.getElementById("receiptImage");
+    if (!input || !input.files.length) {
+        alert("Select an image first");
+        return;
+    }
+
+    // Several receipts go up as one batch job
+    const count = input.files.length;
+    const batch = count > 1;
+    const formData = new FormData();
+    if (batch) {
+        Array.from(input.files).forEach(file => formData.append("images", file));
+    } else {
+        formData.append("image", input.files[0]);
+    }
+
+    const res = await fetch(batch ? "/record/ocr/batch" : "/record/ocr", {
+        method: "POST",
+        body: formData
+    });
+
+    if (!res.ok) {
+        alert("OCR upload failed");
+        return;
+    }
+
+    // OCR runs in the background (202 + job id); a receipt seen before is answered at once
+    const body = await res.json();
+    input.value = "";
+    const job = res.status === 202 ? await waitForOCR(body.job_id) : body;
+
+    if (job.status === "done") {
+        const images = batch ? job.result.images : [job.result];
+        const failed = images.filter(image => image.error).length;
+        const duplicates = images.filter(image => image.duplicate).length;
+        if (failed) {
+            alert(`${failed} of ${count} receipts could not be read`);
+        }
+        if (duplicates) {
+            alert(batch
+                ? `${duplicates} of ${count} receipts were already uploaded and were not saved again`
+                : "This receipt was already uploaded; it was not saved again");
+        }
+        afterSave(["receiptImage"]);
+    } else {
+        alert("OCR failed: " + (job.error || "unknown error"));
+    }
+}
+
+async function waitForOCR(jobId) {
+    let delay = 500;
+    for (;;) {
+        await new Promise(resolve => setTimeout(resolve, delay));
+        const res = await fetch(`/record/ocr/${jobId}`);
+        if (!res.ok) {
+            return { status: "failed", error: `status ${res.status}` };
+        }
+        const job = await res.json();
+        if (job.status === "done" || job.status === "failed") {
+            return job;
+        }
+        delay = Math.min(delay * 2, 4000);
+    }
+}
+
+
+/* =========================
+   Settings
+========================= */
+async function saveSettings() {
+    const currency = document.getElementById("currencySelect").value;
+
+    const res = await fetch("/setting/save", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ currency })
+    });
+
+    if (res.ok) {
+        alert("Saved");
+        location.href = "/dashboard";
+    } else {
+        alert("Failed to save settings");
+    }
+}
+
+
+document.addEventListener("DOMContentLoaded", () => {
+    loadCharts();
+});
+
+let pieChart = null;
+let barChart = null;
+
+async function loadCharts() {
+    if (!document.getElementById("pieChart")) return;
+
+    const data = await loadDashboardData();
+    if (!data) return;
+
+    loadPieChart(data.summary);
+    loadBarChart(data.expense_by_service);
+}
+
+/* =========================
+   Dashboard Payload (one response for every chart)
+========================= */
+async function loadDashboardData() {
+    const embedded = document.getElementById("dashboardData");
+    if (embedded) {
+        return JSON.parse(embedded.textContent);
+    }
+
+    const res = await fetch("/api/dashboard");
+    if (!res.ok) return null;
+    return await res.json();
+}
+
+/* =========================
+   Pie Chart (Income vs Expense)
+========================= */
+function loadPieChart(data) {
+    const ctx = document.getElementById("pieChart");
+    if (!ctx) return;
+
+    pieChart = new Chart(ctx, {
+        type: "pie",
+        data: {
+            labels: ["Income", "Expense"],
+            datasets: [{
+                data: [data.income, data.expense],
+                backgroundColor: ["#4CAF50", "#d4af37"]
+            }]
+        }
+    });
+}
+
+/* =========================
+   Bar Chart (Expense by Service)
+========================= */
+function loadBarChart(rows) {
+    const labels = rows.map(r => r.service);
+    const values = rows.map(r => r.total);
+
+    const ctx = document.getElementById("barChart");
+    if (!ctx) return;
+
+    barChart = new Chart(ctx, {
+        type: "bar",
+        data: {
+            labels: labels,
+            datasets: [{
+                label: "Expense",
+                data: values,
+                backgroundColor: "#d4af37"
+            }]
+        },
+        options: {
+            scales: {
+                y: {
+                    beginAtZero: true
+                }
+            }
+        }
+    });
+}
+
+
+
+/* =========================
+   History (keyset pages on scroll)
+========================= */
+document.addEventListener("DOMContentLoaded", () => {
+    const list = document.getElementById("historyList");
+    const sentinel = document.getElementById("historySentinel");
+    if (!list || !sentinel || !("IntersectionObserver" in window)) return;
+
+    let loading = false;
+
+    const observer = new IntersectionObserver(async (entries) => {
+        if (!entries[0].isIntersecting || loading) return;
+
+        // Rendered from the local copy: the next slice is already here
+        if (list.dataset.localHistory) {
+            if (localHistory) showMoreLocalHistory(list);
+            return;
+        }
+
+        const cursor = list.dataset.nextCursor;
+        if (!cursor) {
+            observer.disconnect();
+            return;
+        }
+
+        loading = true;
+        try {
+            const res = await fetch("/api/records?cursor=" + encodeURIComponent(cursor));
+            if (!res.ok) return;
+
+            const page = await res.json();
+            page.records.forEach(r => list.insertBefore(historyItem(r), sentinel));
+            list.dataset.nextCursor = page.next_cursor || "";
+        } finally {
+            loading = false;
+        }
+    }, { root: list });  // the list scrolls, not the page
+
+    observer.observe(sentinel);
+});
+
+function historyItem(r) {
+    const type = r.record_type.charAt(0).toUpperCase() + r.record_type.slice(1);
+
+    const item = document.createElement("div");
+    item.className = "history-item";
+    item.textContent = `${r.record_date} | ${type} | ${r.service} | ${r.price}`;
+    return item;
+}
+
+// First server page, for a page that expected a local copy it does not have
+async function loadHistoryPage(list) {
+    list.dataset.localHistory = "";
+
+    const res = await fetch("/api/records");
+    if (!res.ok) return;
+
+    const page = await res.json();
+    renderHistory(list, page.records);
+    list.dataset.nextCursor = page.next_cursor || "";
+}
+
+function renderHistory(list, records) {
+    const sentinel = document.getElementById("historySentinel");
+    list.querySelectorAll(".history-item").forEach(el => el.remove());
+
+    if (!records.length) {
+        const empty = document.createElement("div");
+        empty.className = "history-item";
+        empty.textContent = "No records yet";
+        list.insertBefore(empty, sentinel);
+        return;
+    }
+    records.forEach(r => list.insertBefore(historyItem(r), sentinel));
+}
+
+
+/* =========================
+   Offline Copy (IndexedDB, delta sync)
+========================= */
+const RECORDS_DB = "walletnote";
+
+function openRecordsDB() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open(RECORDS_DB, 1);
+        req.onupgradeneeded = () => {
+            req.result.createObjectStore("records", { keyPath: "id" });
+            req.result.createObjectStore("meta");
+        };
+        req.onsuccess = () => {
+            // Let logout() delete the database without waiting for this page
+            req.result.onversionchange = () => req.result.close();
+            resolve(req.result);
+        };
+        req.onerror = () => reject(req.error);
+    });
+}
+
+function idbRequest(req) {
+    return new Promise((resolve, reject) => {
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+function idbDone(tx) {
+    return new Promise((resolve, reject) => {
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    });
+}
+
+// Patch the local copy with everything changed since the stored token;
+// resolves to the user id the copy belongs to (undefined before the first sync)
+async function syncRecords() {
+    const db = await openRecordsDB();
+    const meta = db.transaction("meta").objectStore("meta");
+    let token = await idbRequest(meta.get("token"));
+    let userId = await idbRequest(meta.get("user_id"));
+
+    while (true) {
+        const url = "/api/records/changes" + (token ? "?since=" + encodeURIComponent(token) : "");
+        const res = await fetch(url);
+        if (!res.ok) return userId;
+
+        const page = await res.json();
+        const tx = db.transaction(["records", "meta"], "readwrite");
+        const records = tx.objectStore("records");
+
+        // Another account logged in on this browser: start over
+        if (userId !== undefined && userId !== page.user_id) {
+            records.clear();
+            tx.objectStore("meta").clear();
+            userId = page.user_id;
+            token = null;
+            await idbDone(tx);
+            continue;
+        }
+
+        page.changes.forEach(c => {
+            if (c.deleted) {
+                records.delete(c.id);
+            } else {
+                records.put(c);
+            }
+        });
+        tx.objectStore("meta").put(page.token, "token");
+        tx.objectStore("meta").put(page.user_id, "user_id");
+        await idbDone(tx);
+
+        token = page.token;
+        userId = page.user_id;
+        if (!page.has_more) return userId;
+    }
+}
+
+// All records of the local copy, newest first
+async function localRecords() {
+    const db = await openRecordsDB();
+    const rows = await idbRequest(db.transaction("records").objectStore("records").getAll());
+    return rows.sort((a, b) =>
+        b.record_date.localeCompare(a.record_date)
+        || b.created_at.localeCompare(a.created_at)
+        || b.id - a.id
+    );
+}
+
+/* =========================
+   History from the Local Copy (warm open)
+========================= */
+// Must match app.config["LOCAL_HISTORY_COOKIE"]
+const LOCAL_HISTORY_COOKIE = "walletnote_local";
+const LOCAL_HISTORY_PAGE = 20;  // Dashboard.PAGE_SIZE
+
+let localHistory = null;  // { rows, shown } while the list renders from the local copy
+
+function rememberLocalHistory(userId) {
+    const value = userId === undefined ? "; max-age=0" : `${userId}; max-age=31536000`;
+    document.cookie = `${LOCAL_HISTORY_COOKIE}=${value}; path=/; SameSite=Lax`;
+}
+
+async function renderLocalHistory(list) {
+    const rows = await localRecords();
+    const shown = Math.max(localHistory ? localHistory.shown : 0, LOCAL_HISTORY_PAGE);
+
+    // Re-renders (after a live update) keep what was already scrolled in
+    localHistory = { rows: rows, shown: Math.min(shown, rows.length) };
+    renderHistory(list, rows.slice(0, localHistory.shown));
+}
+
+function showMoreLocalHistory(list) {
+    const sentinel = document.getElementById("historySentinel");
+    localHistory.rows
+        .slice(localHistory.shown, localHistory.shown + LOCAL_HISTORY_PAGE)
+        .forEach(r => list.insertBefore(historyItem(r), sentinel));
+    localHistory.shown = Math.min(localHistory.shown + LOCAL_HISTORY_PAGE, localHistory.rows.length);
+}
+
+// The next user of this browser must not find this user's history
+async function logout() {
+    rememberLocalHistory(undefined);
+    if ("indexedDB" in window) {
+        await new Promise(resolve => {
+            const req = indexedDB.deleteDatabase(RECORDS_DB);
+            req.onsuccess = req.onerror = req.onblocked = () => resolve();
+        });
+    }
+    location.href = "/logout";
+}
+
+// Refresh the local copy; on a warm open (the server sent no history) render from it
+async function refreshLocalHistory(list) {
+    const userId = await syncRecords();
+    rememberLocalHistory(userId);
+    if (!list.dataset.localHistory) return;
+
+    if (userId === undefined) {
+        await loadHistoryPage(list);
+        return;
+    }
+    await renderLocalHistory(list);
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    const list = document.getElementById("historyList");
+    if (!list) return;
+
+    if (!("indexedDB" in window)) {
+        if (list.dataset.localHistory) loadHistoryPage(list);
+        return;
+    }
+
+    // The page works without the local copy: fall back to server pages
+    refreshLocalHistory(list).catch(() => {
+        rememberLocalHistory(undefined);
+        if (list.dataset.localHistory) loadHistoryPage(list);
+    });
+});
+
+
+/* =========================
+   Live Updates (Server-Sent Events)
+========================= */
+let liveUpdates = false;
+let saveFallback = null;  // reload timer of the last save, cleared by the stream's next event
+
+// How long a save waits for its live event before reloading the page
+const LIVE_EVENT_TIMEOUT_MS = 3000;
+
+// With the live stream up the charts update themselves; otherwise reload.
+// An open stream is no proof the event will come, so reload unless it does.
+function afterSave(fieldIds) {
+    if (!liveUpdates) {
+        location.reload();
+        return;
+    }
+    fieldIds.forEach(id => {
+        document.getElementById(id).value = "";
+    });
+
+    clearTimeout(saveFallback);
+    saveFallback = setTimeout(() => location.reload(), LIVE_EVENT_TIMEOUT_MS);
+}
+
+function applyTotals(totals) {
+    if (pieChart) {
+        pieChart.data.datasets[0].data = [totals.summary.income, totals.summary.expense];
+        pieChart.update();
+    }
+    if (barChart) {
+        barChart.data.labels = totals.expense_by_service.map(r => r.service);
+        barChart.data.datasets[0].data = totals.expense_by_service.map(r => r.total);
+        barChart.update();
+    }
+
+    const setText = (id, value) => {
+        const el = document.getElementById(id);
+        if (el) el.textContent = value.toFixed(2);
+    };
+    setText("balanceValue", totals.balance);
+    setText("todayIncome", totals.today.income);
+    setText("todayExpense", totals.today.expense);
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    if (!document.getElementById("pieChart") || !("EventSource" in window)) return;
+
+    const source = new EventSource("/api/stream");
+    source.onopen = () => { liveUpdates = true; };
+    source.onerror = () => { liveUpdates = false; };  // EventSource reconnects by itself
+
+    ["record_added", "records_added", "record_updated", "record_deleted", "resync"].forEach(type => {
+        source.addEventListener(type, (e) => {
+            clearTimeout(saveFallback);
+            saveFallback = null;
+
+            const event = JSON.parse(e.data);
+            if (event.totals) applyTotals(event.totals);
+
+            const list = document.getElementById("historyList");
+            if (event.type === "record_added" && list && !list.dataset.localHistory) {
+                list.prepend(historyItem(event.record));
+            }
+            if (list && "indexedDB" in window) refreshLocalHistory(list).catch(() => {});
+        });
+    });
+});
@@ -0,0 +1,73 @@
+# tests/conftest.py
+"""
+Shared fixtures.
+
+The suite runs on a throw-away SQLite file unless WALLETNOTE_DB_ENGINE
+says otherwise (the MySQL settings then come from DBConfig).
+
+    python -m pytest WalletNote_ver_06/tests
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+os.environ.setdefault("WALLETNOTE_DB_ENGINE", "sqlite")
+if os.environ["WALLETNOTE_DB_ENGINE"] == "sqlite":
+    os.environ.setdefault(
+        "WALLETNOTE_SQLITE_PATH",
+        os.path.join(tempfile.mkdtemp(prefix="walletnote-tests-"), "walletnote.db"),
+    )
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB  # noqa: E402
+from CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB import MigrateDB  # noqa: E402
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation  # noqa: E402
+
+EMAIL_DOMAIN = "tests.example.invalid"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Migrated database; every test user is deleted at the end (cascades).
+    """
+    MigrateDB().migrate()
+    db = ConnectDB()
+    yield db
+    db.execute("DELETE FROM users WHERE email LIKE %s", (f"%@{EMAIL_DOMAIN}",))
+
+
+@pytest.fixture
+def user(database) -> UserInformation:
+    email = f"{uuid.uuid4().hex}@{EMAIL_DOMAIN}"
+    database.execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        ("test", email, "-"),
+    )
+    user_id = database.fetch_one("SELECT id FROM users WHERE email=%s", (email,))[0]
+    return UserInformation(user_id=user_id, username="test", email=email)
+
+
+@pytest.fixture(scope="session")
+def flask_app(database):
+    pytest.importorskip("flask")
+    from CYBR_404.WalletNote_ver_06.app import app
+
+    app.testing = True
+    return app
+
+
+@pytest.fixture
+def client(flask_app, user):
+    """
+    Test client logged in as `user`.
+    """
+    client = flask_app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = user.user_id
+        session["username"] = user.username
+        session["email"] = user.email
+    return client
@@ -0,0 +1,62 @@
+# tests/test_aggregate_cache.py
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.AggregateCache import AggregateCache
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+def _loads(config, user_id, shape, load):
+    calls = []
+
+    def counted():
+        calls.append(1)
+        return load()
+
+    AggregateCache.get_or_load(config, user_id, shape, counted)
+    AggregateCache.get_or_load(config, user_id, shape, counted)
+    return len(calls)
+
+
+def test_value_is_cached(user):
+    assert _loads(DBConfig(), user.user_id, ("plain",), lambda: 1) == 1
+
+
+def test_value_loaded_across_an_invalidation_is_not_cached(user):
+    def slow_read():
+        # A writer commits and invalidates while this read is in flight
+        AggregateCache.invalidate(user.user_id)
+        return "old totals"
+
+    assert _loads(DBConfig(), user.user_id, ("raced",), slow_read) == 2
+
+
+def test_reads_inside_a_writing_unit_of_work_are_not_cached(user):
+    with UnitOfWork():
+        RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+        assert _loads(DBConfig(), user.user_id, ("uncommitted",), lambda: 1) == 2
+
+    assert _loads(DBConfig(), user.user_id, ("committed",), lambda: 1) == 1
+
+
+def test_reads_from_a_snapshot_older_than_the_invalidation_are_not_cached(user):
+    with UnitOfWork():
+        RecallDB().fetch_one("SELECT 1")  # the unit's transaction (and snapshot) begins
+        AggregateCache.invalidate(user.user_id)  # another request commits a write
+        assert _loads(DBConfig(), user.user_id, ("snapshot",), lambda: 1) == 2
+
+
+def test_versioned_reads_miss_when_another_worker_wrote(user):
+    config = DBConfig()
+    shape = ("versioned",)
+
+    with AggregateCache.at_version(user.user_id, 1):
+        assert AggregateCache.get_or_load(config, user.user_id, shape, lambda: "version 1") == "version 1"
+        assert AggregateCache.get_or_load(config, user.user_id, shape, lambda: "reloaded") == "version 1"
+
+    # The write ran in another process: nothing invalidated this one
+    with AggregateCache.at_version(user.user_id, 2):
+        assert AggregateCache.get_or_load(config, user.user_id, shape, lambda: "version 2") == "version 2"
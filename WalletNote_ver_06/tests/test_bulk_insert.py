@@ -0,0 +1,15 @@
+# tests/test_bulk_insert.py
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+def test_add_records_spans_several_full_chunks(user):
+    db = RecordDB()
+    rows = 2 * db.BULK_CHUNK_ROWS[db.dialect] + 1
+    records = [InputInformation(f"{n}.00", f"service {n % 7}", "2025-03-01") for n in range(rows)]
+
+    assert db.add_records(user, records, "expense") == rows
+    assert len(RecallDB().get_records_by_user(user.user_id)) == rows
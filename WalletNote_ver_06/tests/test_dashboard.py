@@ -0,0 +1,53 @@
+# tests/test_dashboard.py
+"""
+/dashboard sends the history only to browsers without the user's local copy.
+"""
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+def _dashboard(client, flask_app, cookie: str | None):
+    if cookie is not None:
+        client.set_cookie(flask_app.config["LOCAL_HISTORY_COOKIE"], cookie)
+    return client.get("/dashboard")
+
+
+def test_cold_open_renders_the_history(client, flask_app, user):
+    RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+
+    response = _dashboard(client, flask_app, None)
+
+    assert response.status_code == 200
+    assert b"Coffee" in response.data
+    assert response.headers["X-DB-Query-Count"] == "2"
+
+
+def test_warm_open_sends_totals_only(client, flask_app, user):
+    RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+
+    response = _dashboard(client, flask_app, str(user.user_id))
+
+    assert response.status_code == 200
+    assert b'data-local-history="1"' in response.data
+    assert b"2025-03-01 |" not in response.data
+    assert response.headers["X-DB-Query-Count"] == "1"
+
+
+def test_another_users_copy_gets_the_server_history(client, flask_app, user):
+    RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+
+    response = _dashboard(client, flask_app, str(user.user_id + 1))
+
+    assert b'data-local-history=""' in response.data
+    assert b"Coffee" in response.data
+
+
+def test_logout_drops_the_local_history_cookie(client, flask_app, user):
+    cookie = flask_app.config["LOCAL_HISTORY_COOKIE"]
+    client.set_cookie(cookie, str(user.user_id))
+
+    client.get("/logout")
+
+    assert client.get_cookie(cookie) is None
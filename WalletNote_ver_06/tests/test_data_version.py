@@ -0,0 +1,43 @@
+# tests/test_data_version.py
+"""
+The data version (and so every ETag) moves only when a row changes.
+"""
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.EditDB import EditDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+def _record_id(user) -> int:
+    return RecallDB().get_records_by_user(user.user_id)[0][0]
+
+
+def test_writes_that_change_nothing_keep_the_version(user):
+    versions = DataVersionDB()
+    coffee = InputInformation("4.50", "Coffee", "2025-03-01")
+    RecordDB().add_record(user, coffee, "expense")
+    record_id = _record_id(user)
+    version = versions.current(user.user_id)
+
+    assert RecordDB().add_records(user, [], "expense") == 0
+    EditDB().update_record(user, record_id + 1000, coffee)
+    EditDB().delete_record(user, record_id + 1000)
+    EditDB().update_record(user, record_id, InputInformation("4.50", "Coffee", "2025-03-01"))
+
+    assert versions.current(user.user_id) == version
+
+
+def test_writes_that_change_a_row_bump_the_version(user):
+    versions = DataVersionDB()
+    RecordDB().add_records(user, [InputInformation("4.50", "Coffee", "2025-03-01")], "expense")
+    record_id = _record_id(user)
+    version = versions.current(user.user_id)
+
+    EditDB().update_record(user, record_id, InputInformation("5.00", "Coffee", "2025-03-01"))
+    assert versions.current(user.user_id) == version + 1
+
+    EditDB().delete_record(user, record_id)
+    assert versions.current(user.user_id) == version + 2
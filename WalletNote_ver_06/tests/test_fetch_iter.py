@@ -0,0 +1,58 @@
+# tests/test_fetch_iter.py
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.QueryLog import QueryLog
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+
+
+def test_stream_inside_unit_of_work_leaves_other_statements_working(user):
+    RecordDB().add_records(
+        user,
+        [InputInformation(f"{n}.00", "Coffee", "2025-03-01") for n in range(1, 6)],
+        "expense",
+    )
+
+    with UnitOfWork(), QueryLog() as log:
+        db = RecallDB()
+        rows = db.iter_records(user.user_id, chunk_size=2)
+        next(rows)
+
+        # Half-read stream open; the unit's connection is still usable
+        assert len(db.get_records_by_user(user.user_id)) == 5
+
+        rows.close()
+
+    assert log.count == 2
+    assert sorted(entry.rows for entry in log.queries) == [2, 5]
+
+
+class _Pool:
+    def __init__(self):
+        self.released, self.discarded = [], []
+
+    def release(self, conn):
+        self.released.append(conn)
+
+    def discard(self, conn):
+        self.discarded.append(conn)
+
+
+def test_stream_closed_early_drops_its_pooled_connection():
+    pool, conn = _Pool(), object()
+
+    def stream():
+        with ConnectDB._checked_out(pool, conn):
+            yield 1
+            yield 2
+
+    rows = stream()
+    next(rows)
+    rows.close()
+    assert (pool.released, pool.discarded) == ([], [conn])
+
+    assert list(stream()) == [1, 2]
+    assert pool.released == [conn]
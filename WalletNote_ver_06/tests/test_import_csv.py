@@ -0,0 +1,55 @@
+# tests/test_import_csv.py
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.System.ImportCSV import ImportCSV
+
+STATEMENT = b"""date,amount,description
+2025-03-01,-4.50,Blue Cafe
+2025-03-01,-4.50,Blue Cafe
+2025-03-01,-12.00,Corner Market
+2025-03-02,1500.00,Salary
+"""
+
+
+def _records(user) -> int:
+    return RecordDB().fetch_one("SELECT COUNT(*) FROM records WHERE user_id = %s", (user.user_id,))[0]
+
+
+def test_identical_lines_are_kept_and_reimport_skips_them(user):
+    first = ImportCSV(user).run(io.BytesIO(STATEMENT))
+    assert (first.inserted, first.duplicates) == (4, 0)
+
+    again = ImportCSV(user).run(io.BytesIO(STATEMENT))
+    assert (again.inserted, again.duplicates) == (0, 4)
+    assert _records(user) == 4
+
+
+@pytest.mark.parametrize("request_scope", [False, True])
+def test_batch_racing_another_import_counts_its_lines_as_duplicates(user, monkeypatch, request_scope):
+    ImportCSV(user).run(io.BytesIO(STATEMENT))
+
+    # The other import commits between this one's lookup and its insert
+    lookup = RecordDB.existing_import_hashes
+    calls = []
+
+    def stale_once(self, user, hashes):
+        calls.append(hashes)
+        return set() if len(calls) == 1 else lookup(self, user, hashes)
+
+    monkeypatch.setattr(RecordDB, "existing_import_hashes", stale_once)
+
+    if request_scope:
+        with UnitOfWork():
+            result = ImportCSV(user).run(io.BytesIO(STATEMENT))
+    else:
+        result = ImportCSV(user).run(io.BytesIO(STATEMENT))
+
+    assert len(calls) == 2
+    assert (result.inserted, result.duplicates) == (0, 4)
+    assert _records(user) == 4
@@ -0,0 +1,72 @@
+# tests/test_migrations.py
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.MigrateDB import MigrateDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.Migrations import V004_records_import_hash
+
+
+@pytest.fixture
+def empty_db(tmp_path):
+    """
+    MigrateDB on a database of its own (dropped afterwards on MySQL).
+    """
+    base = DBConfig()
+    config = replace(base, sqlite_path=str(tmp_path / "migrate.db"), database=f"{base.database}_migrate_test")
+    yield MigrateDB(config)
+    if config.engine == "mysql":
+        ConnectDB(replace(config, database=None, pool_size=0)).execute(f"DROP DATABASE IF EXISTS {config.database}")
+
+
+def test_failed_migration_can_be_rerun(empty_db, monkeypatch):
+    upgrade = V004_records_import_hash.upgrade
+
+    def fail_halfway(db):
+        upgrade(db)
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(V004_records_import_hash, "upgrade", fail_halfway)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        empty_db.migrate()
+    assert empty_db.current_version() == 3
+    if empty_db.dialect == "sqlite":
+        # Transactional DDL: the half-applied migration was rolled back
+        assert not empty_db.has_column("records", "import_hash")
+
+    monkeypatch.setattr(V004_records_import_hash, "upgrade", upgrade)
+    applied = empty_db.migrate()
+
+    assert applied[0] == 4
+    assert empty_db.current_version() == MigrateDB.latest_version()
+    assert empty_db.has_column("records", "import_hash")
+    assert empty_db.has_index("records", "ux_records_user_import_hash")
+
+
+def test_ddl_helpers_skip_existing_objects(empty_db):
+    empty_db.migrate()
+
+    empty_db.add_column("records", "import_hash", "CHAR(64) NULL")
+    empty_db.create_index("records", "ix_records_user_change", "user_id, change_version, id")
+
+    empty_db.drop_index("records", "ix_records_user_change")
+    assert not empty_db.has_index("records", "ix_records_user_change")
+    empty_db.drop_index("records", "ix_records_user_change")
+
+
+def test_unmigrated_database_is_version_zero(empty_db):
+    if empty_db.config.engine == "mysql":
+        pytest.skip("the test database may already exist")
+    assert empty_db.current_version() == 0
+
+
+def test_unreachable_database_is_not_reported_as_unmigrated(tmp_path):
+    # A directory where the SQLite file should be: the database cannot be opened
+    config = replace(DBConfig(), engine="sqlite", sqlite_path=str(tmp_path), pool_size=0)
+
+    with pytest.raises(sqlite3.OperationalError, match="unable to open"):
+        MigrateDB(config).current_version()
@@ -0,0 +1,30 @@
+# tests/test_ocr_save.py
+from __future__ import annotations
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordEvents import RecordEvents
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.OCR_System import OCRResult, OCRSystem
+
+IMAGE_HASH = "ab" * 32
+
+
+def test_duplicate_upload_inside_a_request_changes_nothing(user):
+    receipt = InputInformation("4.50", "Coffee", "2025-03-01")
+    RecordDB().add_record(user, receipt, "expense", source="ocr", import_hash=IMAGE_HASH)
+    version = DataVersionDB().current(user.user_id)
+
+    subscription = RecordEvents.subscribe(user.user_id)
+    try:
+        with UnitOfWork():
+            # The concurrent upload's lookup missed; its insert hits the unique key
+            result = OCRResult(receipt)
+            OCRSystem()._save(user, result, IMAGE_HASH, {})
+
+        assert result.duplicate
+        assert DataVersionDB().current(user.user_id) == version
+        assert subscription.get(timeout=0) == []
+    finally:
+        RecordEvents.unsubscribe(subscription)
@@ -0,0 +1,230 @@
+# tests/test_query_plans.py
+"""
+EXPLAIN every repository read and fail on full scans or filesorts, or
+on an index of ours that no read uses (it only slows writes down).
+Keyset seeks (SEEKS) must also read a range on MySQL, not every row of
+the user.
+
+Seeds throw-away users with records, rollups, OCR results and data
+versions (so the optimizer has realistic selectivity), captures the SQL
+each repository method issues and EXPLAINs it: EXPLAIN on MySQL,
+EXPLAIN QUERY PLAN on SQLite.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+import pytest
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB, DBConfig
+from CYBR_404.WalletNote_ver_06.Backend.Database.DataVersionDB import DataVersionDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.EditDB import EditDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.OCRResultDB import OCRResultDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputUserInformation import UserInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.Dashboard import Dashboard
+from CYBR_404.WalletNote_ver_06.Backend.System.MakeGraph import MakeGraph
+
+FILLER_USERS = 20
+ROWS_PER_USER = 200
+EMAIL_DOMAIN = "query-plans.example.invalid"
+
+# Every call reaches the database layer
+NO_CACHE = replace(DBConfig(), aggregate_cache_size=0)
+
+Statements = List[Tuple[str, Tuple[Any, ...]]]
+
+
+def capture(repository, statements: Statements):
+    """
+    Make `repository` record the SQL it would run and return no rows.
+    """
+
+    def fetch_all(sql, params=None):
+        statements.append((sql, tuple(params) if params else ()))
+        return []
+
+    def fetch_one(sql, params=None):
+        statements.append((sql, tuple(params) if params else ()))
+        return None
+
+    def fetch_iter(sql, params=None, chunk_size=500):
+        statements.append((sql, tuple(params) if params else ()))
+        return iter(())
+
+    repository.fetch_all = fetch_all
+    repository.fetch_one = fetch_one
+    repository.fetch_iter = fetch_iter
+    return repository
+
+
+def _recall(statements: Statements) -> RecallDB:
+    return capture(RecallDB(NO_CACHE), statements)
+
+
+def _dashboard(statements: Statements) -> Dashboard:
+    dash = Dashboard()
+    dash.recall_db = _recall(statements)
+    return dash
+
+
+def _graph(statements: Statements) -> MakeGraph:
+    maker = MakeGraph()
+    maker.recall_db = _recall(statements)
+    return maker
+
+
+TODAY = date.today()
+CURSOR = Dashboard.encode_cursor(TODAY - timedelta(days=30), datetime.now(), 10**9)
+SOME_HASH = "0" * 64
+
+CALLS: Dict[str, Callable[[Statements, UserInformation], Any]] = {
+    "RecallDB.get_records_by_user": lambda s, u: _recall(s).get_records_by_user(u.user_id),
+    "RecallDB.get_records_by_user(type)": lambda s, u: _recall(s).get_records_by_user(u.user_id, "expense", 20),
+    "RecallDB.iter_records": lambda s, u: list(_recall(s).iter_records(u.user_id)),
+    "RecallDB.get_changes": lambda s, u: _recall(s).get_changes(u.user_id, (0, 0), 500),
+    "RecallDB.get_changes(since)": lambda s, u: _recall(s).get_changes(u.user_id, (10**9, 0), 500),
+    "RecallDB.get_monthly_summary": lambda s, u: _recall(s).get_monthly_summary(u.user_id, TODAY.year, TODAY.month),
+    "RecallDB.get_yearly_summary": lambda s, u: _recall(s).get_yearly_summary(u.user_id, TODAY.year),
+    "Dashboard.get_recent_records": lambda s, u: _dashboard(s).get_recent_records(u.user_id),
+    "Dashboard.get_records_page(cursor)": lambda s, u: _dashboard(s).get_records_page(u.user_id, CURSOR),
+    "Dashboard.get_dashboard": lambda s, u: _dashboard(s).get_dashboard(u.user_id),
+    "Dashboard.get_summary_by_type": lambda s, u: _dashboard(s).get_summary_by_type(u.user_id),
+    "Dashboard.get_expense_by_service": lambda s, u: _dashboard(s).get_expense_by_service(u.user_id),
+    "MakeGraph.monthly_graph": lambda s, u: _graph(s).monthly_graph(u.user_id, TODAY.year, TODAY.month),
+    "MakeGraph.yearly_graph": lambda s, u: _graph(s).yearly_graph(u.user_id, TODAY.year),
+    "MakeGraph.today_graph": lambda s, u: _graph(s).today_graph(u.user_id),
+    "EditDB._locked_record": lambda s, u: capture(EditDB(), s)._locked_record(u, 10**9),
+    "RecordDB.existing_import_hashes": lambda s, u: capture(RecordDB(), s).existing_import_hashes(u, [SOME_HASH]),
+    "OCRResultDB.lookup": lambda s, u: capture(OCRResultDB(), s).lookup(u.user_id, [SOME_HASH]),
+    "DataVersionDB.current": lambda s, u: capture(DataVersionDB(), s).current(u.user_id),
+}
+
+# Per-user tables that grow with use: SQLite must SEARCH them, never SCAN
+# (a SCAN ... USING INDEX still reads the whole index)
+SEARCH_ONLY = ("records", "daily_rollups", "record_tombstones")
+
+# Calls that continue after a position: their cost must not grow with it
+SEEKS = {"Dashboard.get_records_page(cursor)", "RecallDB.get_changes(since)"}
+
+
+@pytest.fixture(scope="module")
+def plan_user(database: ConnectDB):
+    """
+    The first of FILLER_USERS seeded users.
+    """
+    users = []
+    for n in range(FILLER_USERS):
+        email = f"user{n}@{EMAIL_DOMAIN}"
+        database.execute(
+            "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+            (f"plan{n}", email, "-"),
+        )
+        user_id = database.fetch_one("SELECT id FROM users WHERE email=%s", (email,))[0]
+        user = UserInformation(user_id=user_id, username=f"plan{n}", email=email)
+        users.append(user)
+
+        records = {"income": ([], []), "expense": ([], [])}
+        for i in range(ROWS_PER_USER):
+            record_type = "income" if i % 5 == 0 else "expense"
+            record = InputInformation(
+                price=Decimal(i % 50) + Decimal("0.99"),
+                service=f"service {i % 12}",
+                record_date=TODAY - timedelta(days=i * 3),
+            )
+            import_hash = f"{user_id:032x}{i:032x}"
+            records[record_type][0].append(record)
+            records[record_type][1].append(import_hash)
+            if i % 10 == 0:
+                OCRResultDB().put(user_id, import_hash, record)
+
+        for record_type, (batch, hashes) in records.items():
+            RecordDB().add_records(user, batch, record_type, import_hashes=hashes)
+
+    database.execute("ANALYZE TABLE records, daily_rollups" if database.dialect == "mysql" else "ANALYZE")
+    yield users[0]
+    database.execute("DELETE FROM users WHERE email LIKE %s", (f"%@{EMAIL_DOMAIN}",))
+
+
+def _plan(db: ConnectDB, sql: str, params: Tuple[Any, ...], seek: bool = False) -> Tuple[List[str], Set[str]]:
+    """
+    Problems in the plan of `sql`, and the indexes it reads.
+
+    :param seek: the statement seeks past a position (MySQL: must be a range)
+    """
+    problems, indexes = [], set()
+
+    if db.dialect == "sqlite":
+        for row in db.fetch_all("EXPLAIN QUERY PLAN " + sql, params):
+            detail = row[-1]
+            scan = re.match(r"SCAN (\w+)", detail)
+            if scan and ("INDEX" not in detail or scan.group(1) in SEARCH_ONLY):
+                problems.append(detail)
+            if "TEMP B-TREE FOR ORDER BY" in detail:
+                problems.append(detail)
+            match = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+            if match:
+                indexes.add(match.group(1))
+        return problems, indexes
+
+    # Traditional EXPLAIN: id, select_type, table, partitions, type, possible_keys,
+    #                      key, key_len, ref, rows, filtered, Extra
+    for row in db.fetch_all("EXPLAIN " + sql, params):
+        table, access_type, key, extra = row[2] or "", row[4], row[6], row[11] or ""
+        if table.startswith("<"):
+            continue  # <unionM,N> / <derivedN>: the result of rows checked below
+        if access_type in ("ALL", "index"):
+            problems.append(f"full scan (type={access_type}, key={key})")
+        if seek and access_type != "range":
+            problems.append(f"seek is not a range (type={access_type}, key={key})")
+        if "Using filesort" in extra:
+            problems.append(f"filesort (key={key}, extra={extra})")
+        if key:
+            indexes.add(key)
+    return problems, indexes
+
+
+def _secondary_indexes(db: ConnectDB) -> Set[str]:
+    """
+    The ix_* indexes the migrations created (unique ones also enforce
+    constraints, so they stay even when unread).
+    """
+    if db.dialect == "sqlite":
+        rows = db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'index'")
+    else:
+        rows = db.fetch_all(
+            """
+            SELECT DISTINCT INDEX_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            """
+        )
+    return {row[0] for row in rows if row[0].startswith("ix_")}
+
+
+@pytest.mark.parametrize("name", list(CALLS))
+def test_query_plan(database, plan_user, name):
+    statements: Statements = []
+    CALLS[name](statements, plan_user)
+    assert statements, f"{name} issued no SQL"
+
+    for sql, params in statements:
+        problems, _ = _plan(database, sql, params, seek=name in SEEKS)
+        assert problems == [], sql
+
+
+def test_every_index_is_read(database, plan_user):
+    used: Set[str] = set()
+    for call in CALLS.values():
+        statements: Statements = []
+        call(statements, plan_user)
+        for sql, params in statements:
+            used |= _plan(database, sql, params)[1]
+
+    assert _secondary_indexes(database) - used == set()
@@ -0,0 +1,88 @@
+# tests/test_recall_query.py
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.EditDB import EditDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.System.Dashboard import Dashboard
+from CYBR_404.WalletNote_ver_06.Backend.System.RecordSync import RecordSync
+
+
+def test_month_groups_keep_years_apart(user):
+    RecordDB().add_records(
+        user,
+        [
+            InputInformation("5.05", "Coffee", "2024-01-15"),
+            InputInformation("3.00", "Coffee", "2025-01-15"),
+        ],
+        "expense",
+    )
+
+    rows = RecallDB().query(user.user_id, None, None, group_by=("month",))
+
+    assert [(month, Decimal(str(total))) for month, total in rows] == [
+        (date(2024, 1, 1), Decimal("5.05")),
+        (date(2025, 1, 1), Decimal("3.00")),
+    ]
+
+
+def test_yearly_summary_reports_month_numbers(user):
+    RecordDB().add_records(
+        user,
+        [
+            InputInformation("5.05", "Coffee", "2024-01-15"),
+            InputInformation("3.00", "Coffee", "2025-01-15"),
+        ],
+        "expense",
+    )
+
+    rows = RecallDB().get_yearly_summary(user.user_id, 2025)
+
+    assert [(record_type, month) for record_type, month, _ in rows] == [("expense", 1)]
+
+
+def test_record_pages_cover_every_record_once(user):
+    # Same day and (one bulk insert) the same created_at: only the id breaks ties
+    RecordDB().add_records(
+        user,
+        [InputInformation(f"{n}.00", "Coffee", f"2025-03-0{1 + n % 3}") for n in range(1, 8)],
+        "expense",
+    )
+
+    seen, cursor = [], None
+    while True:
+        page = Dashboard().get_records_page(user.user_id, cursor, limit=2)
+        seen += [record["id"] for record in page["records"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [row[0] for row in RecallDB().get_records_by_user(user.user_id)]
+    assert len(set(seen)) == 7
+
+
+def test_change_pages_cover_every_change_once(user):
+    # One bulk insert: every row shares a change_version, only the id breaks ties
+    RecordDB().add_records(
+        user,
+        [InputInformation(f"{n}.00", "Coffee", "2025-03-01") for n in range(1, 6)],
+        "expense",
+    )
+    deleted = RecallDB().get_records_by_user(user.user_id)[0][0]
+    EditDB().delete_record(user, deleted)
+
+    changes, token = [], None
+    while True:
+        page = RecordSync().get_changes(user.user_id, token, limit=2)
+        changes += [(change["id"], change["deleted"]) for change in page["changes"]]
+        token = page["token"]
+        if not page["has_more"]:
+            break
+
+    # The deleted record appears once, as its tombstone
+    assert len({record_id for record_id, _ in changes}) == len(changes) == 5
+    assert changes[-1] == (deleted, True)
@@ -0,0 +1,115 @@
+# tests/test_request_scope.py
+"""
+State app.py binds per request must be the state the backend reads.
+"""
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import g
+
+from CYBR_404.WalletNote_ver_06.Backend.Database.ConnectDB import ConnectDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.QueryLog import QueryBudgetExceeded
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecallDB import RecallDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.RecordDB import RecordDB
+from CYBR_404.WalletNote_ver_06.Backend.Database.ReplicaRouter import ReadRouting
+from CYBR_404.WalletNote_ver_06.Backend.Database.UnitOfWork import UnitOfWork
+from CYBR_404.WalletNote_ver_06.Backend.Information.InputInformation import InputInformation
+from CYBR_404.WalletNote_ver_06.Backend.System import OCRJobQueue
+
+
+def _committed_records(user_id: int) -> int:
+    # Another thread: no UnitOfWork, its own connection
+    with ThreadPoolExecutor(1) as pool:
+        row = pool.submit(
+            ConnectDB().fetch_one,
+            "SELECT COUNT(*) FROM records WHERE user_id = %s",
+            (user_id,),
+        ).result()
+    return row[0]
+
+
+def test_repositories_in_one_request_share_one_connection(flask_app, user):
+    with flask_app.test_request_context("/record/bulk", method="POST"):
+        flask_app.preprocess_request()
+
+        uow = UnitOfWork.current()
+        assert uow is not None and uow is g.uow
+        with RecordDB()._connection() as first, RecallDB()._connection() as second:
+            assert first is second is uow.connection()
+
+        db = RecordDB()
+        db.add_records(user, [InputInformation("4.50", "Coffee", "2025-03-01")], "expense")
+        db.add_records(user, [InputInformation("100", "Pay", "2025-03-02")], "income")
+
+        # One transaction, committed when the request ends
+        assert _committed_records(user.user_id) == 0
+
+    assert _committed_records(user.user_id) == 2
+
+
+
+def test_write_pins_the_rest_of_the_request_to_the_primary(flask_app, user):
+    with flask_app.test_request_context("/record/expense", method="POST"):
+        flask_app.preprocess_request()
+
+        routing = ReadRouting.current()
+        assert routing is not None and routing is g.read_routing
+        assert not routing.pinned
+
+        RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+        assert routing.wrote and routing.pinned
+
+@pytest.mark.parametrize("path", ["/api/records", "/api/dashboard", "/api/chart/summary"])
+def test_query_count_header_matches_statements_run(client, user, monkeypatch, path):
+    RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+
+    statements = []
+    statement = ConnectDB._statement
+
+    def counting(self, sql, params):
+        statements.append(sql)
+        return statement(self, sql, params)
+
+    monkeypatch.setattr(ConnectDB, "_statement", counting)
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert statements
+    assert response.headers["X-DB-Query-Count"] == str(len(statements))
+
+
+def test_strict_query_budget_raises(client, flask_app, monkeypatch):
+    monkeypatch.setitem(flask_app.config["QUERY_BUDGETS"], "records_page", 0)
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/records")
+
+
+def test_stream_delivers_a_committed_record(client, flask_app, user, monkeypatch):
+    monkeypatch.setitem(flask_app.config, "SSE_KEEPALIVE_SECONDS", 1)
+
+    response = client.get("/api/stream")
+    chunks = response.iter_encoded()
+    assert next(chunks).startswith(b"retry:")  # subscribed from here on
+
+    RecordDB().add_record(user, InputInformation("4.50", "Coffee", "2025-03-01"), "expense")
+
+    assert next(chunks).startswith(b"event: record_added\n")
+    response.close()
+
+
+def test_app_loads_a_single_copy_of_the_backend(flask_app):
+    # A second import path would give app.py its own classes and ContextVars
+    assert not [name for name in sys.modules if name.split(".")[0] == "Backend"]
+
+
+def test_ocr_batch_configure_reaches_the_queue(flask_app, monkeypatch):
+    app_module = sys.modules[flask_app.import_name]
+    assert app_module.OCRBatch is OCRJobQueue.OCRBatch
+
+    monkeypatch.setattr(OCRJobQueue.OCRBatch, "_processes", None)
+    app_module.OCRBatch.configure(3)
+    assert OCRJobQueue.OCRBatch._processes == 3